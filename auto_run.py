@@ -3,14 +3,20 @@ import subprocess
 import sys
 import argparse
 from datetime import datetime
+from pathlib import Path
 
-def run_automation():
+# Adiciona o diretório raiz ao path (modo daemon importa o scraper)
+sys.path.insert(0, str(Path(__file__).parent))
+
+def run_automation(incremental=False):
     """Executa o script principal em modo headless e completo."""
     print(f"[{datetime.now().strftime('%H:%M:%S')}] Iniciando extração automática...")
     
     # Comando: python main.py --headless --full --dashboard
     # Nota: main.py sem args já faz full+dash, mas vamos ser explícitos e adicionar headless
     cmd = [sys.executable, "main.py", "--headless", "--full", "--dashboard"]
+    if incremental:
+        cmd.append("--incremental")
     
     try:
         result = subprocess.run(cmd, capture_output=True, text=True)
@@ -24,28 +30,119 @@ def run_automation():
     except Exception as e:
         print(f"[{datetime.now().strftime('%H:%M:%S')}] Falha ao executar subprocesso: {e}")
 
+def compact_if_new_day(last_day):
+    """Compacta e aplica a retenção uma vez por dia; retorna o dia processado."""
+    today = datetime.now().date()
+    if last_day == today:
+        return last_day
+
+    from src.compaction import run_compaction
+
+    try:
+        run_compaction()
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Falha na compactação: {e}")
+    return today
+
+def run_daemon_cycle(scraper, prewarmed, http=False):
+    """Executa um ciclo no navegador já aberto; retorna a duração em segundos."""
+    from src.dashboard_gen import generate_dashboard
+
+    started = time.perf_counter()
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] Iniciando ciclo de extração...")
+
+    try:
+        # Sem pré-aquecimento (ou se o Chrome caiu desde então), prepara agora
+        if not (prewarmed and scraper.browser.is_alive()):
+            if not scraper.ensure_ready():
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Falha no login. Ciclo ignorado.")
+                return time.perf_counter() - started
+
+        paths = scraper.run_cycle(workflow=True, painel=True, http=http)
+
+        if generate_dashboard(scraper.extraction_result(paths)):
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Sucesso! Dashboard atualizado.")
+        else:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Falha ao gerar dashboard.")
+
+    except Exception as e:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Erro no ciclo: {e}")
+
+    return time.perf_counter() - started
+
+def run_daemon(interval_seconds, prewarm_seconds, http=False, incremental=None):
+    """Mantém um único navegador autenticado entre os ciclos."""
+    from src.scraper import SiriusScraper
+
+    scraper = SiriusScraper(headless=True, incremental=incremental, keep_painel=True)
+    next_tick = time.monotonic()
+    prewarmed = False
+    compacted_day = None
+
+    try:
+        while True:
+            duration = run_daemon_cycle(scraper, prewarmed, http=http)
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Ciclo concluído em {duration:.1f}s")
+            prewarmed = False
+            compacted_day = compact_if_new_day(compacted_day)
+
+            # Agenda pelo relógio, não pela duração do ciclo
+            next_tick += interval_seconds
+            while next_tick <= time.monotonic():
+                next_tick += interval_seconds
+
+            wait_seconds = next_tick - time.monotonic()
+            print(f"Aguardando {wait_seconds / 60:.1f} minutos para a próxima execução...")
+
+            # Pré-aquecimento: reconecta/autentica pouco antes do próximo ciclo
+            prewarm_at = next_tick - prewarm_seconds
+            if prewarm_seconds > 0 and prewarm_at > time.monotonic():
+                time.sleep(prewarm_at - time.monotonic())
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Pré-aquecendo navegador e sessão...")
+                try:
+                    prewarmed = scraper.ensure_ready()
+                except Exception as e:
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Falha no pré-aquecimento: {e}")
+
+            time.sleep(max(0, next_tick - time.monotonic()))
+
+    finally:
+        scraper.quit()
+
 def main():
     parser = argparse.ArgumentParser(description="Executor Automático do Sirius Dashboard")
     parser.add_argument("--interval", type=int, default=15, help="Intervalo em minutos entre execuções (padrão: 15)")
+    parser.add_argument("--daemon", action="store_true", help="Manter um navegador autenticado entre os ciclos (sem subprocesso)")
+    parser.add_argument("--prewarm", type=int, default=60, help="Segundos antes de cada ciclo para reconectar/autenticar no modo daemon (padrão: 60)")
+    parser.add_argument("--http", action="store_true", help="No modo daemon, extrair via HTTP com os cookies da sessão")
+    parser.add_argument("--incremental", action="store_true", default=None, help="Gravar só as mudanças do Painel a cada ciclo (data/cdc/)")
     args = parser.parse_args()
-    
+
     interval_seconds = args.interval * 60
     
     print("="*50)
     print(f" INICIANDO AUTOMAÇÃO SIRIUS")
     print(f" Intervalo: {args.interval} minutos")
     print(f" Modo: Headless (Sem janela)")
+    if args.daemon:
+        print(f" Daemon: navegador persistente (pré-aquecimento {args.prewarm}s)")
     print("="*50)
     print("Pressione Ctrl+C para parar.")
     print("")
 
     try:
+        if args.daemon:
+            run_daemon(interval_seconds, args.prewarm, http=args.http, incremental=args.incremental)
+            return
+
+        compacted_day = None
         while True:
-            run_automation()
+            run_automation(incremental=args.incremental)
+            compacted_day = compact_if_new_day(compacted_day)
             
             print(f"Aguardando {args.interval} minutos para a próxima execução...")
             time.sleep(interval_seconds)
-            
+
     except KeyboardInterrupt:
         print("\nAutomação parada pelo usuário.")
 
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Compara a extração de tabelas célula a célula com a extração em lote
+Uso: python benchmark_tabelas.py [arquivo.html]  (padrão: debug_painel.html)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.scraper import SiriusScraper
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+
+def benchmark(html_path):
+    """Executa as duas estratégias sobre um HTML salvo e reporta os round trips"""
+    fixture = Path(html_path).resolve()
+    if not fixture.exists():
+        logger.error(f"Arquivo não encontrado: {fixture}")
+        logger.error("Execute 'SAVE_DEBUG_HTML=true python main.py --full' para gerar debug_painel.html")
+        return False
+
+    scraper = SiriusScraper(headless=True)
+    scraper.start()
+
+    try:
+        scraper.driver.get(fixture.as_uri())
+
+        results = {}
+        for bulk in (False, True):
+            label = "bulk" if bulk else "célula a célula"
+            round_trips_before = scraper.browser.round_trips
+            start = time.perf_counter()
+            results[bulk] = scraper.extract_table_data(bulk=bulk)
+            elapsed = time.perf_counter() - start
+            round_trips = scraper.browser.round_trips - round_trips_before
+            logger.info(f"{label}: {round_trips} round trips em {elapsed:.2f}s")
+
+        if results[True] == results[False]:
+            logger.info("Resultados idênticos nas duas estratégias.")
+        else:
+            logger.warning("Resultados diferentes entre as estratégias (verifique espaços/quebras).")
+        return True
+
+    finally:
+        scraper.quit()
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else "debug_painel.html")
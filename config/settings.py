@@ -10,16 +10,110 @@ SIRIUS_URL = os.getenv("SIRIUS_URL", "https://sirius.assim.com.br/appdesktop/ind
 SIRIUS_USERNAME = os.getenv("SIRIUS_USERNAME", "")
 SIRIUS_PASSWORD = os.getenv("SIRIUS_PASSWORD", "")
 SIRIUS_2FA_CODE = os.getenv("SIRIUS_2FA_CODE", "")
+SIRIUS_WORKFLOW_URL = os.getenv(
+    "SIRIUS_WORKFLOW_URL",
+    f"https://sirius.assim.com.br/assimcsp/wflow/workflow.csp?usuario={SIRIUS_USERNAME.upper() or 'VIGNOLI'}",
+)
 
 # Configurações do navegador
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
 BROWSER_TIMEOUT = int(os.getenv("BROWSER_TIMEOUT", "30"))
 IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", "10"))
 
+# Navegadores paralelos do modo --parallel (páginas independentes ao mesmo tempo)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+# Visões filtradas adicionais do Painel (URLs separadas por vírgula)
+PAINEL_VIEW_URLS = [u.strip() for u in os.getenv("PAINEL_VIEW_URLS", "").split(",") if u.strip()]
+
+# Perfil persistente do Chrome (--user-data-dir); vazio = perfil temporário
+CHROME_PROFILE_DIR = os.getenv("CHROME_PROFILE_DIR", "")
+
+# Perfil enxuto: pageLoadStrategy "eager", sem imagens e com recursos
+# estáticos (fontes, folhas de estilo, mídia) bloqueados via CDP
+LEAN_PROFILE = os.getenv("LEAN_PROFILE", "false").lower() == "true"
+# Padrões de URL bloqueados no perfil enxuto (separados por vírgula). *.png fica
+# de fora: o botão do Workflow é a imagem workflow.png (img[src*='workflow.png'])
+BLOCKED_URL_PATTERNS = [
+    p.strip()
+    for p in os.getenv(
+        "BLOCKED_URL_PATTERNS",
+        "*.jpg,*.jpeg,*.gif,*.ico,*.svg,*.woff,*.woff2,*.ttf,*.css,*.mp4",
+    ).split(",")
+    if p.strip()
+]
+
+# Backend de extração do Workflow: "html" (page_source + BeautifulSoup)
+# ou "dom" (consultas elemento a elemento via Selenium)
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "html").lower()
+
+# Limite de páginas percorridas em listagens paginadas (Painel)
+PAINEL_MAX_PAGES = int(os.getenv("PAINEL_MAX_PAGES", "500"))
+
+# Salva o HTML da primeira página do Painel em debug_painel.html
+SAVE_DEBUG_HTML = os.getenv("SAVE_DEBUG_HTML", "false").lower() == "true"
+
 # Configurações de exportação
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
 
+# Formatos gravados a cada execução (json, jsonl, csv e tables = tabela_*.csv)
+OUTPUT_FORMATS = [f.strip() for f in os.getenv("OUTPUT_FORMATS", "json,csv,tables").split(",") if f.strip()]
+
+# Manifestos por execução e índice da execução mais recente (evita varrer data/)
+RUNS_DIR = os.path.join(DATA_DIR, "runs")
+LATEST_RUN_FILE = os.path.join(DATA_DIR, "latest_run.json")
+
+# Compactação e retenção (python main.py --compact; também diária no auto_run.py)
+# Dias com arquivos brutos mantidos (hoje incluso); os anteriores viram
+# data/archive/AAAA/MM/<dia>_{pages,tables}.jsonl.gz deduplicados
+RAW_RETENTION_DAYS = int(os.getenv("RAW_RETENTION_DAYS", "2"))
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+# 0 = manter para sempre
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "0"))
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "14"))
+
+# Cache do frame/seletor que funcionou por último para cada alvo de navegação
+SELECTOR_CACHE_FILE = os.path.join(DATA_DIR, "selector_cache.json")
+
+# Caminho do ChromeDriver resolvido por versão do Chrome (evita consultas
+# de versão a cada início e permite rodar sem internet)
+DRIVER_CACHE_FILE = os.path.join(DATA_DIR, "driver_cache.json")
+
+# Extração incremental do Painel: grava só inserções/alterações/remoções
+# (data/cdc/<página>/changes.jsonl) e o estado atual materializado
+INCREMENTAL = os.getenv("INCREMENTAL", "false").lower() == "true"
+CDC_DIR = os.path.join(DATA_DIR, "cdc")
+
+# Histórico de todas as execuções em SQLite (consultas entre execuções)
+HISTORY_ENABLED = os.getenv("HISTORY_ENABLED", "true").lower() == "true"
+HISTORY_DB = os.path.join(DATA_DIR, "history.db")
+
+# Servidor local do dashboard (python main.py --serve)
+DASHBOARD_HOST = os.getenv("DASHBOARD_HOST", "127.0.0.1")
+DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8050"))
+# Intervalo de consulta do navegador a /api/summary (segundos)
+DASHBOARD_POLL_SECONDS = int(os.getenv("DASHBOARD_POLL_SECONDS", "15"))
+# Linhas por página de /api/rows
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "5000"))
+# Gráficos de tendência (agregados do histórico): run, hour, day ou week
+DASHBOARD_TREND_GRANULARITY = os.getenv("DASHBOARD_TREND_GRANULARITY", "day")
+DASHBOARD_TREND_DAYS = int(os.getenv("DASHBOARD_TREND_DAYS", "30"))
+# Dashboard gerado por --dashboard/--watch; dashboard_rows.js e assets/ ficam na mesma pasta
+DASHBOARD_FILE = os.getenv("DASHBOARD_FILE", os.path.join(DATA_DIR, "dashboard.html"))
+# Grava também dashboard_rows.js.gz (para servidores web que entregam arquivos pré-comprimidos)
+DASHBOARD_PRECOMPRESS = os.getenv("DASHBOARD_PRECOMPRESS", "false").lower() == "true"
+# Hash da tabela usada na última geração (regenera só quando ela muda)
+DASHBOARD_STATE_FILE = os.path.join(DATA_DIR, "dashboard_state.json")
+# Modo --watch: intervalo de verificação quando inotify não está disponível (segundos)
+WATCH_POLL_SECONDS = float(os.getenv("WATCH_POLL_SECONDS", "1"))
+
+# Cookies da sessão autenticada reaproveitados entre execuções (opt-in: ficam em
+# texto puro em data/session_cookies.json, legível só pelo dono do arquivo)
+SESSION_REUSE = os.getenv("SESSION_REUSE", "false").lower() == "true"
+SESSION_COOKIES_FILE = os.path.join(DATA_DIR, "session_cookies.json")
+# Validade assumida para cookies de sessão (sem expiry próprio)
+SESSION_MAX_AGE_MINUTES = int(os.getenv("SESSION_MAX_AGE_MINUTES", "240"))
+
 # Garante que os diretórios existam
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(LOGS_DIR, exist_ok=True)
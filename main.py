@@ -6,14 +6,19 @@ Script principal
 
 import argparse
 import sys
+import threading
 from pathlib import Path
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.scraper import SiriusScraper
+from src.browser_pool import run_parallel_extraction
 from src.utils import setup_logging
 from src.dashboard_gen import generate_dashboard
+from src.compaction import run_compaction
+from src.dashboard_server import serve_dashboard
+from src.dashboard_watch import watch_dashboard
 from config import settings
 
 logger = setup_logging()
@@ -34,6 +39,12 @@ Exemplos de uso:
   python main.py --painel                 # Navegar para Painel
   python main.py --full                   # Workflow + Painel completo
   python main.py --dashboard              # Gerar dashboard a partir dos dados (pode combinar)
+  python main.py --full --http            # Login no navegador, extração via HTTP (sem Chrome)
+  python main.py --full --parallel 3      # Inicial, Workflow e Painel em 3 navegadores paralelos
+  python main.py --full --incremental     # Grava só as mudanças do Painel (data/cdc/)
+  python main.py --compact                # Compacta dias anteriores e aplica a retenção
+  python main.py --serve                  # Dashboard em http://127.0.0.1:8050/ com atualização automática
+  python main.py --watch                  # Regenera data/dashboard.html assim que um novo Painel chega em data/
         """,
     )
 
@@ -76,6 +87,50 @@ Exemplos de uso:
         help="Executar navegação completa (Workflow + Painel)",
     )
     
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Após o login, fechar o navegador e extrair Workflow/Painel via HTTP com os cookies da sessão",
+    )
+
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        metavar="N",
+        help="Extrair páginas independentes em N navegadores paralelos (uma única autenticação)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=None,
+        help="Gravar só as mudanças do Painel desde a execução anterior (data/cdc/) e o estado atual",
+    )
+
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Compactar arquivos de dias anteriores em data/archive/ e aplicar a retenção de arquivos e logs",
+    )
+
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Servir o dashboard em um servidor HTTP local com API JSON (bloqueia até Ctrl+C)",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Porta do servidor do dashboard (padrão: DASHBOARD_PORT)",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Observar data/ e regenerar o dashboard a cada nova tabela do Painel (bloqueia até Ctrl+C)",
+    )
+
     parser.add_argument(
         "--dashboard",
         action="store_true",
@@ -102,15 +157,16 @@ Exemplos de uso:
         
     # Verifica se deve executar extração
     # Se nenhum argumento de ação for passado, assume execução completa (full + dashboard)
-    no_action_args = not (args.workflow or args.painel or args.module or args.full or args.dashboard)
+    no_action_args = not (args.workflow or args.painel or args.module or args.full or args.dashboard or args.compact or args.serve or args.watch)
     
     if no_action_args:
         logger.info("Nenhum argumento específico fornecido. Executando modo COMPLETO (Extração + Dashboard).")
         args.full = True
         args.dashboard = True
     
-    should_extract = args.workflow or args.painel or args.module or args.full or (not args.dashboard)
+    should_extract = args.workflow or args.painel or args.module or args.full or not (args.dashboard or args.compact or args.serve or args.watch)
     
+    extraction = None  # ExtractionResult de --full, usado pelo dashboard
     if should_extract:
         # Executa extração
         try:
@@ -124,27 +180,36 @@ Exemplos de uso:
                 # Mas só se não for apenas dashboard
                 if not args.dashboard:
                     with SiriusScraper(headless=args.headless) as scraper:
-                        if scraper.login():
+                        if scraper.ensure_session():
                             logger.info("Login realizado com sucesso!")
                             scraper.extract_all_data()
 
-                            if args.format == "all":
-                                scraper.save("json")
-                                scraper.save("csv")
-                            else:
-                                scraper.save(args.format)
-                            
-                            scraper.save_tables()
+                            # Uma única passada grava todos os formatos pedidos
+                            formats = ["json", "csv"] if args.format == "all" else [args.format]
+                            scraper.save_outputs(formats=formats + ["tables"])
                             logger.info("Processo concluído com sucesso!")
                         else:
                             logger.error("Falha no login. Verifique suas credenciais.")
                             sys.exit(1)
             else:
                 # Executa navegação completa com workflow e/ou painel
-                scraper = SiriusScraper(headless=args.headless)
-                scraper.run_full_extraction(
-                    headless=args.headless, workflow=args.workflow, painel=args.painel
-                )
+                if args.parallel:
+                    run_parallel_extraction(
+                        workers=args.parallel,
+                        headless=args.headless,
+                        workflow=args.workflow,
+                        painel=args.painel,
+                        incremental=args.incremental,
+                    )
+                else:
+                    # Com --dashboard o Painel segue em memória para o dashboard (sem reler o CSV)
+                    scraper = SiriusScraper(headless=args.headless, incremental=args.incremental, keep_painel=args.dashboard)
+                    extraction = scraper.run_full_extraction(
+                        headless=args.headless,
+                        workflow=args.workflow,
+                        painel=args.painel,
+                        http=args.http,
+                    )
 
         except KeyboardInterrupt:
             logger.info("\nOperação cancelada pelo usuário")
@@ -158,11 +223,33 @@ Exemplos de uso:
         logger.info("=" * 50)
         logger.info("GERANDO DASHBOARD")
         logger.info("=" * 50)
-        if generate_dashboard():
+        if generate_dashboard(extraction):
             logger.info("Dashboard gerado com sucesso!")
         else:
             logger.error("Falha ao gerar dashboard.")
 
+    # Compactação e retenção dos arquivos acumulados
+    if args.compact:
+        logger.info("=" * 50)
+        logger.info("COMPACTANDO DADOS")
+        logger.info("=" * 50)
+        run_compaction()
+
+    # Servidor local do dashboard (após a extração, se houver)
+    if args.serve:
+        logger.info("=" * 50)
+        logger.info("SERVIDOR DO DASHBOARD")
+        logger.info("=" * 50)
+        if args.watch:
+            # dashboard.html também acompanha as extrações enquanto o servidor roda
+            threading.Thread(target=watch_dashboard, daemon=True).start()
+        serve_dashboard(port=args.port)
+    elif args.watch:
+        logger.info("=" * 50)
+        logger.info("OBSERVANDO NOVAS EXTRAÇÕES")
+        logger.info("=" * 50)
+        watch_dashboard()
+
 
 if __name__ == "__main__":
     main()
@@ -3,10 +3,13 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+import time
 import config.settings as settings
+from src.driver_cache import DriverCache
 from src.utils import setup_logging
+from src.waits import wait_until
 
 logger = setup_logging()
 
@@ -14,15 +17,19 @@ logger = setup_logging()
 class BrowserManager:
     """Gerencia o navegador Chrome/Selenium"""
 
-    def __init__(self, headless=None):
+    def __init__(self, headless=None, user_data_dir=None, lean=None):
         self.headless = headless if headless is not None else settings.HEADLESS
+        self.user_data_dir = user_data_dir if user_data_dir is not None else settings.CHROME_PROFILE_DIR
+        self.lean = lean if lean is not None else settings.LEAN_PROFILE
         self.driver = None
         self.wait = None
+        self.round_trips = 0
 
     def start(self):
         """Inicializa o navegador"""
         try:
             logger.info("Iniciando navegador...")
+            started = time.perf_counter()
 
             # Configurações do Chrome
             chrome_options = Options()
@@ -42,30 +49,94 @@ class BrowserManager:
             )
             chrome_options.add_experimental_option("useAutomationExtension", False)
 
-            # Inicializa o driver
-            service = Service(ChromeDriverManager().install())
+            # Perfil persistente: cookies e cache sobrevivem entre execuções
+            if self.user_data_dir:
+                chrome_options.add_argument(f"--user-data-dir={self.user_data_dir}")
+                logger.info(f"Usando perfil persistente: {self.user_data_dir}")
+
+            # Perfil enxuto: não espera imagens/subrecursos e não baixa imagens
+            if self.lean:
+                chrome_options.page_load_strategy = "eager"
+                chrome_options.add_experimental_option(
+                    "prefs", {"profile.managed_default_content_settings.images": 2}
+                )
+
+            # Inicializa o driver (caminho em cache por versão do Chrome)
+            service = Service(DriverCache().resolve())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.execute_script(
                 "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
             )
 
+            if self.lean:
+                self._block_static_assets()
+
             # Configura wait
             self.wait = WebDriverWait(self.driver, settings.BROWSER_TIMEOUT)
+            self._install_round_trip_counter()
 
-            logger.info("Navegador iniciado com sucesso!")
+            logger.info(
+                f"Navegador iniciado com sucesso em {time.perf_counter() - started:.1f}s"
+                f"{' (perfil enxuto)' if self.lean else ''}"
+            )
             return self.driver
 
         except Exception as e:
             logger.error(f"Erro ao iniciar navegador: {e}")
             raise
 
+    def _block_static_assets(self):
+        """Bloqueia fontes, folhas de estilo e mídia via CDP (Network.setBlockedURLs)"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": settings.BLOCKED_URL_PATTERNS}
+            )
+            logger.info(f"{len(settings.BLOCKED_URL_PATTERNS)} padrões de recursos estáticos bloqueados")
+        except Exception as e:
+            logger.warning(f"Não foi possível bloquear recursos estáticos: {e}")
+
+    def _install_round_trip_counter(self):
+        """Conta cada comando enviado ao WebDriver (um round trip HTTP cada)"""
+        original_execute = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.round_trips += 1
+            if driver_command != Command.GET:
+                return original_execute(driver_command, params)
+
+            # Navegações: registra o tempo de carregamento de cada página
+            started = time.perf_counter()
+            result = original_execute(driver_command, params)
+            logger.info(
+                f"Página carregada em {(time.perf_counter() - started) * 1000:.0f} ms: "
+                f"{(params or {}).get('url')}"
+            )
+            return result
+
+        # WebElement também despacha pelo execute do driver pai
+        self.driver.execute = counting_execute
+
     def quit(self):
         """Fecha o navegador"""
         if self.driver:
             logger.info("Fechando navegador...")
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar navegador: {e}")
             self.driver = None
 
+    def is_alive(self):
+        """Verifica se o driver ainda responde (Chrome pode ter caído entre ciclos)"""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
     def wait_for_element(self, locator, timeout=None):
         """Aguarda elemento ficar visível"""
         wait_time = timeout or settings.BROWSER_TIMEOUT
@@ -78,6 +149,23 @@ class BrowserManager:
         wait = WebDriverWait(self.driver, wait_time)
         return wait.until(EC.element_to_be_clickable(locator))
 
+    def add_cookies(self, cookies, url):
+        """Restaura cookies salvos (o navegador precisa estar no domínio deles)"""
+        self.driver.get(url)
+        restored = 0
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+                restored += 1
+            except WebDriverException as e:
+                logger.debug(f"Cookie {cookie.get('name')} ignorado: {e}")
+        logger.info(f"{restored} cookies restaurados")
+        return restored
+
+    def wait_for(self, condition, timeout=None, label=None):
+        """Aguarda uma condição de src.waits (combinável com & e |), logando a latência"""
+        return wait_until(self.driver, condition, timeout=timeout, label=label)
+
     def safe_click(self, locator):
         """Clica em elemento com tratamento de erro"""
         try:
@@ -0,0 +1,187 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+import config.settings as settings
+from src.scraper import SiriusScraper
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+
+class BrowserPool:
+    """
+    Conjunto de navegadores (um SiriusScraper cada) compartilhando uma única
+    autenticação: o primeiro faz login/2FA e os demais recebem os cookies.
+    Jobs independentes rodam em paralelo, no máximo um por navegador.
+    """
+
+    def __init__(self, size=None, headless=False, incremental=None):
+        self.size = max(1, size or settings.BROWSER_POOL_SIZE)
+        self.headless = headless
+        self.incremental = incremental
+        self.scrapers = []
+        self._available = queue.Queue()
+
+    @property
+    def primary(self):
+        """Navegador que fez o login (recebe o resultado consolidado)"""
+        return self.scrapers[0]
+
+    def start(self):
+        """Inicia os navegadores; só o primeiro passa pelo login"""
+        try:
+            return self._start()
+        except Exception:
+            self.quit()
+            raise
+
+    def _start(self):
+        started = time.perf_counter()
+
+        primary = SiriusScraper(headless=self.headless, incremental=self.incremental)
+        self.scrapers.append(primary)
+        primary.start()
+        if not primary.ensure_session():
+            raise RuntimeError("Falha no login do navegador principal")
+        cookies = primary.driver.get_cookies()
+
+        def start_secondary(_):
+            scraper = SiriusScraper(headless=self.headless, incremental=self.incremental)
+            scraper.start()
+            scraper.restore_session(cookies)
+            return scraper
+
+        # Os demais Chrome sobem em paralelo
+        if self.size > 1:
+            with ThreadPoolExecutor(max_workers=self.size - 1) as executor:
+                self.scrapers.extend(executor.map(start_secondary, range(self.size - 1)))
+
+        for scraper in self.scrapers:
+            self._available.put(scraper)
+
+        logger.info(
+            f"Pool com {len(self.scrapers)} navegadores autenticados em "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+        return self
+
+    def _run_job(self, name, job):
+        """Executa um job no primeiro navegador livre e o devolve ao pool"""
+        scraper = self._available.get()
+        started = time.perf_counter()
+        try:
+            scraper.extracted_data = []
+            result = job(scraper) or []
+            logger.info(f"Job '{name}' concluído em {time.perf_counter() - started:.1f}s")
+            return result
+        except Exception as e:
+            logger.error(f"Job '{name}' falhou: {e}")
+            return []
+        finally:
+            self._available.put(scraper)
+
+    def run(self, jobs):
+        """
+        Executa os jobs (lista de (nome, função(scraper) -> lista de páginas))
+        e devolve as páginas concatenadas na ordem dos jobs, não na de término.
+        """
+        with ThreadPoolExecutor(max_workers=min(self.size, len(jobs)) or 1) as executor:
+            futures = [executor.submit(self._run_job, name, job) for name, job in jobs]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+        return results
+
+    def quit(self):
+        """Fecha todos os navegadores"""
+        for scraper in self.scrapers:
+            scraper.quit()
+        self.scrapers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.quit()
+
+
+def home_job(scraper):
+    """Página inicial"""
+    if scraper.ensure_ready():
+        scraper.extract_all_data()
+    return scraper.extracted_data
+
+
+def workflow_job(scraper):
+    """Página Workflow"""
+    if scraper.ensure_ready() and scraper.navigate_to_workflow():
+        scraper.extract_all_data(is_workflow=True)
+    return scraper.extracted_data
+
+
+def painel_job(page_index):
+    """Painel completo (todas as páginas), gravado como tabela _p{page_index}_"""
+
+    def job(scraper):
+        if scraper.ensure_ready() and scraper.navigate_to_workflow() and scraper.navigate_to_painel():
+            stats = {"pages": 0}
+            scraper.stream_painel(
+                scraper.iter_painel_rows(stats),
+                stats,
+                scraper.driver.current_url,
+                scraper.driver.title,
+                page_index=page_index,
+            )
+        return scraper.extracted_data
+
+    return job
+
+
+def painel_view_job(url, page_index):
+    """Visão filtrada do Painel aberta direto pela URL (sessão já autenticada)"""
+
+    def job(scraper):
+        if scraper.ensure_ready():
+            scraper.driver.get(url)
+            stats = {"pages": 0}
+            scraper.stream_painel(
+                scraper.iter_painel_rows(stats),
+                stats,
+                url,
+                scraper.driver.title,
+                page_index=page_index,
+            )
+        return scraper.extracted_data
+
+    return job
+
+
+def build_jobs(workflow=True, painel=True):
+    """Jobs na ordem da extração sequencial: inicial, Workflow, Painel, visões"""
+    jobs = [("inicial", home_job)]
+    if workflow or painel:
+        jobs.append(("workflow", workflow_job))
+    if painel:
+        jobs.append(("painel", painel_job(len(jobs))))
+        for url in settings.PAINEL_VIEW_URLS:
+            jobs.append((f"painel {url}", painel_view_job(url, len(jobs))))
+    return jobs
+
+
+def run_parallel_extraction(workers=None, headless=False, workflow=True, painel=True, incremental=None):
+    """Extração completa com as páginas independentes em navegadores paralelos"""
+    started = time.perf_counter()
+    jobs = build_jobs(workflow=workflow, painel=painel)
+    size = min(workers or settings.BROWSER_POOL_SIZE, len(jobs))
+    try:
+        with BrowserPool(size=size, headless=headless, incremental=incremental) as pool:
+            pool.primary.extracted_data = pool.run(jobs)
+            pool.primary.save_outputs()
+            logger.info(
+                f"Extração paralela finalizada em {time.perf_counter() - started:.1f}s "
+                f"({len(jobs)} jobs, {pool.size} navegadores)"
+            )
+            return True
+    except Exception as e:
+        logger.error(f"Erro durante extração paralela: {e}")
+        return False
@@ -0,0 +1,137 @@
+import csv
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+import config.settings as settings
+from src.page_parser import PAINEL_HEADERS, painel_key, painel_record
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+
+def row_hash(record):
+    """Hash do conteúdo normalizado de um registro do Painel"""
+    values = [record[header] for header in PAINEL_HEADERS]
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ChangeCapture:
+    """
+    Captura incremental (CDC) de uma tabela do Painel, em data/cdc/<nome>/:
+      - index.json: hash de cada registro da execução anterior, por Ficha/Matricula
+      - changes.jsonl: log somente-anexação de inserções, alterações e remoções
+      - current.csv: estado atual materializado (mesmo formato das tabelas do Painel)
+    Só o changes.jsonl cresce com o que mudou. current.csv e index.json são
+    regravados por inteiro em toda execução com alguma mudança (O(total de
+    linhas)), porque dashboard, histórico e manifesto leem o estado completo
+    como um CSV comum; execuções sem mudança não regravam nada.
+    """
+
+    def __init__(self, name, base_dir=None):
+        self.dir = Path(base_dir or settings.CDC_DIR) / name
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / "index.json"
+        self.changes_path = self.dir / "changes.jsonl"
+        self.current_path = self.dir / "current.csv"
+
+    def _load_index(self):
+        """Hashes da execução anterior ({chave: hash}), vazio na primeira execução"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)["rows"]
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Índice CDC ignorado ({self.index_path}): {e}")
+            return {}
+
+    def _load_current(self):
+        """Estado materializado anterior ({chave: registro})"""
+        records = {}
+        if not self.current_path.exists():
+            return records
+        with open(self.current_path, "r", encoding="utf-8-sig", newline="") as f:
+            for key, record in self._keyed(painel_record(row) for row in csv.reader(f)):
+                records[key] = record
+        return records
+
+    @staticmethod
+    def _keyed(records):
+        """Gera (chave, registro); chaves repetidas na mesma execução recebem #2, #3..."""
+        seen = {}
+        for record in records:
+            if record is None:
+                continue
+            key = painel_key(record)
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key}#{seen[key]}"
+            yield key, record
+
+    def _write_atomic(self, path, write):
+        """Grava em arquivo temporário e substitui o destino de uma vez"""
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8-sig" if path.suffix == ".csv" else "utf-8", newline="") as f:
+            write(f)
+        tmp_path.replace(path)
+
+    def apply(self, rows):
+        """
+        Consome as linhas da execução atual (listas, como geradas por
+        iter_painel_rows), anexa as mudanças ao log e retorna as contagens.
+        Havendo qualquer mudança, current.csv e index.json são regravados
+        inteiros (custo proporcional ao total de linhas, não às mudanças).
+        """
+        run_ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        previous = self._load_index()
+
+        records = {}
+        index = {}
+        inserts, updates = [], []
+        for key, record in self._keyed(painel_record(row) for row in rows):
+            digest = row_hash(record)
+            records[key] = record
+            index[key] = digest
+            old_digest = previous.get(key)
+            if old_digest is None:
+                inserts.append(key)
+            elif old_digest != digest:
+                updates.append(key)
+
+        stats = {"rows": len(records), "inserts": len(inserts), "updates": len(updates), "deletes": 0}
+
+        # Extração vazia com estado anterior: provavelmente falha, não remoção em massa
+        if not records and previous:
+            logger.warning("CDC: nenhuma linha extraída; estado anterior mantido")
+            return stats
+
+        deletes = [key for key in previous if key not in index]
+        stats["deletes"] = len(deletes)
+
+        if inserts or updates or deletes or not self.current_path.exists():
+            old_records = self._load_current() if deletes else {}
+            with open(self.changes_path, "a", encoding="utf-8") as f:
+                for op, keys in (("insert", inserts), ("update", updates)):
+                    for key in keys:
+                        f.write(json.dumps({"run": run_ts, "op": op, "key": key, "row": records[key]}, ensure_ascii=False) + "\n")
+                for key in deletes:
+                    f.write(json.dumps({"run": run_ts, "op": "delete", "key": key, "row": old_records.get(key)}, ensure_ascii=False) + "\n")
+
+            def write_current(f):
+                writer = csv.writer(f)
+                writer.writerow(PAINEL_HEADERS)
+                writer.writerows([record[header] for header in PAINEL_HEADERS] for record in records.values())
+
+            self._write_atomic(self.current_path, write_current)
+            self._write_atomic(self.index_path, lambda f: json.dump({"run": run_ts, "rows": index}, f))
+        else:
+            # Nada mudou: só marca o estado como atual (mtime usado pelo dashboard)
+            self.current_path.touch()
+
+        logger.info(
+            f"CDC {self.dir.name}: {stats['rows']} linhas, {stats['inserts']} inserções, "
+            f"{stats['updates']} alterações, {stats['deletes']} remoções"
+        )
+        return stats
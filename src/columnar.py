@@ -0,0 +1,182 @@
+import csv
+from collections import Counter
+from src.page_parser import PAINEL_HEADERS, painel_datetime
+
+try:
+    import numpy as np
+except ImportError:
+    # Sem numpy: mesmas colunas e resultados, agregação em Python puro
+    np = None
+
+# Colunas com poucos valores distintos, guardadas como códigos inteiros
+CATEGORICAL_COLUMNS = ("Setor", "Status", "Motivo", "Usuario", "TempoResolucao", "PrazoSetor")
+_MATRICULA = PAINEL_HEADERS.index("Matricula")
+_SKIP_MATRICULA = {"TODOS", "MATRICULA"}
+
+
+def _encode(values):
+    """Codificação por dicionário: (códigos, categorias na ordem em que aparecem)"""
+    index = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    if np is not None:
+        codes = np.array(codes, dtype=np.int32)
+    return codes, list(index)
+
+
+def _day(iso):
+    """Dia de 'AAAA-MM-DD[ HH:MM]' como datetime64; NaT se vazio ou inválido (ex.: 31/02)"""
+    try:
+        return np.datetime64(iso[:10] or "NaT", "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+class PainelTable:
+    """
+    Painel em colunas (uma lista/array por coluna de PAINEL_HEADERS) em vez
+    de um dict por linha. Colunas categóricas ficam como códigos inteiros +
+    tabela de valores; Início vira dia (datetime64[D]) para a linha do tempo.
+    Com numpy as contagens são vetorizadas (bincount/unique); sem ele o
+    fallback usa Counter sobre os mesmos códigos.
+    """
+
+    def __init__(self, columns):
+        self.size = len(columns[PAINEL_HEADERS[0]])
+        self.text = {}
+        self.codes = {}
+        self.categories = {}
+        for name in PAINEL_HEADERS:
+            if name in CATEGORICAL_COLUMNS:
+                self.codes[name], self.categories[name] = _encode(columns[name])
+            else:
+                self.text[name] = columns[name]
+        self._days = None  # cache de inicio_codes()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Colunas a partir de linhas cruas do CSV, com as mesmas regras de
+        painel_record (linhas curtas, de filtro e cabeçalhos são ignoradas).
+        """
+        width = len(PAINEL_HEADERS)
+        kept = []
+        for row in rows:
+            if len(row) < 10 or row[_MATRICULA].strip().upper() in _SKIP_MATRICULA:
+                continue
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            kept.append(row)
+        if not kept:
+            return cls({name: [] for name in PAINEL_HEADERS})
+        transposed = list(zip(*kept))
+        return cls({name: [value.strip() for value in transposed[i]] for i, name in enumerate(PAINEL_HEADERS)})
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return cls.from_rows(csv.reader(f))
+
+    @classmethod
+    def from_records(cls, records):
+        """Colunas a partir de dicts de painel_record"""
+        return cls({name: [record[name] for record in records] for name in PAINEL_HEADERS})
+
+    def __len__(self):
+        return self.size
+
+    def column(self, name):
+        """Valores de uma coluna como lista de strings"""
+        if name in self.text:
+            return self.text[name]
+        categories = self.categories[name]
+        return [categories[code] for code in self.codes[name]]
+
+    def _flag(self, name, predicate):
+        """Máscara por linha calculada uma vez por categoria"""
+        flags = [predicate(value) for value in self.categories[name]]
+        if np is not None:
+            return np.array(flags, dtype=bool)[self.codes[name]] if flags else np.zeros(0, dtype=bool)
+        return [flags[code] for code in self.codes[name]]
+
+    def late_mask(self):
+        """Fora do prazo (mesma regra de painel_is_late)"""
+        tempo = self._flag("TempoResolucao", lambda v: "FORA DE" in v.upper())
+        prazo = self._flag("PrazoSetor", lambda v: "FORA DE" in v.upper())
+        if np is not None:
+            return tempo | prazo
+        return [a or b for a, b in zip(tempo, prazo)]
+
+    def pending_mask(self):
+        """Pendente (mesma regra de painel_is_pending)"""
+        return self._flag("Status", lambda v: "PENDENTE" in v.upper())
+
+    def inicio_codes(self):
+        """Início codificado por dicionário: (códigos, valores em AAAA-MM-DD HH:MM ou '')"""
+        if self._days is None:
+            codes, values = _encode(self.text["Inicio"])
+            self._days = codes, [painel_datetime(value) or "" for value in values]
+        return self._days
+
+    def inicio_iso(self):
+        """Início em AAAA-MM-DD HH:MM por linha ('' se inválido); cada valor distinto é convertido uma vez"""
+        codes, values = self.inicio_codes()
+        return [values[code] for code in codes]
+
+    def counts(self, name, limit=None):
+        """Contagem por valor em ordem decrescente (vazio conta como 'N/A'; empates na ordem de aparição)"""
+        categories = self.categories[name]
+        if np is not None:
+            per_code = np.bincount(self.codes[name], minlength=len(categories)).tolist()
+        else:
+            counter = Counter(self.codes[name])
+            per_code = [counter[code] for code in range(len(categories))]
+        merged = {}
+        for value, count in zip(categories, per_code):
+            label = value or "N/A"
+            merged[label] = merged.get(label, 0) + count
+        ranked = sorted(merged.items(), key=lambda item: item[1], reverse=True)
+        return [[value, count] for value, count in ranked[:limit]]
+
+    def timeline(self):
+        """Linhas por dia de início, em ordem cronológica"""
+        codes, values = self.inicio_codes()
+        if np is not None:
+            if not values:
+                return []
+            # Dia de cada valor distinto (NaT se inválido), depois contagem por dia
+            days = np.array([_day(iso) for iso in values], dtype="datetime64[D]")[codes]
+            unique, counts = np.unique(days[~np.isnat(days)], return_counts=True)
+            return [[str(day), int(count)] for day, count in zip(unique, counts)]
+        counter = Counter()
+        for code, count in Counter(codes).items():
+            if values[code]:
+                counter[values[code][:10]] += count
+        return [[day, counter[day]] for day in sorted(counter)]
+
+    def summary(self, top_n=10):
+        """Mesmo resultado de compute_summary, calculado sobre as colunas"""
+        total = self.size
+        if np is not None:
+            pending = int(self.pending_mask().sum())
+            late = int(self.late_mask().sum())
+        else:
+            pending = sum(self.pending_mask())
+            late = sum(self.late_mask())
+
+        def pct(value):
+            return round(value / total * 100, 1) if total else 0.0
+
+        return {
+            "kpis": {
+                "total": total,
+                "pending": pending,
+                "pending_pct": pct(pending),
+                "late": late,
+                "late_pct": pct(late),
+                "sectors": len(self.categories["Setor"]),
+            },
+            "sectors": self.counts("Setor", top_n),
+            "motivos": self.counts("Motivo", 5),
+            "status": self.counts("Status", top_n),
+            "timeline": self.timeline(),
+        }
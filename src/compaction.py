@@ -0,0 +1,213 @@
+import csv
+import gzip
+import hashlib
+import json
+import re
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+import config.settings as settings
+from src.sinks import atomic_open
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+# extracted_2026-01-31_10-15-00.json / tabela_2026-01-31_10-15-00_p2_t0.csv
+_RAW_FILE = re.compile(
+    r"^(?P<prefix>extracted|tabela)_(?P<day>\d{4}-\d{2}-\d{2})_(?P<time>\d{2}-\d{2}-\d{2})"
+    r"(?:_(?P<table>p\d+_t\d+))?\.(?P<ext>json|jsonl|csv)$"
+)
+
+
+def _content_hash(value):
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def archive_path(day, kind):
+    """data/archive/AAAA/MM/AAAA-MM-DD_<kind>.jsonl.gz (partição por dia)"""
+    return Path(settings.ARCHIVE_DIR) / day[:4] / day[5:7] / f"{day}_{kind}.jsonl.gz"
+
+
+def iter_archive(day, kind):
+    """Registros de um arquivo compactado (vazio se o dia não foi compactado)"""
+    path = archive_path(day, kind)
+    if not path.exists():
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def snapshot_rows(day, run_ts, source="tabela_p2_t0"):
+    """
+    Reconstrói as linhas de uma tabela como estavam em uma execução
+    (backfill a partir do arquivo compactado do dia).
+    """
+    for record in iter_archive(day, "tables"):
+        if record["source"] == source and run_ts in record["runs"]:
+            yield record["row"]
+
+
+class _DayArchive:
+    """Registros deduplicados de um dia: conteúdo único + execuções em que apareceu"""
+
+    def __init__(self, day, kind):
+        self.day = day
+        self.kind = kind
+        self.records = {}
+        # Mescla com o arquivo já existente (arquivos atrasados do mesmo dia)
+        for record in iter_archive(day, kind):
+            self.records[self._key(record)] = record
+
+    def _key(self, record):
+        content = record["data"] if self.kind == "pages" else record["row"]
+        if isinstance(content, dict):
+            # O horário da extração muda a cada execução; não conta para deduplicação
+            content = {k: v for k, v in content.items() if k != "timestamp"}
+        return _content_hash([record["source"], record.get("page"), content])
+
+    def add(self, record, run_ts):
+        key = self._key(record)
+        existing = self.records.get(key)
+        if existing is None:
+            record["runs"] = [run_ts]
+            self.records[key] = record
+        elif run_ts not in existing["runs"]:
+            existing["runs"].append(run_ts)
+
+    def write(self):
+        path = archive_path(self.day, self.kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(path, mode="wb", encoding=None) as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+                for record in self.records.values():
+                    record["runs"].sort()
+                    gz.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        return path
+
+
+def _read_csv(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        yield from csv.reader(f)
+
+
+def _read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def compact_day(day, files):
+    """
+    Junta os arquivos brutos de um dia em dois arquivos gzip deduplicados
+    (páginas e tabelas) e remove os originais. Retorna quantos foram compactados.
+    """
+    pages = _DayArchive(day, "pages")
+    tables = _DayArchive(day, "tables")
+    names = {path.name for path, _ in files}
+
+    for path, match in files:
+        run_ts = f"{day} {match['time'].replace('-', ':')}"
+        prefix, ext, table = match["prefix"], match["ext"], match["table"]
+
+        if prefix == "extracted" and ext == "json":
+            with open(path, "r", encoding="utf-8") as f:
+                for i, page in enumerate(json.load(f)):
+                    pages.add({"source": "extracted", "page": i, "data": page}, run_ts)
+        elif prefix == "extracted" and ext == "jsonl":
+            # Mesmo conteúdo do .json quando os dois formatos são gravados
+            if path.with_suffix(".json").name not in names:
+                for i, page in enumerate(_read_jsonl(path)):
+                    pages.add({"source": "extracted", "page": i, "data": page}, run_ts)
+        elif prefix == "extracted":
+            # CSV achatado das páginas: redundante se houver .json/.jsonl da execução
+            if not names & {path.with_suffix(".json").name, path.with_suffix(".jsonl").name}:
+                for row in _read_csv(path):
+                    tables.add({"source": "extracted", "row": row}, run_ts)
+        elif ext == "csv":
+            for row in _read_csv(path):
+                tables.add({"source": f"tabela_{table}", "row": row}, run_ts)
+        elif path.with_suffix(".csv").name not in names:
+            # JSONL do Painel: mesmas linhas do CSV gravado junto
+            for row in _read_jsonl(path):
+                tables.add({"source": f"tabela_{table}", "row": row}, run_ts)
+
+    if pages.records:
+        pages.write()
+    if tables.records:
+        tables.write()
+
+    for path, _ in files:
+        path.unlink()
+    return len(files)
+
+
+def _delete_older_than(paths, days, label):
+    """Remove arquivos com modificação mais antiga que `days` dias"""
+    if days <= 0:
+        return 0
+    cutoff = time.time() - days * 86400
+    removed = 0
+    for path in paths:
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            # Já removido, ou em uso (log aberto por outro processo no Windows)
+            continue
+    if removed:
+        logger.info(f"Retenção: {removed} {label} removidos (mais de {days} dias)")
+    return removed
+
+
+def run_compaction(today=None):
+    """
+    Compacta os dias fora da janela de arquivos brutos (RAW_RETENTION_DAYS)
+    e aplica a retenção de manifestos, arquivos compactados e logs.
+    """
+    started = time.perf_counter()
+    today = today or date.today()
+    keep_from = (today - timedelta(days=max(settings.RAW_RETENTION_DAYS, 1) - 1)).isoformat()
+    data_dir = Path(settings.DATA_DIR)
+
+    by_day = defaultdict(list)
+    for path in data_dir.iterdir():
+        match = _RAW_FILE.match(path.name)
+        if match and match["day"] < keep_from:
+            by_day[match["day"]].append((path, match))
+
+    compacted = 0
+    for day in sorted(by_day):
+        try:
+            compacted += compact_day(day, sorted(by_day[day]))
+            logger.info(f"Compactação: {day} ({len(by_day[day])} arquivos)")
+        except Exception as e:
+            logger.error(f"Erro ao compactar {day}: {e}")
+
+    # Manifestos dos dias compactados apontam para arquivos que não existem mais
+    runs_dir = Path(settings.RUNS_DIR)
+    if runs_dir.exists():
+        stale = [p for p in runs_dir.glob("run_*.json") if p.name[4:14] < keep_from]
+        for path in stale:
+            path.unlink()
+
+    # Temporários de gravações interrompidas (todas as gravações atômicas usam
+    # .<nome>.<pid>[...].tmp; rglob cobre também data/cdc/<tabela>/)
+    _delete_older_than(data_dir.rglob("*.tmp"), 1, "temporários")
+    if settings.ARCHIVE_RETENTION_DAYS > 0:
+        archive_from = (today - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)).isoformat()
+        expired = [p for p in Path(settings.ARCHIVE_DIR).glob("*/*/*.jsonl.gz") if p.name[:10] < archive_from]
+        for path in expired:
+            path.unlink()
+        if expired:
+            logger.info(f"Retenção: {len(expired)} arquivos compactados removidos")
+    _delete_older_than(Path(settings.LOGS_DIR).glob("scraper_*.log"), settings.LOG_RETENTION_DAYS, "logs")
+
+    logger.info(
+        f"Compactação concluída: {compacted} arquivos brutos em {len(by_day)} dia(s), "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+    return compacted
@@ -1,90 +1,149 @@
-import csv
+import gzip
+import hashlib
 import json
-import glob
 import os
 from pathlib import Path
 from src.utils import setup_logging
+from src.columnar import PainelTable
+from src.row_codec import encode_rows
+from src.history_store import HistoryStore
+from src.manifest import file_sha256, latest_painel_csv
+from src.search_index import build_search_index
+from src.sinks import atomic_open
 import config.settings as settings
 
 logger = setup_logging()
 
-def generate_dashboard():
-    """Gera um dashboard HTML a partir do arquivo CSV mais recente."""
-    try:
-        logger.info("Iniciando geração do dashboard...")
-        
-        # 1. Encontrar o arquivo CSV mais recente e relevante
-        # Prioriza arquivos que contenham "_p2_" (painel geralmente) e sejam maiores
-        
-        data_dir = Path(settings.DATA_DIR)
-        csv_files = list(data_dir.glob("tabela_*_p*_t*.csv"))
-        
-        if not csv_files:
-            logger.error("Nenhum arquivo CSV de tabela encontrado em 'data/'.")
-            return False
-            
-        # Filtra arquivos muito pequenos (menos de 100 bytes)
-        csv_files = [f for f in csv_files if f.stat().st_size > 100]
+def find_latest_csv():
+    """
+    Fallback sem índice de execuções: varre data/ e escolhe pela heurística
+    de nome (_p2_ = Painel), data de modificação e tamanho.
+    """
+    # Prioriza arquivos que contenham "_p2_" (painel geralmente) e sejam maiores
+    data_dir = Path(settings.DATA_DIR)
+    csv_files = list(data_dir.glob("tabela_*_p*_t*.csv"))
+
+    # No modo incremental o estado materializado do Painel substitui os snapshots
+    current_state = Path(settings.CDC_DIR) / "p2" / "current.csv"
+    if current_state.exists():
+        csv_files.append(current_state)
+    
+    if not csv_files:
+        logger.error("Nenhum arquivo CSV de tabela encontrado em 'data/'.")
+        return None
         
-        if not csv_files:
-             logger.error("Nenhum arquivo CSV com dados encontrado.")
-             return False
+    # Filtra arquivos muito pequenos (menos de 100 bytes)
+    csv_files = [f for f in csv_files if f.stat().st_size > 100]
+    
+    if not csv_files:
+         logger.error("Nenhum arquivo CSV com dados encontrado.")
+         return None
+
+    # Tenta encontrar tabelas do painel (p2)
+    painel_files = [f for f in csv_files if "_p2_" in f.name or f == current_state]
+    
+    if painel_files:
+         # Se houver tabelas de painel, pega a mais recente entre elas
+         return max(painel_files, key=os.path.getmtime)
+    # Se não, pega o maior arquivo recente (assumindo que seja a tabela de dados)
+    return max(csv_files, key=lambda f: f.stat().st_size)
+
+def resolve_painel_csv():
+    """
+    Tabela do Painel usada pelo dashboard: a apontada pelo índice da última
+    execução (data/latest_run.json) ou, sem índice, a escolhida pela varredura.
+    """
+    return latest_painel_csv() or find_latest_csv()
 
-        # Tenta encontrar tabelas do painel (p2)
-        painel_files = [f for f in csv_files if "_p2_" in f.name]
+def load_painel_table(csv_path):
+    """Painel de um CSV em colunas (sem linhas de filtro e cabeçalhos repetidos)"""
+    return PainelTable.from_csv(csv_path)
+
+def generator_fingerprint():
+    """Hash do código e dos arquivos estáticos que definem o HTML gerado"""
+    digest = hashlib.sha1()
+    sources = [Path(__file__)] + [Path(__file__).with_name(name) for name in ('search_index.py', 'row_codec.py')]
+    sources += [STATIC_DIR / name for name in DASHBOARD_ASSETS.values()]
+    for path in sources:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def load_dashboard_state():
+    """Última geração registrada (hash da entrada e arquivo gerado), ou {}"""
+    try:
+        with open(settings.DASHBOARD_STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def generate_dashboard(extraction=None, force=False):
+    """
+    Gera um dashboard HTML a partir do arquivo CSV mais recente, ou direto do
+    Painel já em memória de `extraction` (ExtractionResult de
+    run_full_extraction), sem reler o CSV. Se a tabela (hash do conteúdo) e o
+    gerador não mudaram desde a última geração, nada é regravado, a menos que
+    `force`.
+    """
+    try:
+        logger.info("Iniciando geração do dashboard...")
         
-        if painel_files:
-             # Se houver tabelas de painel, pega a mais recente entre elas
-             latest_csv = max(painel_files, key=os.path.getmtime)
+        # 1. Painel da extração atual ou, na falta dele, o CSV mais recente e relevante
+        table = getattr(extraction, 'painel', None)
+        if table is not None and extraction.painel_csv and extraction.painel_csv.exists():
+            latest_csv = extraction.painel_csv
+            logger.info(f"Usando Painel da extração atual: {latest_csv.name} ({len(table)} linhas em memória)")
         else:
-             # Se não, pega o maior arquivo recente (assumindo que seja a tabela de dados)
-             latest_csv = max(csv_files, key=lambda f: f.stat().st_size)
-             
-        logger.info(f"Usando arquivo CSV: {latest_csv.name}")
-        
-        # 2. Ler e limpar dados
-        data_rows = []
-        headers = [
-            'Matricula', 'Nome', 'Ficha', 'Prioridade', 'FollowUp', 'Setor', 
-            'Status', 'Usuario', 'Macro', 'Ocorrencia', 'Motivo', 'SubMotivo', 
-            'Inicio', 'TempoResolucao', 'PrazoSetor', 'Conclusao'
-        ]
+            table = None
+            latest_csv = resolve_painel_csv()
+            if latest_csv is None:
+                return False
+            logger.info(f"Usando arquivo CSV: {latest_csv.name}")
+
+        output_file = Path(settings.DASHBOARD_FILE)
+        rows_file = output_file.with_name(DETAIL_ROWS_FILE)
+        # Tendências entram na chave: uma execução sem mudanças no Painel ainda estende as séries
+        trend = history_trend()
+        trend_hash = hashlib.sha1(json.dumps(trend).encode('utf-8')).hexdigest()
+        source_hash = f"{file_sha256(latest_csv)}:{trend_hash}:{generator_fingerprint()}"
+        state = load_dashboard_state()
+        if (
+            not force
+            and state.get('source_hash') == source_hash
+            and state.get('output') == str(output_file.resolve())
+            and output_file.exists()
+            and rows_file.exists()
+        ):
+            logger.info("Tabela do Painel sem alterações desde a última geração; dashboard mantido.")
+            return True
         
-        with open(latest_csv, 'r', encoding='utf-8-sig') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                # Filtra linhas de "lixo" (filtros do sistema)
-                # Dados reais têm ~16 colunas preenchidas ou vazias, mas a estrutura é consistente.
-                # Linhas de filtro geralmente têm 1 coluna ou formato diferente.
-                if len(row) >= 10:
-                    # Cria dicionário
-                    # Garante que row tenha tamanho suficiente (preenche com vazio se necessario)
-                    while len(row) < len(headers):
-                        row.append("")
-                        
-                    row_dict = {headers[i]: row[i].strip() for i in range(len(headers))}
-                    
-                    # Filtra linha de filtro "TODOS" e cabeçalho repetido "Matricula"
-                    # Verifica se o valor da coluna 'Matricula' é um dos valores a ignorar
-                    val_matricula = row_dict['Matricula'].upper()
-                    if val_matricula in ['TODOS', 'MATRICULA']:
-                        continue
-                        
-                    data_rows.append(row_dict)
-                    
-        logger.info(f"Processadas {len(data_rows)} linhas de dados.")
+        # 2. Ler e limpar dados (só sem o Painel em memória)
+        if table is None:
+            table = load_painel_table(latest_csv)
+            logger.info(f"Processadas {len(table)} linhas de dados.")
         
-        if not data_rows:
+        if not len(table):
             logger.warning("Nenhum dado válido encontrado no CSV.")
             return False
 
-        # 3. Gerar HTML
-        html_content = create_html_template(data_rows)
+        # 3. Agregar em Python (KPIs, contagens e linha do tempo)
+        summary = dict(compute_summary(table), trend=trend)
+
+        # 4. Detalhamento completo em arquivo separado (o HTML fica com tamanho constante)
+        rows_version = write_detail_rows(table, rows_file)
+
+        # 5. Gerar HTML (CSS e gráficos locais em assets/, funciona sem rede)
+        assets = write_assets(output_file.parent)
+        html_content = create_html_template(summary, rows_src=f"{rows_file.name}?v={rows_version}", assets=assets)
         
-        # 4. Salvar arquivo
-        output_file = Path("dashboard.html")
-        with open(output_file, "w", encoding="utf-8") as f:
+        # 6. Salvar arquivo (troca atômica: quem abre a página nunca vê um HTML pela metade)
+        with atomic_open(output_file) as f:
             f.write(html_content)
+
+        with atomic_open(settings.DASHBOARD_STATE_FILE) as f:
+            json.dump(
+                {'source': str(latest_csv), 'source_hash': source_hash, 'output': str(output_file.resolve())},
+                f, ensure_ascii=False, indent=2,
+            )
             
         logger.info(f"Dashboard gerado com sucesso: {output_file.absolute()}")
         return True
@@ -93,10 +152,152 @@ def generate_dashboard():
         logger.error(f"Erro ao gerar dashboard: {e}")
         return False
 
-def create_html_template(data):
-    """Cria o conteúdo HTML do dashboard com os dados injetados."""
+# Colunas exibidas na tabela de detalhamento
+DETAIL_COLUMNS = ['Matricula', 'Nome', 'Setor', 'Status', 'Ocorrencia', 'TempoResolucao', 'Inicio']
+# Script com todas as linhas do detalhamento, gravado ao lado do dashboard (DASHBOARD_FILE)
+DETAIL_ROWS_FILE = 'dashboard_rows.js'
+# CSS e gráficos do dashboard (src/static), copiados com hash no nome
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+DASHBOARD_ASSETS = {'css': 'dashboard.css', 'js': 'chart.umd.js'}
+ASSETS_DIR = 'assets'
+
+def compute_summary(table, top_n=10):
+    """
+    Agregados do dashboard calculados no Python: KPIs, top-N por Setor,
+    Motivo e Status e linha do tempo por dia. O tamanho do resultado não
+    cresce com o número de linhas do Painel (contagens vetorizadas em
+    PainelTable; ver src/columnar.py).
+    """
+    return table.summary(top_n)
+
+def history_trend(granularity=None, days=None):
+    """
+    Tendências entre execuções lidas dos agregados do histórico (não relê o
+    histórico bruto): total, pendentes e fora do prazo por período, e fora
+    do prazo dos 5 setores com mais fichas atrasadas. None sem histórico.
+    """
+    if not settings.HISTORY_ENABLED or not Path(settings.HISTORY_DB).exists():
+        return None
+    granularity = granularity or settings.DASHBOARD_TREND_GRANULARITY
+    days = days or settings.DASHBOARD_TREND_DAYS
+    try:
+        store = HistoryStore()
+        total = store.trend(granularity, days=days)
+        buckets = total['buckets']
+        if not buckets:
+            return None
+
+        def aligned(trend, name):
+            position = {bucket: i for i, bucket in enumerate(trend['buckets'])}
+            values = trend['series'][name]
+            return [values[position[b]] if b in position else 0 for b in buckets]
+
+        by_status = store.trend(granularity, by='status', days=days)
+        pending = [0] * len(buckets)
+        for status in by_status['series']:
+            if 'PENDENTE' in status.upper():
+                pending = [round(a + b, 1) for a, b in zip(pending, aligned(by_status, status))]
+
+        by_sla = store.trend(granularity, by='atrasado', days=days)
+        late = aligned(by_sla, '1') if '1' in by_sla['series'] else [0] * len(buckets)
+
+        by_sector = store.trend(granularity, by='setor', days=days, late_only=True)
+        sectors = sorted(by_sector['series'], key=lambda name: aligned(by_sector, name)[-1], reverse=True)[:5]
+
+        return {
+            'granularity': granularity,
+            'buckets': buckets,
+            'total': total['series']['total'],
+            'pending': pending,
+            'late': late,
+            'late_by_sector': [[name or 'N/A', aligned(by_sector, name)] for name in sectors],
+        }
+    except Exception as e:
+        logger.warning(f"Tendências do histórico indisponíveis: {e}")
+        return None
+
+def dashboard_summary(table):
+    """Agregados da tabela atual + tendências do histórico"""
+    return dict(compute_summary(table), trend=history_trend())
+
+def detail_payload(table, start=0, stop=None):
+    """
+    Linhas do detalhamento (colunas de DETAIL_COLUMNS) no formato colunar de
+    src/row_codec.py; decodeRows() no dashboard as transforma em listas com
+    o Início em AAAA-MM-DD HH:MM no fim, usado na ordenação.
+    """
+    return encode_rows(table, DETAIL_COLUMNS, start, stop)
+
+def _script_json(value):
+    """JSON compacto para <script> ("</" escapado)"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+def write_detail_rows(table, path):
+    """
+    Grava o script com as linhas do detalhamento e o índice da busca;
+    retorna a versão (hash do conteúdo)
+    """
+    search_index = build_search_index(table, DETAIL_COLUMNS)
+    content = (
+        f"window.DASHBOARD_ROWS = {_script_json(detail_payload(table))};\n"
+        f"window.DASHBOARD_INDEX = {_script_json(search_index)};\n"
+    )
+    with atomic_open(path) as f:
+        f.write(content)
+    # Cópia pré-comprimida para servidores que entregam .gz direto (ex.: gzip_static do nginx)
+    compressed = Path(f"{path}.gz")
+    if settings.DASHBOARD_PRECOMPRESS:
+        with atomic_open(compressed, mode="wb", encoding=None) as f:
+            f.write(gzip.compress(content.encode("utf-8"), mtime=0))
+    elif compressed.exists():
+        compressed.unlink()
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:10]
+
+def asset_bundle():
+    """
+    Arquivos estáticos do dashboard com o hash do conteúdo no nome
+    (podem ficar em cache indefinidamente): {tipo: (nome, bytes)}
+    """
+    bundle = {}
+    for kind, name in DASHBOARD_ASSETS.items():
+        content = (STATIC_DIR / name).read_bytes()
+        stem, ext = name.rsplit('.', 1)
+        bundle[kind] = (f"{stem}.{hashlib.sha1(content).hexdigest()[:10]}.{ext}", content)
+    return bundle
+
+def asset_urls():
+    """Caminhos relativos dos arquivos estáticos ({tipo: 'assets/nome'})"""
+    return {kind: f"{ASSETS_DIR}/{name}" for kind, (name, _) in asset_bundle().items()}
+
+def write_assets(output_dir):
+    """Copia os arquivos estáticos para <output_dir>/assets e remove versões antigas"""
+    assets_dir = Path(output_dir) / ASSETS_DIR
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    current = set()
+    for name, content in asset_bundle().values():
+        current.add(name)
+        path = assets_dir / name
+        if not path.exists():
+            with atomic_open(path, mode="wb", encoding=None) as f:
+                f.write(content)
+    # assets/ pertence ao gerador: tudo que não é da versão atual é antigo
+    for old in assets_dir.iterdir():
+        if old.is_file() and old.name not in current:
+            old.unlink()
+    return asset_urls()
+
+def create_html_template(summary, rows_src=DETAIL_ROWS_FILE, poll_seconds=0, assets=None):
+    """
+    Cria o conteúdo HTML do dashboard com os agregados injetados.
+    Sem `rows_src` as linhas vêm da API do servidor local (poll_seconds > 0).
+    """
+    assets = assets or asset_urls()
     
-    json_data = json.dumps(data)
+    # "</" escapado para o JSON não fechar a tag <script>
+    json_data = json.dumps(summary, ensure_ascii=False).replace('</', '<\\/')
+    rows_script = f'<script src="{rows_src}"></script>' if rows_src else ''
+    poll_ms = int(poll_seconds * 1000)
+    detail_columns = json.dumps(DETAIL_COLUMNS)
     
     return f"""
 <!DOCTYPE html>
@@ -104,30 +305,8 @@ def create_html_template(data):
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="refresh" content="60"> <!-- Auto-refresh a cada 60s -->
     <title>Sirius Dashboard</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script>
-        tailwind.config = {{
-            darkMode: 'class',
-            theme: {{
-                extend: {{
-                    colors: {{
-                        primary: '#0ea5e9',
-                        secondary: '#6366f1',
-                        dark: '#0f172a',
-                        darker: '#020617',
-                        card: '#1e293b'
-                    }}
-                }}
-            }}
-        }}
-    </script>
-    <style>
-        body {{ font-family: 'Inter', sans-serif; }}
-        :root {{ color-scheme: dark; }}
-    </style>
+    <link rel="stylesheet" href="{assets['css']}">
 </head>
 <body class="bg-darker text-gray-100 min-h-screen">
 
@@ -213,23 +392,40 @@ def create_html_template(data):
             </div>
         </div>
 
+        <!-- Charts Row 3 (histórico entre execuções; oculto sem histórico) -->
+        <div id="trend-row" class="grid grid-cols-1 lg:grid-cols-2 gap-6" style="display: none">
+            <div class="bg-card p-6 rounded-xl border border-gray-800">
+                <h3 class="text-lg font-semibold mb-4 text-gray-200">Evolução</h3>
+                <div class="h-64">
+                    <canvas id="chart-trend"></canvas>
+                </div>
+            </div>
+            <div class="bg-card p-6 rounded-xl border border-gray-800">
+                <h3 class="text-lg font-semibold mb-4 text-gray-200">Fora do Prazo por Setor</h3>
+                <div class="h-64">
+                    <canvas id="chart-trend-sectors"></canvas>
+                </div>
+            </div>
+        </div>
+
         <!-- Data Table -->
         <div class="bg-card rounded-xl border border-gray-800 overflow-hidden">
             <div class="p-6 border-b border-gray-800 flex justify-between items-center">
                 <h3 class="text-lg font-semibold text-gray-200">Detalhamento</h3>
-                <input type="text" id="search-input" placeholder="Buscar..." class="bg-dark border border-gray-700 rounded-lg px-4 py-2 text-sm focus:outline-none focus:border-primary text-gray-300">
+                <input type="text" id="search-input" placeholder="Buscar... (setor:, status:)" class="bg-dark border border-gray-700 rounded-lg px-4 py-2 text-sm focus:outline-none focus:border-primary text-gray-300">
             </div>
-            <div class="overflow-x-auto">
-                <table class="w-full text-left text-sm text-gray-400">
-                    <thead class="bg-gray-800/50 text-gray-200 uppercase font-medium text-xs">
+            <!-- Rolagem virtual: só as linhas visíveis existem no DOM -->
+            <div class="overflow-auto" id="table-viewport" style="height: 600px">
+                <table class="w-full text-left text-sm text-gray-400" style="table-layout: fixed">
+                    <thead class="bg-gray-800 text-gray-200 uppercase font-medium text-xs sticky top-0">
                         <tr>
-                            <th class="px-6 py-3">Matrícula</th>
-                            <th class="px-6 py-3">Nome</th>
-                            <th class="px-6 py-3">Setor</th>
-                            <th class="px-6 py-3">Status</th>
-                            <th class="px-6 py-3">Ocorrência</th>
-                            <th class="px-6 py-3">Prazo</th>
-                            <th class="px-6 py-3">Início</th>
+                            <th class="px-6 py-3 cursor-pointer select-none" data-col="Matricula">Matrícula</th>
+                            <th class="px-6 py-3 cursor-pointer select-none" data-col="Nome">Nome</th>
+                            <th class="px-6 py-3 cursor-pointer select-none" data-col="Setor">Setor</th>
+                            <th class="px-6 py-3 cursor-pointer select-none" data-col="Status">Status</th>
+                            <th class="px-6 py-3 cursor-pointer select-none" data-col="Ocorrencia">Ocorrência</th>
+                            <th class="px-6 py-3 cursor-pointer select-none" data-col="TempoResolucao">Prazo</th>
+                            <th class="px-6 py-3 cursor-pointer select-none" data-col="Inicio">Início</th>
                         </tr>
                     </thead>
                     <tbody class="divide-y divide-gray-800" id="table-body">
@@ -237,50 +433,62 @@ def create_html_template(data):
                     </tbody>
                 </table>
             </div>
-            <div class="p-4 border-t border-gray-800 text-center text-xs text-gray-500">
-                Mostrando <span id="row-count">0</span> registros
+            <div class="p-4 border-t border-gray-800 flex justify-between items-center text-xs text-gray-500">
+                <span>Mostrando <span id="row-count">0</span> registros</span>
+                <div class="flex items-center gap-2">
+                    <select id="page-size" class="bg-dark border border-gray-700 rounded px-2 py-1 text-gray-300">
+                        <option value="500">500 / página</option>
+                        <option value="1000" selected>1000 / página</option>
+                        <option value="5000">5000 / página</option>
+                        <option value="0">Todas</option>
+                    </select>
+                    <button id="page-prev" class="px-3 py-1 rounded border border-gray-700 hover:border-primary text-gray-300">&lsaquo;</button>
+                    <span id="page-label">1 / 1</span>
+                    <button id="page-next" class="px-3 py-1 rounded border border-gray-700 hover:border-primary text-gray-300">&rsaquo;</button>
+                </div>
             </div>
         </div>
 
     </main>
 
+    <script src="{assets['js']}"></script>
+    {rows_script}
     <script>
-        // Inject Data from Python
-        const rawData = {json_data}; 
-
-        // --- Processing Data ---
-        const total = rawData.length;
-        const pending = rawData.filter(d => d.Status && d.Status.toUpperCase().includes('PENDENTE')).length;
-        const late = rawData.filter(d => (d.TempoResolucao && d.TempoResolucao.toUpperCase().includes('FORA DE')) || (d.PrazoSetor && d.PrazoSetor.toUpperCase().includes('FORA DE'))).length;
-        const sectors = [...new Set(rawData.map(d => d.Setor))].length;
+        // Agregados calculados no Python (KPIs, contagens e linha do tempo)
+        let summary = {json_data};
+        // Servidor local (--serve): consulta /api/summary a cada POLL_MS; 0 = arquivo estático
+        const POLL_MS = {poll_ms};
 
         // UI Updates - KPIs
-        document.getElementById('kpi-total').innerText = total;
-        document.getElementById('kpi-pending').innerText = pending;
-        document.getElementById('kpi-pending-pct').innerText = '(' + ((pending/total)*100).toFixed(1) + '%)';
-        document.getElementById('kpi-late').innerText = late;
-        document.getElementById('kpi-late-pct').innerText = '(' + ((late/total)*100).toFixed(1) + '%)';
-        document.getElementById('kpi-sectors').innerText = sectors;
-        
-        // --- Charts Helper ---
-        function getCounts(field) {{
-            const counts = {{}};
-            rawData.forEach(d => {{
-                const val = d[field] || 'N/A';
-                counts[val] = (counts[val] || 0) + 1;
-            }});
-            return Object.entries(counts).sort((a,b) => b[1] - a[1]);
+        function renderKpis(kpis) {{
+            document.getElementById('kpi-total').innerText = kpis.total;
+            document.getElementById('kpi-pending').innerText = kpis.pending;
+            document.getElementById('kpi-pending-pct').innerText = '(' + kpis.pending_pct.toFixed(1) + '%)';
+            document.getElementById('kpi-late').innerText = kpis.late;
+            document.getElementById('kpi-late-pct').innerText = '(' + kpis.late_pct.toFixed(1) + '%)';
+            document.getElementById('kpi-sectors').innerText = kpis.sectors;
         }}
+        renderKpis(summary.kpis);
+
+        // Tema escuro para todos os gráficos (Chart.js local em assets/)
+        Chart.defaults.color = '#94a3b8';
+        Chart.defaults.borderColor = '#334155';
+
+        // Gráficos por chave do resumo (atualizados só quando a série muda)
+        const charts = {{}};
+        const chartLabels = {{
+            // Timeline (dias já agregados e ordenados, AAAA-MM-DD)
+            timeline: d => d[0].split('-').reverse().join('/'),
+        }};
 
         // Sector Chart
-        const sectorData = getCounts('Setor').slice(0, 10);
-        new Chart(document.getElementById('chart-sector'), {{
+        charts.sectors = new Chart(document.getElementById('chart-sector'), {{
             type: 'bar',
             data: {{
-                labels: sectorData.map(d => d[0]),
+                labels: summary.sectors.map(d => d[0]),
                 datasets: [{{
                     label: 'Solicitações',
-                    data: sectorData.map(d => d[1]),
+                    data: summary.sectors.map(d => d[1]),
                     backgroundColor: '#0ea5e9',
                     borderRadius: 4
                 }}]
@@ -289,14 +497,13 @@ def create_html_template(data):
         }});
 
         // Top Motivos
-        const motivoData = getCounts('Motivo').slice(0, 5);
-        new Chart(document.getElementById('chart-motivo'), {{
+        charts.motivos = new Chart(document.getElementById('chart-motivo'), {{
             type: 'bar',
             data: {{
-                labels: motivoData.map(d => d[0]),
+                labels: summary.motivos.map(d => d[0]),
                 datasets: [{{
                     label: 'Ocorrências',
-                    data: motivoData.map(d => d[1]),
+                    data: summary.motivos.map(d => d[1]),
                     backgroundColor: '#6366f1',
                     borderRadius: 4,
                     indexAxis: 'y'
@@ -306,13 +513,12 @@ def create_html_template(data):
         }});
         
         // Status Chart
-        const statusData = getCounts('Status');
-        new Chart(document.getElementById('chart-status'), {{
+        charts.status = new Chart(document.getElementById('chart-status'), {{
             type: 'doughnut',
             data: {{
-                labels: statusData.map(d => d[0]),
+                labels: summary.status.map(d => d[0]),
                 datasets: [{{
-                    data: statusData.map(d => d[1]),
+                    data: summary.status.map(d => d[1]),
                     backgroundColor: ['#eab308', '#22c55e', '#ef4444', '#3b82f6', '#a855f7'],
                     borderWidth: 0
                 }}]
@@ -321,26 +527,13 @@ def create_html_template(data):
         }});
 
         // Timeline
-        const timelineCounts = {{}};
-        rawData.forEach(d => {{
-            if(d.Inicio) {{
-                // Parse date assuming DD/MM/YYYY
-                const parts = d.Inicio.split('/');
-                if(parts.length === 3) {{
-                    const date = parts[2] + '-' + parts[1] + '-' + parts[0]; // YYYY-MM-DD for sorting
-                    timelineCounts[date] = (timelineCounts[date] || 0) + 1;
-                }}
-            }}
-        }});
-        const sortedDates = Object.keys(timelineCounts).sort();
-        
-        new Chart(document.getElementById('chart-timeline'), {{
+        charts.timeline = new Chart(document.getElementById('chart-timeline'), {{
             type: 'line',
             data: {{
-                labels: sortedDates.map(d => d.split('-').reverse().join('/')),
+                labels: summary.timeline.map(chartLabels.timeline),
                 datasets: [{{
                     label: 'Solicitações',
-                    data: sortedDates.map(d => timelineCounts[d]),
+                    data: summary.timeline.map(d => d[1]),
                     borderColor: '#10b981',
                     backgroundColor: 'rgba(16, 185, 129, 0.1)',
                     fill: true,
@@ -350,54 +543,402 @@ def create_html_template(data):
             options: {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend: {{ display: false }} }}, scales: {{ y: {{ grid: {{ color: '#334155' }} }}, x: {{ grid: {{ display: false }} }} }} }}
         }});
 
-        // --- Table Rendering ---
+        // Tendências do histórico (criadas na primeira vez que houver dados)
+        const trendCharts = {{}};
+        const TREND_COLORS = ['#f97316', '#a855f7', '#3b82f6', '#eab308', '#14b8a6'];
+        const trendOptions = {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend: {{ position: 'bottom', labels: {{ color: '#94a3b8' }} }} }}, scales: {{ y: {{ grid: {{ color: '#334155' }} }}, x: {{ grid: {{ display: false }} }} }} }};
+
+        // 'AAAA-MM-DD[ HH:00]' -> 'DD/MM[ HH:00]'; execuções mostram data e hora
+        function trendLabel(bucket) {{
+            const [day, time] = bucket.split(' ');
+            const label = day.split('-').slice(1).reverse().join('/');
+            return time ? `${{label}} ${{time.slice(0, 5)}}` : label;
+        }}
+
+        function renderTrend(trend) {{
+            document.getElementById('trend-row').style.display = trend ? '' : 'none';
+            if (!trend) return;
+            const labels = trend.buckets.map(trendLabel);
+            const overall = [
+                {{ label: 'Total', data: trend.total, borderColor: '#0ea5e9', tension: 0.3 }},
+                {{ label: 'Pendentes', data: trend.pending, borderColor: '#eab308', tension: 0.3 }},
+                {{ label: 'Fora do Prazo', data: trend.late, borderColor: '#ef4444', tension: 0.3 }},
+            ];
+            const sectors = trend.late_by_sector.map(([name, data], i) => (
+                {{ label: name, data, borderColor: TREND_COLORS[i % TREND_COLORS.length], tension: 0.3 }}
+            ));
+            [['overall', 'chart-trend', overall], ['sectors', 'chart-trend-sectors', sectors]].forEach(([key, id, datasets]) => {{
+                if (trendCharts[key]) {{
+                    trendCharts[key].data.labels = labels;
+                    trendCharts[key].data.datasets = datasets;
+                    trendCharts[key].update();
+                }} else {{
+                    trendCharts[key] = new Chart(document.getElementById(id), {{ type: 'line', data: {{ labels, datasets }}, options: trendOptions }});
+                }}
+            }});
+        }}
+        renderTrend(summary.trend);
+
+        // Aplica um novo resumo: KPIs e só os gráficos cujos dados mudaram
+        function applySummary(next) {{
+            if (JSON.stringify(next.kpis) !== JSON.stringify(summary.kpis)) renderKpis(next.kpis);
+            Object.keys(charts).forEach(key => {{
+                if (JSON.stringify(next[key]) === JSON.stringify(summary[key])) return;
+                const chart = charts[key];
+                chart.data.labels = next[key].map(chartLabels[key] || (d => d[0]));
+                chart.data.datasets[0].data = next[key].map(d => d[1]);
+                chart.update();
+            }});
+            if (JSON.stringify(next.trend) !== JSON.stringify(summary.trend)) renderTrend(next.trend);
+            summary = next;
+        }}
+
+        // --- Table Rendering (rolagem virtual + paginação + ordenação) ---
+        // Formato colunar (src/row_codec.py) -> linhas em listas + chave AAAA-MM-DD HH:MM no fim
+        function decodeRows(payload) {{
+            const pad = v => String(v).padStart(2, '0');
+            let sortKey = [];
+            const columns = payload.columns.map(name => {{
+                const [kind, a, b, extras] = payload.data[name];
+                if (kind === 'd') return b.map(code => a[code]);
+                if (kind === 'n') return a.map(String);
+                if (kind !== 't') return a;
+                // Data: minutos desde 00:00 do dia base, convertidos uma vez por valor distinto
+                const base = a ? Date.UTC(+a.slice(0, 4), +a.slice(5, 7) - 1, +a.slice(8, 10)) : 0;
+                const cache = new Map();
+                const text = new Array(payload.count);
+                const keys = new Array(payload.count);
+                b.forEach((minutes, i) => {{
+                    if (minutes === null) {{
+                        [text[i], keys[i]] = extras[i] || ['', ''];
+                        return;
+                    }}
+                    let value = cache.get(minutes);
+                    if (!value) {{
+                        const d = new Date(base + minutes * 60000);
+                        const day = [d.getUTCFullYear(), pad(d.getUTCMonth() + 1), pad(d.getUTCDate())];
+                        const time = pad(d.getUTCHours()) + ':' + pad(d.getUTCMinutes());
+                        value = [day.slice().reverse().join('/') + ' ' + time, day.join('-') + ' ' + time];
+                        cache.set(minutes, value);
+                    }}
+                    [text[i], keys[i]] = value;
+                }});
+                if (name === payload.key) sortKey = keys;
+                return text;
+            }});
+            const rows = new Array(payload.count);
+            const width = columns.length;
+            for (let i = 0; i < payload.count; i++) {{
+                const row = new Array(width + 1);
+                for (let c = 0; c < width; c++) row[c] = columns[c][i];
+                row[width] = sortKey[i] || '';
+                rows[i] = row;
+            }}
+            return {{ columns: payload.columns, rows }};
+        }}
+
+        let detail = window.DASHBOARD_ROWS ? decodeRows(window.DASHBOARD_ROWS) : {{ columns: {detail_columns}, rows: [] }};
+        const COL = Object.fromEntries(detail.columns.map((c, i) => [c, i]));
+        // Início ordena pela chave AAAA-MM-DD HH:MM (último valor de cada linha)
+        const SORT_KEY = {{ Inicio: detail.columns.length }};
+        const ROW_HEIGHT = 41;
+        const BUFFER = 10;
+        const collator = new Intl.Collator('pt-BR', {{ numeric: true, sensitivity: 'base' }});
+
+        const viewport = document.getElementById('table-viewport');
         const tbody = document.getElementById('table-body');
         const searchInput = document.getElementById('search-input');
-        
-        function renderTable(data) {{
-            tbody.innerHTML = '';
-            // Limit to 100 rows for performance in this simple view
-            data.slice(0, 100).forEach(row => {{
-                const tr = document.createElement('tr');
-                tr.className = 'hover:bg-gray-800/50 transition duration-150';
-                
-                // Helper for status color
-                let statusColor = 'text-gray-400';
-                if(row.Status === 'PENDENTE') statusColor = 'text-yellow-400';
-                
-                // Helper for deadline color
-                let prazoClass = 'bg-gray-800 text-gray-400';
-                if(row.TempoResolucao === 'FORA DE PRAZO') prazoClass = 'bg-red-500/10 text-red-500 border border-red-500/20';
-                
-                tr.innerHTML = `
-                    <td class="px-6 py-4 font-medium text-gray-200">${{row.Matricula}}</td>
-                    <td class="px-6 py-4">${{row.Nome}}</td>
-                    <td class="px-6 py-4">${{row.Setor}}</td>
-                    <td class="px-6 py-4 ${{statusColor}}">${{row.Status}}</td>
-                    <td class="px-6 py-4">${{row.Ocorrencia}}</td>
-                    <td class="px-6 py-4">
-                        <span class="px-2 py-1 rounded text-xs ${{prazoClass}}">
-                            ${{row.TempoResolucao}}
-                        </span>
-                    </td>
-                    <td class="px-6 py-4">${{row.Inicio}}</td>
-                `;
-                tbody.appendChild(tr);
+        const pageSizeSelect = document.getElementById('page-size');
+
+        let matches = detail.rows;   // linhas após a busca
+        let view = matches;          // linhas após a busca e a ordenação
+        let sortCol = null, sortDir = 1;
+        let page = 0, pageSize = parseInt(pageSizeSelect.value, 10);
+
+        // Espaçadores mantêm a altura total da página; linhas visíveis são reaproveitadas
+        function spacer() {{
+            const tr = document.createElement('tr');
+            const td = document.createElement('td');
+            td.colSpan = detail.columns.length;
+            td.style.padding = '0';
+            tr.appendChild(td);
+            return tr;
+        }}
+        const topPad = spacer(), bottomPad = spacer();
+        tbody.appendChild(topPad);
+        tbody.appendChild(bottomPad);
+        const pool = [];
+
+        function makeRow() {{
+            const tr = document.createElement('tr');
+            tr.className = 'hover:bg-gray-800/50 transition duration-150';
+            tr.style.height = ROW_HEIGHT + 'px';
+            const cells = detail.columns.map((c, i) => {{
+                const td = document.createElement('td');
+                td.className = 'px-6 py-2 whitespace-nowrap overflow-hidden text-ellipsis' + (i === 0 ? ' font-medium text-gray-200' : '');
+                tr.appendChild(td);
+                return td;
             }});
-            document.getElementById('row-count').innerText = data.length;
+            const badge = document.createElement('span');
+            badge.className = 'px-2 py-1 rounded text-xs';
+            cells[COL.TempoResolucao].appendChild(badge);
+            tbody.insertBefore(tr, bottomPad);
+            return {{ tr, cells, badge }};
         }}
-        
-        renderTable(rawData);
 
-        // Search functionality
-        searchInput.addEventListener('input', (e) => {{
-            const term = e.target.value.toLowerCase();
-            const filtered = rawData.filter(row => 
-                Object.values(row).some(val => String(val).toLowerCase().includes(term))
-            );
-            renderTable(filtered);
+        function fillRow(slot, row) {{
+            slot.cells.forEach((td, i) => {{
+                if (i !== COL.TempoResolucao) td.textContent = row[i];
+            }});
+            slot.badge.textContent = row[COL.TempoResolucao];
+            slot.cells[COL.Status].className = 'px-6 py-2 whitespace-nowrap overflow-hidden text-ellipsis ' + (row[COL.Status] === 'PENDENTE' ? 'text-yellow-400' : 'text-gray-400');
+            slot.badge.className = 'px-2 py-1 rounded text-xs ' + (row[COL.TempoResolucao] === 'FORA DE PRAZO' ? 'bg-red-500/10 text-red-500 border border-red-500/20' : 'bg-gray-800 text-gray-400');
+        }}
+
+        function pageBounds() {{
+            if (!pageSize) return [0, view.length];
+            const start = page * pageSize;
+            return [start, Math.min(view.length, start + pageSize)];
+        }}
+
+        function renderRows() {{
+            const [start, end] = pageBounds();
+            const count = end - start;
+            const first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - BUFFER);
+            const last = Math.min(count, first + Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 2 * BUFFER);
+
+            topPad.firstChild.style.height = (first * ROW_HEIGHT) + 'px';
+            bottomPad.firstChild.style.height = ((count - last) * ROW_HEIGHT) + 'px';
+
+            while (pool.length < last - first) pool.push(makeRow());
+            pool.forEach((slot, i) => {{
+                const index = start + first + i;
+                if (first + i < last) {{
+                    fillRow(slot, view[index]);
+                    slot.tr.style.display = '';
+                }} else {{
+                    slot.tr.style.display = 'none';
+                }}
+            }});
+        }}
+
+        function render(resetScroll = true) {{
+            const pages = pageSize ? Math.max(1, Math.ceil(view.length / pageSize)) : 1;
+            page = Math.min(page, pages - 1);
+            const [start, end] = pageBounds();
+            document.getElementById('row-count').innerText = view.length
+                ? (start + 1) + '–' + end + ' de ' + view.length + (view.length !== detail.rows.length ? ' (filtrados de ' + detail.rows.length + ')' : '')
+                : '0';
+            document.getElementById('page-label').innerText = (page + 1) + ' / ' + pages;
+            document.querySelectorAll('th[data-col]').forEach(th => {{
+                const label = th.textContent.replace(/ [▲▼]$/, '');
+                th.textContent = label + (th.dataset.col === sortCol ? (sortDir > 0 ? ' ▲' : ' ▼') : '');
+            }});
+            if (resetScroll) viewport.scrollTop = 0;
+            renderRows();
+        }}
+
+        function applySort() {{
+            if (sortCol === null) {{
+                view = matches;
+                return;
+            }}
+            const key = SORT_KEY[sortCol] !== undefined ? SORT_KEY[sortCol] : COL[sortCol];
+            view = matches.slice().sort((a, b) => sortDir * collator.compare(a[key], b[key]));
+        }}
+
+        document.querySelectorAll('th[data-col]').forEach(th => {{
+            th.addEventListener('click', () => {{
+                sortDir = sortCol === th.dataset.col ? -sortDir : 1;
+                sortCol = th.dataset.col;
+                applySort();
+                page = 0;
+                render();
+            }});
         }});
 
+        let scheduled = false;
+        viewport.addEventListener('scroll', () => {{
+            if (scheduled) return;
+            scheduled = true;
+            requestAnimationFrame(() => {{
+                scheduled = false;
+                renderRows();
+            }});
+        }});
+
+        document.getElementById('page-prev').addEventListener('click', () => {{
+            if (page > 0) {{ page--; render(); }}
+        }});
+        document.getElementById('page-next').addEventListener('click', () => {{
+            if (pageSize && (page + 1) * pageSize < view.length) {{ page++; render(); }}
+        }});
+        pageSizeSelect.addEventListener('change', () => {{
+            pageSize = parseInt(pageSizeSelect.value, 10);
+            page = 0;
+            render();
+        }});
+
+        // --- Busca pelo índice invertido gerado no Python ---
+        // Termos separados por espaço (todos precisam aparecer); setor:x e status:x
+        // restringem ao campo; aspas agrupam palavras (setor:"atendimento geral").
+        let searchIndex = window.DASHBOARD_INDEX || {{ gram: 3, vocab: [], postings: [], grams: {{}}, fields: {{}} }};
+        const fold = text => text.normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+
+        function intersect(a, b) {{
+            const out = [];
+            let i = 0, j = 0;
+            while (i < a.length && j < b.length) {{
+                if (a[i] === b[j]) {{ out.push(a[i]); i++; j++; }}
+                else if (a[i] < b[j]) i++;
+                else j++;
+            }}
+            return out;
+        }}
+
+        function union(lists) {{
+            if (lists.length === 1) return lists[0];
+            const total = lists.reduce((sum, list) => sum + list.length, 0);
+            if (total * 8 < detail.rows.length) {{
+                const ids = [].concat(...lists).sort((a, b) => a - b);
+                return ids.filter((id, i) => i === 0 || id !== ids[i - 1]);
+            }}
+            // Muitas linhas: marca em um bitmap e percorre em ordem
+            const seen = new Uint8Array(detail.rows.length);
+            lists.forEach(list => {{ for (const id of list) seen[id] = 1; }});
+            const ids = [];
+            for (let id = 0; id < seen.length; id++) if (seen[id]) ids.push(id);
+            return ids;
+        }}
+
+        // Termos do vocabulário que contêm o trecho digitado
+        function matchingTokens(term) {{
+            const n = searchIndex.gram;
+            if (term.length < n) {{
+                const ids = [];
+                searchIndex.vocab.forEach((token, id) => {{ if (token.includes(term)) ids.push(id); }});
+                return ids;
+            }}
+            let ids = null;
+            for (let i = 0; i + n <= term.length; i++) {{
+                const list = searchIndex.grams[term.substr(i, n)];
+                if (!list) return [];
+                ids = ids === null ? list : intersect(ids, list);
+                if (!ids.length) return [];
+            }}
+            return term.length === n ? ids : ids.filter(id => searchIndex.vocab[id].includes(term));
+        }}
+
+        function termRows(term) {{
+            return union(matchingTokens(term).map(id => searchIndex.postings[id]).concat([[]]));
+        }}
+
+        function fieldRows(name, value) {{
+            const field = searchIndex.fields[name];
+            const lists = [[]];
+            field.values.forEach((v, i) => {{ if (v.includes(value)) lists.push(field.rows[i]); }});
+            return union(lists);
+        }}
+
+        function search(query) {{
+            let ids = null;
+            const pattern = /(\\w+):"([^"]*)"|(\\w+):(\\S+)|"([^"]*)"|(\\S+)/g;
+            let m;
+            while ((m = pattern.exec(fold(query))) !== null) {{
+                const name = m[1] || m[3];
+                const value = m[2] !== undefined ? m[2] : m[4];
+                let lists;
+                if (name && searchIndex.fields[name]) {{
+                    lists = [fieldRows(name, value.trim())];
+                }} else {{
+                    // Texto livre: cada palavra precisa aparecer na linha
+                    lists = (m[0].replace(/"/g, '')).split(/\\s+/).filter(Boolean).map(termRows);
+                }}
+                for (const list of lists) {{
+                    ids = ids === null ? list : intersect(ids, list);
+                }}
+                if (ids !== null && !ids.length) break;
+            }}
+            return ids;
+        }}
+
+        function applySearch() {{
+            const ids = search(searchInput.value);
+            matches = ids === null ? detail.rows : ids.map(id => detail.rows[id]);
+            applySort();
+        }}
+
+        let searchTimer = null;
+        searchInput.addEventListener('input', () => {{
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {{
+                applySearch();
+                page = 0;
+                render();
+            }}, 120);
+        }});
+
+        render();
+
+        // --- Atualização incremental (servidor local) ---
+        let etag = summary.version ? '"' + summary.version + '"' : null;
+
+        async function fetchJson(url) {{
+            const res = await fetch(url, {{ cache: 'no-store' }});
+            if (!res.ok) throw new Error(url + ': ' + res.status);
+            return res.json();
+        }}
+
+        // Linhas da versão atual em páginas (/api/rows?page=) e o índice da busca
+        async function loadRows(version) {{
+            const first = await fetchJson('/api/rows?page=0');
+            const rest = await Promise.all(
+                Array.from({{ length: first.pages - 1 }}, (_, i) => fetchJson('/api/rows?page=' + (i + 1)))
+            );
+            const index = await fetchJson('/api/index');
+            const pages = [first].concat(rest);
+            // Dados trocados no meio da carga: a próxima consulta tenta de novo
+            if (pages.some(p => p.version !== version) || index.version !== version) return false;
+            detail = {{ columns: first.columns, rows: [].concat(...pages.map(p => decodeRows(p).rows)) }};
+            searchIndex = index;
+            applySearch();
+            render(false);
+            return true;
+        }}
+
+        async function poll() {{
+            try {{
+                const res = await fetch('/api/summary', {{ cache: 'no-store', headers: etag ? {{ 'If-None-Match': etag }} : {{}} }});
+                if (res.status === 200) {{
+                    const next = await res.json();
+                    if (next.version !== detail.version && await loadRows(next.version)) {{
+                        detail.version = next.version;
+                    }}
+                    if (detail.version === next.version) {{
+                        applySummary(next);
+                        etag = res.headers.get('ETag');
+                        document.getElementById('last-updated').innerText = new Date().toLocaleTimeString('pt-BR');
+                    }}
+                }}
+            }} catch (e) {{
+                console.warn('Falha ao atualizar o dashboard:', e);
+            }}
+            setTimeout(poll, POLL_MS);
+        }}
+
+        if (POLL_MS) {{
+            if (window.DASHBOARD_ROWS) {{
+                detail.version = summary.version;
+                setTimeout(poll, POLL_MS);
+            }} else {{
+                // Shell servido sem as linhas: carrega pela API
+                loadRows(summary.version).then(ok => {{ if (ok) detail.version = summary.version; }}).finally(() => setTimeout(poll, POLL_MS));
+            }}
+        }} else {{
+            // Arquivo aberto direto do disco: recarrega a página a cada 60s
+            setTimeout(() => location.reload(), 60000);
+        }}
+
     </script>
 </body>
 </html>
@@ -0,0 +1,204 @@
+import gzip
+import hashlib
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import config.settings as settings
+from src.dashboard_gen import (
+    ASSETS_DIR,
+    DETAIL_COLUMNS,
+    asset_bundle,
+    create_html_template,
+    dashboard_summary,
+    detail_payload,
+    load_painel_table,
+    resolve_painel_csv,
+)
+from src.manifest import file_sha256
+from src.search_index import build_search_index
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+# Respostas menores que isso não compensam o gzip
+GZIP_MIN_BYTES = 1024
+
+ASSET_TYPES = {"css": "text/css; charset=utf-8", "js": "application/javascript; charset=utf-8"}
+# Arquivos com hash no nome nunca mudam de conteúdo
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class DashboardData:
+    """
+    Dados servidos pela API, recalculados só quando a tabela do Painel muda
+    (caminho, tamanho ou data de modificação). As respostas ficam em cache já
+    serializadas, com ETag = versão (hash do CSV) e a variante gzip.
+    """
+
+    def __init__(self, page_size=None):
+        self.page_size = page_size or settings.DASHBOARD_PAGE_SIZE
+        self.lock = threading.Lock()
+        self.signature = None
+        self.version = None
+        self.summary = None
+        self.table = None
+        self.responses = {}
+        self.assets = {
+            name: (ASSET_TYPES[kind], content, _gzip(content), f'"{name}"')
+            for kind, (name, content) in asset_bundle().items()
+        }
+
+    def refresh(self):
+        """Recarrega o Painel se o arquivo mudou; retorna False se não houver dados"""
+        path = resolve_painel_csv()
+        if path is None:
+            return self.version is not None
+        stat = path.stat()
+        signature = (str(path), stat.st_size, stat.st_mtime_ns)
+
+        with self.lock:
+            if signature == self.signature:
+                return True
+            table = load_painel_table(path)
+            self.table = table
+            summary = dashboard_summary(table)
+            # Versão = conteúdo do Painel + tendências (execuções sem mudanças estendem as séries)
+            self.version = hashlib.sha1(
+                (file_sha256(path) + json.dumps(summary["trend"])).encode("utf-8")
+            ).hexdigest()[:16]
+            self.summary = dict(summary, version=self.version)
+            self.responses = {}
+            self.signature = signature
+            logger.info(f"Dashboard: {path.name} carregado ({len(table)} linhas, versão {self.version})")
+        return True
+
+    def pages(self):
+        return max(1, math.ceil(len(self.table) / self.page_size))
+
+    def response(self, key, build):
+        """Corpo serializado (e comprimido) de uma resposta, em cache por versão"""
+        with self.lock:
+            cached = self.responses.get(key)
+            if cached is None:
+                content_type, body = build()
+                cached = self.responses[key] = (content_type, body, _gzip(body), f'"{self.version}"')
+            return cached
+
+    def summary_json(self):
+        return "application/json", _json_bytes(self.summary)
+
+    def rows_json(self, page):
+        start = page * self.page_size
+        return "application/json", _json_bytes(dict(
+            detail_payload(self.table, start, start + self.page_size),
+            version=self.version,
+            page=page,
+            pages=self.pages(),
+            size=self.page_size,
+            total=len(self.table),
+        ))
+
+    def index_json(self):
+        index = build_search_index(self.table, DETAIL_COLUMNS)
+        return "application/json", _json_bytes(dict(index, version=self.version))
+
+    def shell_html(self):
+        html = create_html_template(self.summary, rows_src=None, poll_seconds=settings.DASHBOARD_POLL_SECONDS)
+        return "text/html; charset=utf-8", html.encode("utf-8")
+
+
+def _gzip(body):
+    return gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+
+
+def _json_bytes(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """
+    Rotas:
+      /                  HTML do dashboard (as linhas vêm da API)
+      /api/summary       KPIs, contagens e linha do tempo
+      /api/rows?page=N   linhas do detalhamento (formato colunar) em páginas de DASHBOARD_PAGE_SIZE
+      /api/index         índice da busca
+      /assets/<nome>     CSS e gráficos (nome com hash, cache permanente)
+    Todas respondem 304 quando If-None-Match coincide com a versão atual.
+    """
+
+    data = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith(f"/{ASSETS_DIR}/"):
+            asset = self.data.assets.get(url.path.rsplit("/", 1)[1])
+            if asset is None:
+                self.send_error(404)
+            else:
+                self._write(*asset, cache_control=ASSET_CACHE_CONTROL)
+            return
+
+        if not self.data.refresh():
+            self.send_error(503, "Nenhuma tabela do Painel encontrada em data/")
+            return
+
+        if url.path in ("/", "/index.html", "/dashboard.html"):
+            self._send("html", self.data.shell_html)
+        elif url.path == "/api/summary":
+            self._send("summary", self.data.summary_json)
+        elif url.path == "/api/index":
+            self._send("index", self.data.index_json)
+        elif url.path == "/api/rows":
+            try:
+                page = int(parse_qs(url.query).get("page", ["0"])[0])
+            except ValueError:
+                page = -1
+            if not 0 <= page < self.data.pages():
+                self.send_error(404, "Página inexistente")
+                return
+            self._send(f"rows:{page}", lambda: self.data.rows_json(page))
+        else:
+            self.send_error(404)
+
+    def _send(self, key, build):
+        self._write(*self.data.response(key, build))
+
+    def _write(self, content_type, body, compressed, etag, cache_control="no-cache"):
+        if etag in (self.headers.get("If-None-Match") or ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        use_gzip = compressed is not None and "gzip" in (self.headers.get("Accept-Encoding") or "")
+        payload = compressed if use_gzip else body
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Dashboard HTTP: {self.address_string()} {format % args}")
+
+
+def serve_dashboard(host=None, port=None):
+    """Inicia o servidor local do dashboard (bloqueia até Ctrl+C)"""
+    host = host or settings.DASHBOARD_HOST
+    port = port or settings.DASHBOARD_PORT
+    handler = type("Handler", (DashboardHandler,), {"data": DashboardData()})
+    server = ThreadingHTTPServer((host, port), handler)
+    logger.info(f"Dashboard em http://{host}:{port}/ (atualização a cada {settings.DASHBOARD_POLL_SECONDS}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Servidor do dashboard encerrado")
+    finally:
+        server.server_close()
@@ -0,0 +1,173 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+import config.settings as settings
+from src.dashboard_gen import generate_dashboard
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+# Eventos do inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Espera após o primeiro evento para juntar gravações em sequência
+SETTLE_SECONDS = 0.2
+
+
+def is_painel_output(name):
+    """Arquivos cuja chegada pode mudar o dashboard (ignora temporários)"""
+    if name.startswith(".") or name.endswith(".tmp"):
+        return False
+    return (
+        name == Path(settings.LATEST_RUN_FILE).name
+        or name == "current.csv"
+        or (name.startswith("tabela_") and "_p" in name and name.endswith(".csv"))
+    )
+
+
+def watched_dirs():
+    """
+    data/, data/cdc/ e o estado do Painel no modo incremental (data/cdc/p2/).
+    p2 só existe depois da primeira execução --incremental: o evento de
+    criação em data/cdc/ avisa quando ele aparece (ver refresh_watches).
+    """
+    dirs = [Path(settings.DATA_DIR), Path(settings.CDC_DIR), Path(settings.CDC_DIR) / "p2"]
+    return [d for d in dirs if d.is_dir()]
+
+
+def refresh_watches(watcher):
+    """Passa a observar diretórios que surgiram depois do início; retorna os novos"""
+    added = [d for d in watched_dirs() if d not in watcher.dirs]
+    for directory in added:
+        watcher.add(directory)
+        logger.info(f"Observando também {directory}")
+    return added
+
+
+class InotifyWatcher:
+    """Espera por arquivos novos com inotify (Linux), via ctypes"""
+
+    def __init__(self, dirs):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init falhou")
+        self.dirs = []
+        try:
+            for directory in dirs:
+                self.add(directory)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def add(self, directory):
+        """Observa mais um diretório (ex.: data/cdc/p2 criado depois do início)"""
+        wd = self.libc.inotify_add_watch(
+            self.fd, os.fsencode(str(directory)), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        )
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch falhou: {directory}")
+        self.dirs.append(Path(directory))
+
+    def wait(self, timeout=None):
+        """Nomes dos arquivos alterados (lista vazia se o tempo acabar)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        buffer = os.read(self.fd, 64 * 1024)
+        names = []
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            names.append(os.fsdecode(buffer[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback sem inotify (Windows, macOS): compara a listagem dos diretórios"""
+
+    def __init__(self, dirs, interval=None):
+        self.dirs = [Path(d) for d in dirs]
+        self.interval = interval or settings.WATCH_POLL_SECONDS
+        self.snapshot = self._scan()
+
+    def add(self, directory):
+        """Inclui mais um diretório; os arquivos dele contam como novos na próxima verificação"""
+        self.dirs.append(Path(directory))
+
+    def _scan(self):
+        files = {}
+        for directory in self.dirs:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and is_painel_output(entry.name):
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        current = self._scan()
+        changed = [Path(path).name for path, sig in current.items() if self.snapshot.get(path) != sig]
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(dirs):
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(dirs)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify indisponível ({e}); usando verificação periódica")
+    return PollingWatcher(dirs)
+
+
+def watch_dashboard():
+    """
+    Regenera o dashboard assim que uma nova tabela do Painel chega em data/
+    (bloqueia até Ctrl+C). A geração em si pula o trabalho se o conteúdo
+    da tabela não mudou.
+    """
+    generate_dashboard()
+    # data/cdc/ existe desde o início para a criação de data/cdc/p2 gerar evento
+    Path(settings.CDC_DIR).mkdir(parents=True, exist_ok=True)
+    dirs = watched_dirs()
+    watcher = create_watcher(dirs)
+    logger.info(
+        f"Observando {', '.join(str(d) for d in dirs)} ({type(watcher).__name__}); Ctrl+C para sair"
+    )
+    try:
+        while True:
+            names = [name for name in watcher.wait() if is_painel_output(name)]
+            # Um diretório novo pode já ter recebido o Painel antes de ser observado
+            added = refresh_watches(watcher)
+            if added:
+                names += [directory.name for directory in added]
+            if not names:
+                continue
+            # Junta as gravações de uma mesma execução (tabelas + manifesto)
+            deadline = time.monotonic() + SETTLE_SECONDS
+            while (remaining := deadline - time.monotonic()) > 0:
+                watcher.wait(remaining)
+            logger.info(f"Alteração detectada ({', '.join(sorted(set(names)))}); regenerando dashboard")
+            generate_dashboard()
+    except KeyboardInterrupt:
+        logger.info("Observação do dashboard encerrada")
+    finally:
+        watcher.close()
@@ -0,0 +1,146 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+import config.settings as settings
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+# Executáveis do Chrome/Chromium procurados fora do Windows
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+_VERSION_PATTERN = re.compile(r"\d+\.\d+\.\d+\.\d+")
+
+
+def detect_chrome_version():
+    """Versão instalada do Chrome (ex.: '131.0.6778.85'), ou None se não encontrada"""
+    if sys.platform.startswith("win"):
+        import winreg
+
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                continue
+        return None
+
+    for binary in CHROME_BINARIES:
+        path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+        if not path:
+            continue
+        try:
+            output = subprocess.run(
+                [path, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except Exception:
+            continue
+        match = _VERSION_PATTERN.search(output)
+        if match:
+            return match.group(0)
+    return None
+
+
+class DriverCache:
+    """
+    Caminho do ChromeDriver por versão do Chrome (data/driver_cache.json).
+    O webdriver-manager só é consultado quando a versão instalada muda; sem
+    internet, reaproveita um driver já baixado ou deixa o Selenium Manager resolver.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.DRIVER_CACHE_FILE)
+        self.entries = self._load()
+
+    def _load(self):
+        """Carrega o cache do disco (vazio se ausente ou corrompido)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Cache de drivers ignorado ({self.path.name}): {e}")
+            return {}
+
+    def _save(self):
+        """Grava o cache no disco"""
+        try:
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar o cache de drivers: {e}")
+
+    def _cached_path(self, version):
+        """Driver gravado para a versão, se o arquivo ainda existir"""
+        entry = self.entries.get(version)
+        if entry and os.path.isfile(entry["path"]):
+            return entry["path"]
+        return None
+
+    def _fallback_path(self, version):
+        """Sem internet: driver da mesma versão principal, senão o mais recente existente"""
+        major = version.split(".")[0] if version else None
+        candidates = sorted(
+            self.entries.items(), key=lambda item: item[1].get("updated", ""), reverse=True
+        )
+        if major:
+            for cached_version, entry in candidates:
+                if cached_version.split(".")[0] == major and os.path.isfile(entry["path"]):
+                    return entry["path"]
+        for _, entry in candidates:
+            if os.path.isfile(entry["path"]):
+                return entry["path"]
+        return None
+
+    def resolve(self):
+        """
+        Retorna o caminho do ChromeDriver, ou None para delegar ao Selenium
+        Manager (webdriver.Chrome sem executable_path).
+        """
+        started = time.perf_counter()
+        version = detect_chrome_version()
+
+        path = self._cached_path(version) if version else None
+        if path:
+            logger.info(f"ChromeDriver em cache para Chrome {version}: {path}")
+            return path
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            path = ChromeDriverManager().install()
+            if version:
+                self.entries[version] = {
+                    "path": path,
+                    "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+                self._save()
+            logger.info(
+                f"ChromeDriver resolvido pelo webdriver-manager em "
+                f"{time.perf_counter() - started:.1f}s: {path}"
+            )
+            return path
+        except Exception as e:
+            logger.warning(f"webdriver-manager indisponível (sem internet?): {e}")
+
+        path = self._fallback_path(version)
+        if path:
+            logger.info(f"Usando ChromeDriver do cache (modo offline): {path}")
+            return path
+
+        logger.info("Nenhum ChromeDriver em cache; delegando ao Selenium Manager")
+        return None
@@ -9,16 +9,21 @@ project_root = str(Path(__file__).resolve().parent.parent)
 sys.path.append(project_root)
 
 import config.settings as settings
+from src.manifest import latest_painel_csv
 
 def fix_latest_csv():
-    data_dir = Path(settings.DATA_DIR)
-    csv_files = list(data_dir.glob("tabela_*_p2_t0.csv"))
-    
-    if not csv_files:
-        print("Nenhum arquivo encontrado.")
-        return
+    # Painel da última execução pelo índice; sem índice, varre data/
+    latest_csv = latest_painel_csv()
+    if latest_csv is None:
+        data_dir = Path(settings.DATA_DIR)
+        csv_files = list(data_dir.glob("tabela_*_p2_t0.csv"))
+        
+        if not csv_files:
+            print("Nenhum arquivo encontrado.")
+            return
+
+        latest_csv = max(csv_files, key=os.path.getmtime)
 
-    latest_csv = max(csv_files, key=os.path.getmtime)
     print(f"Verificando arquivo: {latest_csv}")
 
     with open(latest_csv, 'r', encoding='utf-8-sig') as f:
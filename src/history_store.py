@@ -0,0 +1,313 @@
+import csv
+import json
+import sqlite3
+import time
+from contextlib import closing
+from datetime import date, timedelta
+from pathlib import Path
+import config.settings as settings
+from src.page_parser import (
+    PAINEL_HEADERS,
+    painel_datetime,
+    painel_is_late,
+    painel_record,
+)
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+# Colunas do Painel no banco (snake_case, mesma ordem de PAINEL_HEADERS)
+PAINEL_COLUMNS = [
+    "matricula", "nome", "ficha", "prioridade", "followup", "setor",
+    "status", "usuario", "macro", "ocorrencia", "motivo", "submotivo",
+    "inicio", "tempo_resolucao", "prazo_setor", "conclusao",
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_ts TEXT NOT NULL,
+    painel_rows INTEGER NOT NULL DEFAULT 0,
+    table_rows INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS painel (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    run_ts TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    {", ".join(f"{column} TEXT" for column in PAINEL_COLUMNS)},
+    inicio_iso TEXT,
+    atrasado INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tabelas (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    run_ts TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    table_index INTEGER NOT NULL,
+    row_index INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_ts ON runs(run_ts);
+CREATE INDEX IF NOT EXISTS idx_painel_run_ts ON painel(run_ts);
+CREATE INDEX IF NOT EXISTS idx_painel_setor ON painel(setor, run_ts);
+CREATE INDEX IF NOT EXISTS idx_painel_status ON painel(status, run_ts);
+CREATE INDEX IF NOT EXISTS idx_painel_motivo ON painel(motivo, run_ts);
+CREATE INDEX IF NOT EXISTS idx_painel_inicio ON painel(inicio_iso);
+CREATE INDEX IF NOT EXISTS idx_painel_atrasado ON painel(atrasado, run_ts);
+CREATE INDEX IF NOT EXISTS idx_tabelas_run ON tabelas(run_id);
+CREATE INDEX IF NOT EXISTS idx_painel_run_id ON painel(run_id);
+CREATE TABLE IF NOT EXISTS rollups (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    setor TEXT NOT NULL,
+    status TEXT NOT NULL,
+    atrasado INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    last_count INTEGER NOT NULL,
+    last_run_ts TEXT NOT NULL,
+    PRIMARY KEY (granularity, bucket, setor, status, atrasado)
+);
+CREATE TABLE IF NOT EXISTS rollup_buckets (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    last_run_ts TEXT NOT NULL,
+    PRIMARY KEY (granularity, bucket)
+);
+"""
+
+# Versão do esquema gravada em PRAGMA user_version; ao mudar SCHEMA, incremente
+# para que bancos existentes rodem o script (idempotente) uma vez na abertura
+SCHEMA_VERSION = 1
+
+# Agregados mantidos a cada execução (tendências sem reler o histórico bruto)
+GRANULARITIES = ("run", "hour", "day", "week")
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (granularity, bucket, setor, status, atrasado, total, last_count, last_run_ts)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (granularity, bucket, setor, status, atrasado) DO UPDATE SET
+    total = total + excluded.total,
+    last_count = CASE WHEN excluded.last_run_ts >= last_run_ts THEN excluded.last_count ELSE last_count END,
+    last_run_ts = MAX(last_run_ts, excluded.last_run_ts)
+"""
+_UPSERT_BUCKET = """
+INSERT INTO rollup_buckets (granularity, bucket, runs, last_run_ts) VALUES (?, ?, 1, ?)
+ON CONFLICT (granularity, bucket) DO UPDATE SET
+    runs = runs + 1,
+    last_run_ts = MAX(last_run_ts, excluded.last_run_ts)
+"""
+
+
+def rollup_bucket(run_ts, granularity):
+    """Período de uma execução: o próprio horário, a hora, o dia ou a segunda-feira da semana"""
+    if granularity == "run":
+        return run_ts
+    if granularity == "hour":
+        return run_ts[:13] + ":00"
+    if granularity == "day":
+        return run_ts[:10]
+    day = date.fromisoformat(run_ts[:10])
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+_INSERT_PAINEL = (
+    f"INSERT INTO painel (run_id, run_ts, page, {', '.join(PAINEL_COLUMNS)}, inicio_iso, atrasado) "
+    f"VALUES ({', '.join('?' * (len(PAINEL_COLUMNS) + 5))})"
+)
+_INSERT_TABELA = (
+    "INSERT INTO tabelas (run_id, run_ts, page, table_index, row_index, data) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class HistoryStore:
+    """
+    Histórico de todas as execuções em SQLite (data/history.db), em modo WAL
+    para o dashboard poder ler enquanto uma extração grava. Cada execução
+    entra em uma única transação (executemany); consultas entre execuções
+    usam os índices de setor, status, motivo, início e horário da execução.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.HISTORY_DB)
+        # Banco já na versão atual: nenhuma DDL (leitores não disputam o banco com quem grava)
+        with closing(self._connect()) as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # Banco anterior aos agregados: calcula uma vez a partir do histórico
+            pending = conn.execute(
+                "SELECT 1 FROM runs WHERE painel_rows > 0 LIMIT 1"
+            ).fetchone() and not conn.execute("SELECT 1 FROM rollup_buckets LIMIT 1").fetchone()
+        if pending:
+            self.rebuild_rollups()
+        with closing(self._connect()) as conn:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connect(self):
+        """Nova conexão (uma por operação: seguro entre threads e processos)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record_run(self, extracted_data, run_ts=None):
+        """
+        Grava uma execução: linhas do Painel (lidas do CSV gravado em streaming)
+        e as demais tabelas de extracted_data. Retorna o id da execução.
+        """
+        run_ts = run_ts or time.strftime("%Y-%m-%d %H:%M:%S")
+        started = time.perf_counter()
+
+        with closing(self._connect()) as conn, conn:
+            run_id = conn.execute("INSERT INTO runs (run_ts) VALUES (?)", (run_ts,)).lastrowid
+            painel_rows = table_rows = 0
+
+            for page, page_data in enumerate(extracted_data):
+                painel = page_data.get("painel")
+                if painel and painel.get("files", {}).get("csv"):
+                    cursor = conn.executemany(
+                        _INSERT_PAINEL, self._painel_params(run_id, run_ts, page, painel["files"]["csv"])
+                    )
+                    painel_rows += cursor.rowcount
+
+                for table_index, table in enumerate(page_data.get("tables") or []):
+                    cursor = conn.executemany(
+                        _INSERT_TABELA,
+                        (
+                            (run_id, run_ts, page, table_index, row_index, json.dumps(row, ensure_ascii=False))
+                            for row_index, row in enumerate(table)
+                        ),
+                    )
+                    table_rows += cursor.rowcount
+
+            conn.execute(
+                "UPDATE runs SET painel_rows = ?, table_rows = ? WHERE id = ?",
+                (painel_rows, table_rows, run_id),
+            )
+            if painel_rows:
+                self._update_rollups(conn, run_id, run_ts)
+
+        logger.info(
+            f"Histórico: execução {run_id} gravada ({painel_rows} linhas do Painel, "
+            f"{table_rows} linhas de tabelas) em {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return run_id
+
+    @staticmethod
+    def _painel_params(run_id, run_ts, page, csv_path):
+        """Gera os parâmetros de INSERT a partir do CSV do Painel"""
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.reader(f):
+                record = painel_record(row)
+                if record is None:
+                    continue
+                yield (
+                    run_id, run_ts, page,
+                    *(record[header] for header in PAINEL_HEADERS),
+                    painel_datetime(record["Inicio"]),
+                    int(painel_is_late(record)),
+                )
+
+    @staticmethod
+    def _update_rollups(conn, run_id, run_ts):
+        """Soma a execução aos agregados por execução, hora, dia e semana (Setor x Status x SLA)"""
+        groups = conn.execute(
+            "SELECT setor, status, atrasado, COUNT(*) FROM painel WHERE run_id = ? "
+            "GROUP BY setor, status, atrasado",
+            (run_id,),
+        ).fetchall()
+        for granularity in GRANULARITIES:
+            bucket = rollup_bucket(run_ts, granularity)
+            conn.executemany(
+                _UPSERT_ROLLUP,
+                (
+                    (granularity, bucket, setor or "", status or "", atrasado, count, count, run_ts)
+                    for setor, status, atrasado, count in groups
+                ),
+            )
+            conn.execute(_UPSERT_BUCKET, (granularity, bucket, run_ts))
+
+    def rebuild_rollups(self):
+        """Recalcula todos os agregados a partir do histórico (bancos antigos ou reparo)"""
+        started = time.perf_counter()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM rollups")
+            conn.execute("DELETE FROM rollup_buckets")
+            runs = conn.execute("SELECT id, run_ts FROM runs WHERE painel_rows > 0 ORDER BY run_ts").fetchall()
+            for run_id, run_ts in runs:
+                self._update_rollups(conn, run_id, run_ts)
+        logger.info(
+            f"Histórico: agregados recalculados para {len(runs)} execuções "
+            f"em {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    def trend(self, granularity="day", by=None, days=30, value="avg", late_only=False):
+        """
+        Série temporal lida só dos agregados. `by`: None (total), "setor",
+        "status" ou "atrasado"; `value`: "avg" (média das execuções do
+        período) ou "last" (última execução do período); `late_only`
+        conta só as fichas fora do prazo.
+        Retorna {"buckets": [...], "series": {grupo: [valor por período]}}.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularidade inválida: {granularity}")
+        if by not in (None, "setor", "status", "atrasado"):
+            raise ValueError(f"Agrupamento inválido: {by}")
+        measure = {
+            "avg": "SUM(r.total) * 1.0 / b.runs",
+            "last": "SUM(CASE WHEN r.last_run_ts = b.last_run_ts THEN r.last_count ELSE 0 END)",
+        }[value]
+        group = by or "'total'"
+        since = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - days * 86400))
+        rows = self.query(
+            f"SELECT r.bucket AS bucket, {group} AS grupo, {measure} AS valor "
+            "FROM rollups r JOIN rollup_buckets b "
+            "ON b.granularity = r.granularity AND b.bucket = r.bucket "
+            "WHERE r.granularity = ? AND b.last_run_ts >= ? "
+            f"{'AND r.atrasado = 1 ' if late_only else ''}"
+            f"GROUP BY r.bucket, {group} ORDER BY r.bucket",
+            (granularity, since),
+        )
+        buckets = sorted({row["bucket"] for row in rows})
+        position = {bucket: i for i, bucket in enumerate(buckets)}
+        series = {}
+        for row in rows:
+            values = series.setdefault(str(row["grupo"]), [0] * len(buckets))
+            values[position[row["bucket"]]] = round(row["valor"], 1)
+        return {"buckets": buckets, "series": series}
+
+    def query(self, sql, params=()):
+        """Consulta livre; retorna lista de dicts"""
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def runs(self, limit=20):
+        """Últimas execuções gravadas"""
+        return self.query("SELECT * FROM runs ORDER BY run_ts DESC LIMIT ?", (limit,))
+
+    def latest_painel(self):
+        """Linhas do Painel da execução mais recente"""
+        return self.query(
+            "SELECT * FROM painel WHERE run_id = (SELECT MAX(run_id) FROM painel)"
+        )
+
+    def late_by_sector(self, days=30):
+        """Fichas fora do prazo por setor nos últimos `days` dias (cada ficha conta uma vez)"""
+        since = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - days * 86400))
+        return self.query(
+            "SELECT setor, COUNT(DISTINCT ficha) AS fichas FROM painel "
+            "WHERE atrasado = 1 AND run_ts >= ? GROUP BY setor ORDER BY fichas DESC",
+            (since,),
+        )
+
+    def count_by(self, column, days=30):
+        """Fichas distintas por setor, status ou motivo nos últimos `days` dias"""
+        if column not in ("setor", "status", "motivo"):
+            raise ValueError(f"Coluna não indexada: {column}")
+        since = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - days * 86400))
+        return self.query(
+            f"SELECT {column}, COUNT(DISTINCT ficha) AS fichas FROM painel "
+            f"WHERE run_ts >= ? GROUP BY {column} ORDER BY fichas DESC",
+            (since,),
+        )
@@ -0,0 +1,176 @@
+import hashlib
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import config.settings as settings
+from src.utils import setup_logging
+from src.page_parser import (
+    find_navigation_url,
+    find_next_page_url,
+    frame_url,
+    is_login_page,
+    make_soup,
+    page_title,
+    parse_table_rows,
+    parse_workflow_html,
+)
+
+logger = setup_logging()
+
+# Seletores do link para o Painel na página Workflow (mesmos da navegação via Selenium)
+PAINEL_LINK_SELECTORS = [
+    "a[href*='painel']",
+    "a[href*='Painel']",
+    "img[src*='painel']",
+    "img[title*='Painel']",
+    "[onclick*='painel']",
+]
+# Frames da página Workflow onde o link pode estar (mesma ordem da navegação via Selenium)
+PAINEL_LINK_FRAMES = ["cima", "baixo", "topo"]
+
+
+class SiriusHttpClient:
+    """
+    Cliente HTTP keep-alive que reaproveita a sessão autenticada do Selenium.
+    Workflow e Painel são HTML renderizado no servidor, então após o login
+    o Chrome pode ser fechado e as páginas buscadas direto via requests.
+    """
+
+    def __init__(self, pool_size=4, timeout=None):
+        self.timeout = timeout or settings.BROWSER_TIMEOUT
+        self.requests_made = 0
+
+        self.session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """Cria o cliente copiando cookies e User-Agent do navegador autenticado"""
+        client = cls(**kwargs)
+        client.load_cookies(driver.get_cookies())
+        try:
+            client.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+        except Exception:
+            pass
+        logger.info(f"Sessão HTTP criada com {len(client.session.cookies)} cookies do navegador")
+        return client
+
+    def load_cookies(self, cookies):
+        """Carrega cookies no formato do Selenium (lista de dicts)"""
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+            )
+
+    def fetch(self, url, allow_login=False):
+        """
+        GET de uma página; retorna (url final, html). Se a resposta for a tela
+        de login (sessão expirada), levanta RuntimeError em vez de devolver uma
+        página sem dados; allow_login=True devolve a resposta como veio.
+        """
+        started = time.perf_counter()
+        response = self.session.get(url, timeout=self.timeout)
+        self.requests_made += 1
+        response.raise_for_status()
+
+        # Sem charset no Content-Type o requests assume ISO-8859-1
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            response.encoding = response.apparent_encoding
+
+        logger.info(
+            f"HTTP {response.status_code} {url} "
+            f"({(time.perf_counter() - started) * 1000:.0f} ms, {len(response.content)} bytes)"
+        )
+        # Só monta o soup se a página pode ter o campo de senha
+        html = response.text
+        if not allow_login and (
+            "validacao" in response.url or ("password" in html.lower() and is_login_page(response.url, html))
+        ):
+            raise RuntimeError(f"Sessão HTTP inválida: {url} retornou a tela de login")
+        return response.url, html
+
+    def iter_pages(self, url, max_pages=None):
+        """
+        Percorre uma listagem paginada seguindo os links de próxima página.
+        Para ao repetir uma URL ou um conteúdo já visto. Gera (url, html, soup).
+        """
+        max_pages = max_pages or settings.PAINEL_MAX_PAGES
+        seen_urls = set()
+        seen_pages = set()
+
+        while url and url not in seen_urls and len(seen_urls) < max_pages:
+            seen_urls.add(url)
+            final_url, html = self.fetch(url)
+
+            digest = hashlib.sha1(html.encode("utf-8")).hexdigest()
+            if digest in seen_pages:
+                logger.info("Página repetida detectada, fim da paginação")
+                break
+            seen_pages.add(digest)
+
+            soup = make_soup(html)
+            yield final_url, html, soup
+            url = find_next_page_url(soup, final_url)
+
+    def extract_page(self, url):
+        """Extração genérica (tabelas + texto) de uma página, seguindo o frame 'baixo'"""
+        final_url, html = self.fetch(url)
+        soup = make_soup(html)
+        title = page_title(soup)
+
+        content_url = frame_url(soup, final_url, "baixo")
+        if content_url:
+            final_url, html = self.fetch(content_url)
+            soup = make_soup(html)
+
+        return {
+            "url": final_url,
+            "title": title,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "tables": parse_table_rows(soup),
+            "text_content": parse_workflow_html(html)["raw_text"],
+        }
+
+    def extract_workflow_page(self, url, html=None):
+        """Extração no formato workflow_data de uma página já buscada (ou busca agora)"""
+        if html is None:
+            url, html = self.fetch(url)
+        workflow_data = {
+            "url": url,
+            "title": page_title(make_soup(html)),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        workflow_data.update(parse_workflow_html(html))
+        return workflow_data
+
+    def find_painel_url(self, workflow_url, workflow_html):
+        """
+        Resolve a URL do Painel a partir do HTML da página Workflow; sem link
+        na própria página, busca nos frames cima/baixo/topo, como o navegador.
+        """
+        soup = make_soup(workflow_html)
+        url = find_navigation_url(soup, workflow_url, PAINEL_LINK_SELECTORS)
+        if url:
+            return url
+
+        for frame_name in PAINEL_LINK_FRAMES:
+            content_url = frame_url(soup, workflow_url, frame_name)
+            if not content_url:
+                continue
+            final_url, html = self.fetch(content_url)
+            url = find_navigation_url(make_soup(html), final_url, PAINEL_LINK_SELECTORS)
+            if url:
+                logger.info(f"Link do Painel encontrado no frame '{frame_name}'")
+                return url
+        return None
+
+    def close(self):
+        """Fecha as conexões do pool"""
+        self.session.close()
@@ -0,0 +1,148 @@
+import csv
+import hashlib
+import json
+import time
+from pathlib import Path
+import config.settings as settings
+from src.sinks import atomic_open
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+
+def file_sha256(path):
+    """Checksum SHA-256 do arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def csv_header(path):
+    """Primeira linha de um CSV (esquema da tabela)"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def page_kind(page_data, index):
+    """Nome lógico da página: home, workflow ou painel"""
+    if page_data.get("painel"):
+        return "painel"
+    if index == 0:
+        return "home"
+    if "workflow" in (page_data.get("url") or "").lower():
+        return "workflow"
+    return f"pagina_{index}"
+
+
+def _relative(path):
+    """Caminho relativo a data/ (o manifesto continua válido se a pasta mudar de lugar)"""
+    path = Path(path)
+    try:
+        return path.resolve().relative_to(Path(settings.DATA_DIR).resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _entry(path, kind, page, page_index, rows, columns):
+    return {
+        "path": _relative(path),
+        "kind": kind,
+        "page": page,
+        "page_index": page_index,
+        "rows": rows,
+        "columns": columns,
+        "bytes": Path(path).stat().st_size,
+        "sha256": file_sha256(path),
+    }
+
+
+def build_manifest(extracted_data, output, run_ts=None):
+    """
+    Manifesto de uma execução: cada arquivo gravado com página, quantidade
+    de linhas, colunas e checksum. `output` é o OutputWriter já concluído.
+    """
+    files = []
+    pages = [page_kind(page_data, i) for i, page_data in enumerate(extracted_data)]
+
+    for fmt, path in output.paths.items():
+        if fmt != "tables":
+            files.append(_entry(path, fmt, None, None, output.pages, None))
+
+    for table in output.tables:
+        files.append(
+            _entry(table["path"], "table", pages[table["page"]], table["page"], table["rows"], table["columns"])
+        )
+
+    for i, page_data in enumerate(extracted_data):
+        painel = page_data.get("painel")
+        if not painel:
+            continue
+        for fmt, path in painel.get("files", {}).items():
+            if not Path(path).exists():
+                continue
+            columns = csv_header(path) if fmt == "csv" else None
+            # "csv" é a tabela completa (snapshot ou estado atual do modo incremental)
+            kind = "painel" if fmt == "csv" else f"painel_{fmt}"
+            files.append(_entry(path, kind, "painel", i, painel.get("rows"), columns))
+
+    return {
+        "run_ts": run_ts or time.strftime("%Y-%m-%d %H:%M:%S"),
+        "pages": pages,
+        "files": files,
+    }
+
+
+def write_manifest(manifest):
+    """
+    Grava data/runs/run_<timestamp>.json e atualiza data/latest_run.json,
+    o índice pequeno que aponta para a execução mais recente.
+    """
+    runs_dir = Path(settings.RUNS_DIR)
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    stamp = manifest["run_ts"].replace(" ", "_").replace(":", "-")
+    manifest_path = runs_dir / f"run_{stamp}.json"
+    with atomic_open(manifest_path) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # Painel principal: o de menor índice de página (as visões extras vêm depois)
+    painel_files = sorted(
+        (entry for entry in manifest["files"] if entry["kind"] == "painel"),
+        key=lambda entry: entry["page_index"],
+    )
+    index = {
+        "run_ts": manifest["run_ts"],
+        "manifest": _relative(manifest_path),
+        "painel": painel_files[0] if painel_files else None,
+        "tables": [entry for entry in manifest["files"] if entry["kind"] == "table"],
+    }
+    with atomic_open(settings.LATEST_RUN_FILE) as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"Manifesto da execução: {manifest_path.name} ({len(manifest['files'])} arquivos)")
+    return manifest_path
+
+
+def load_latest_run():
+    """Índice da execução mais recente (data/latest_run.json), ou None"""
+    try:
+        with open(settings.LATEST_RUN_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Índice de execuções ignorado: {e}")
+        return None
+
+
+def latest_painel_csv():
+    """
+    Tabela do Painel da execução mais recente, resolvida pelo índice sem
+    varrer data/. None se não houver índice ou se o arquivo não existir mais.
+    """
+    index = load_latest_run()
+    if not index or not index.get("painel"):
+        return None
+    path = Path(settings.DATA_DIR) / index["painel"]["path"]
+    return path if path.exists() else None
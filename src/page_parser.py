@@ -0,0 +1,482 @@
+import hashlib
+import json
+import re
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, PreformattedString
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+# Seletores de cards e painéis usados pelas duas estratégias de extração
+CARD_SELECTORS = [
+    ".card",
+    ".workflow-card",
+    ".task-card",
+    ".process-card",
+    "[class*='card']",
+    "[class*='workflow']",
+    ".kanban-card",
+    ".task-item",
+    ".process-item",
+]
+
+PANEL_SELECTORS = [
+    ".panel",
+    ".panel-body",
+    ".widget",
+    ".dashboard-widget",
+    ".info-box",
+    ".stat-box",
+    ".status-panel",
+]
+
+WORKFLOW_TABLE_SELECTOR = "table, .dataTable, .workflow-table"
+
+# Elementos cujo conteúdo não aparece no texto visível
+_HIDDEN_TAGS = {"script", "style", "noscript", "template", "head", "title"}
+
+# Elementos que quebram linha no texto renderizado (aproxima o .text do Selenium)
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "tbody", "thead", "tfoot", "tr", "ul",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def make_soup(html):
+    """Cria o BeautifulSoup usando lxml quando disponível"""
+    try:
+        return BeautifulSoup(html, "lxml")
+    except Exception:
+        return BeautifulSoup(html, "html.parser")
+
+
+def element_text(element):
+    """Texto visível de um elemento, com uma linha por bloco/<br>"""
+    if element is None:
+        return ""
+
+    parts = []
+    # Pilha com nós a visitar; None marca o fim de um bloco (quebra de linha)
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            parts.append("\n")
+        elif isinstance(node, NavigableString):
+            if not isinstance(node, PreformattedString):
+                parts.append(_WHITESPACE.sub(" ", str(node)))
+        elif node.name in _HIDDEN_TAGS:
+            continue
+        elif node.name == "br":
+            parts.append("\n")
+        else:
+            if node.name in _BLOCK_TAGS:
+                parts.append("\n")
+                stack.append(None)
+            elif node.name in ("td", "th"):
+                parts.append(" ")
+            stack.extend(reversed(node.contents))
+
+    lines = (line.strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def normalize_table_data(table_data):
+    """
+    Normaliza dados de tabela, tratando casos de tabelas verticais
+    onde cada célula contém a coluna inteira separada por quebras de linha.
+    """
+    if not table_data or len(table_data) > 3:  # Se tem muitas linhas, provavelmente já está ok
+        return table_data
+
+    # Verifica se a primeira linha tem células com muitas quebras de linha
+    first_row = table_data[0]
+    multiline_cells = sum(1 for cell in first_row if isinstance(cell, str) and '\n' in cell)
+
+    # Se mais da metade das células tem quebras de linha, ou se tem poucas linhas mas conteúdo extenso
+    if multiline_cells > len(first_row) / 2 or (len(table_data) == 1 and multiline_cells > 0):
+        logger.info("Detectada tabela vertical/transposta. Normalizando...")
+
+        # Divide cada célula em uma lista de valores
+        columns = []
+        max_rows = 0
+
+        for cell in first_row:
+            if isinstance(cell, str):
+                values = [v.strip() for v in cell.split('\n')]
+                columns.append(values)
+                max_rows = max(max_rows, len(values))
+            else:
+                columns.append([str(cell)])
+
+        # Reconstrói a tabela transpondo as colunas para linhas
+        normalized_data = []
+        for i in range(max_rows):
+            new_row = []
+            for col in columns:
+                if i < len(col):
+                    new_row.append(col[i])
+                else:
+                    new_row.append("") # Preenchimento para colunas menores
+            normalized_data.append(new_row)
+
+        logger.info(f"Tabela normalizada: {len(normalized_data)} linhas encontradas.")
+        return normalized_data
+
+    return table_data
+
+
+def rows_to_workflow_table(headers, rows):
+    """Converte linhas de células em dicts (por cabeçalho ou col_i)"""
+    table_data = []
+    for cells in rows:
+        if not cells:
+            continue
+        if headers:
+            row_dict = {
+                headers[i]: value for i, value in enumerate(cells) if i < len(headers)
+            }
+        else:
+            row_dict = {f"col_{i}": value for i, value in enumerate(cells)}
+        if any(row_dict.values()):
+            table_data.append(row_dict)
+    return table_data
+
+
+def finalize_workflow_table(table_data):
+    """
+    Trata tabelas verticais do Workflow: uma única linha sem cabeçalhos
+    ({'col_0': 'Matricula\\n...'}) é normalizada e reconvertida em dicts,
+    usando a primeira linha normalizada como cabeçalho.
+    """
+    if len(table_data) == 1 and any('\n' in str(v) for v in table_data[0].values()):
+        list_data = [list(table_data[0].values())]
+        normalized = normalize_table_data(list_data)
+
+        if normalized and len(normalized) > 1:
+            headers = normalized[0]
+            new_table_data = []
+            for row in normalized[1:]:
+                new_row = {headers[i]: row[i] for i in range(len(headers)) if i < len(row)}
+                new_table_data.append(new_row)
+            return new_table_data
+
+    return table_data
+
+
+def _field_type(field):
+    """Equivalente offline de get_attribute('type') or tag_name"""
+    if field.name == "input":
+        return field.get("type") or "text"
+    if field.name == "select":
+        return "select-multiple" if field.has_attr("multiple") else "select-one"
+    return field.name
+
+
+def _field_value(field):
+    """Equivalente offline da propriedade value do elemento"""
+    if field.name == "textarea":
+        return field.get_text()
+    if field.name == "select":
+        option = field.find("option", selected=True) or field.find("option")
+        if option is None:
+            return ""
+        return option.get("value", option.get_text(strip=True))
+    return field.get("value")
+
+
+def parse_cards(soup):
+    """Cards de workflow por seletor"""
+    cards = []
+    for selector in CARD_SELECTORS:
+        for card in soup.select(selector):
+            card_text = element_text(card)
+            if card_text and len(card_text) > 5:
+                cards.append({
+                    "type": "card",
+                    "selector": selector,
+                    "content": card_text,
+                    "html": str(card)[:500],
+                })
+    return cards
+
+
+def parse_lists(soup):
+    """Listas ul/ol com itens não vazios"""
+    lists = []
+    for lst in soup.select("ul, ol"):
+        items = lst.find_all("li")
+        if not items:
+            continue
+        texts = [text for text in (element_text(item) for item in items) if text]
+        if texts:
+            lists.append({"type": "list", "item_count": len(items), "items": texts})
+    return lists
+
+
+def parse_tables(soup):
+    """Tabelas do Workflow como listas de dicts"""
+    tables = []
+    for table in soup.select(WORKFLOW_TABLE_SELECTOR):
+        rows = table.find_all("tr")
+        if not rows:
+            continue
+
+        header_cells = rows[0].find_all("th")
+        headers = [element_text(cell) for cell in header_cells]
+
+        body_rows = rows[1:] if headers else rows
+        cell_rows = [[element_text(cell) for cell in row.find_all("td")] for row in body_rows]
+
+        table_data = rows_to_workflow_table(headers, cell_rows)
+        if table_data:
+            tables.append(finalize_workflow_table(table_data))
+    return tables
+
+
+def parse_forms(soup):
+    """Formulários e seus campos"""
+    forms = []
+    for form in soup.select("form"):
+        inputs = form.select("input, select, textarea")
+        fields = [
+            {
+                "type": _field_type(inp),
+                "name": inp.get("name"),
+                "id": inp.get("id"),
+                "value": _field_value(inp),
+                "placeholder": inp.get("placeholder"),
+            }
+            for inp in inputs
+        ]
+        if fields:
+            forms.append({"type": "form", "input_count": len(inputs), "fields": fields})
+    return forms
+
+
+def parse_panels(soup):
+    """Painéis/divs com conteúdo estruturado"""
+    panels = []
+    for selector in PANEL_SELECTORS:
+        for panel in soup.select(selector):
+            panel_text = element_text(panel)
+            if panel_text and len(panel_text) > 10:
+                panels.append({"type": "panel", "selector": selector, "content": panel_text})
+    return panels
+
+
+def parse_workflow_html(html):
+    """
+    Executa as seis passagens de extração do Workflow sobre o page_source,
+    sem nenhum round trip ao navegador. Retorna as mesmas chaves de
+    conteúdo do workflow_data da extração via Selenium.
+    """
+    soup = make_soup(html)
+
+    return {
+        "cards": parse_cards(soup),
+        "lists": parse_lists(soup),
+        "tables": parse_tables(soup),
+        "forms": parse_forms(soup),
+        "panels": parse_panels(soup),
+        "raw_text": element_text(soup.body or soup),
+    }
+
+
+# Rótulos de links de próxima página (comparados em minúsculas, sem espaços)
+NEXT_PAGE_LABELS = {
+    "próxima", "proxima", "próximo", "proximo", "próx", "prox",
+    "seguinte", "avançar", "avancar", "next", ">", ">>", "»", "›",
+}
+
+_ONCLICK_LOCATION = re.compile(r"""(?:document|window)\.location(?:\.href)?\s*=\s*['"]([^'"]+)['"]""")
+
+
+def parse_table_rows(soup, table_selector="table"):
+    """Tabelas como listas de listas (mesma semântica da extração em lote), já normalizadas"""
+    data = []
+    for table in soup.select(table_selector):
+        table_data = []
+        for row in table.find_all("tr"):
+            cells = row.find_all("td") or row.find_all("th")
+            if cells:
+                table_data.append([element_text(cell) for cell in cells])
+        if table_data:
+            data.append(normalize_table_data(table_data))
+    return data
+
+
+def page_title(soup):
+    """Título do documento"""
+    return soup.title.get_text(strip=True) if soup.title else ""
+
+
+def element_target_url(element, base_url):
+    """URL de navegação de um link/imagem: href real ou document.location do onclick"""
+    href = (element.get("href") or "").strip()
+    if href and href != "#" and not href.lower().startswith("javascript:"):
+        return urljoin(base_url, href)
+
+    for node in [element, *element.parents]:
+        onclick = node.get("onclick") if hasattr(node, "get") else None
+        if onclick:
+            match = _ONCLICK_LOCATION.search(onclick)
+            if match:
+                return urljoin(base_url, match.group(1))
+        if node.name in ("a", "td", "body"):
+            break
+    for child in element.find_all(onclick=True):
+        match = _ONCLICK_LOCATION.search(child["onclick"])
+        if match:
+            return urljoin(base_url, match.group(1))
+    return None
+
+
+def find_navigation_url(soup, base_url, selectors):
+    """Primeira URL navegável entre os elementos que casam com os seletores (CSS)"""
+    for selector in selectors:
+        for element in soup.select(selector):
+            url = element_target_url(element, base_url)
+            if url:
+                return url
+    return None
+
+
+def frame_url(soup, base_url, frame_name):
+    """URL do <frame>/<iframe> com o nome informado"""
+    frame = soup.find(["frame", "iframe"], attrs={"name": frame_name})
+    if frame and frame.get("src"):
+        return urljoin(base_url, frame["src"])
+    return None
+
+
+def is_login_page(url, html):
+    """Indica se a resposta é a tela de login/validação (sessão inválida)"""
+    if "validacao" in url:
+        return True
+    return make_soup(html).select_one("input[type='password']") is not None
+
+
+def find_next_page_url(soup, base_url):
+    """URL da próxima página de uma listagem paginada, ou None"""
+    link = soup.find(["a", "link"], rel="next")
+    if link:
+        url = element_target_url(link, base_url)
+        if url:
+            return url
+
+    for element in soup.find_all(["a", "img", "input"]):
+        label = (
+            element.get_text(strip=True)
+            or element.get("title", "")
+            or element.get("alt", "")
+            or element.get("value", "")
+        )
+        if label.strip().lower() in NEXT_PAGE_LABELS:
+            url = element_target_url(element, base_url)
+            if url:
+                return url
+    return None
+
+
+def pick_data_table(tables):
+    """Tabela principal de uma página: a com mais linhas (empate: mais colunas)"""
+    if not tables:
+        return None
+    return max(tables, key=lambda t: (len(t), max((len(r) for r in t), default=0)))
+
+
+def iter_data_rows(pages, stats=None):
+    """
+    Recebe, página a página, a lista de tabelas (listas de listas) e gera as
+    linhas da tabela principal. Cabeçalhos repetidos nas páginas seguintes são
+    descartados e a iteração para quando uma página se repete.
+    """
+    seen_pages = set()
+    header = None
+    page_count = 0
+
+    for tables in pages:
+        table = pick_data_table(tables)
+        if not table:
+            break
+
+        digest = hashlib.sha1(json.dumps(table, ensure_ascii=False).encode("utf-8")).hexdigest()
+        if digest in seen_pages:
+            logger.info("Página repetida detectada, fim da paginação")
+            break
+        seen_pages.add(digest)
+        page_count += 1
+        if stats is not None:
+            stats["pages"] = page_count
+
+        rows = iter(table)
+        if header is None:
+            header = table[0]
+        elif table[0] == header:
+            next(rows)
+
+        for row in rows:
+            yield row
+
+
+# Colunas da tabela do Painel (na ordem em que aparecem)
+PAINEL_HEADERS = [
+    "Matricula", "Nome", "Ficha", "Prioridade", "FollowUp", "Setor",
+    "Status", "Usuario", "Macro", "Ocorrencia", "Motivo", "SubMotivo",
+    "Inicio", "TempoResolucao", "PrazoSetor", "Conclusao",
+]
+# Colunas que identificam um registro do Painel entre execuções
+PAINEL_KEY_COLUMNS = ("Ficha", "Matricula")
+# Valores de Matricula que marcam linhas de filtro ("TODOS") e cabeçalhos repetidos
+_PAINEL_SKIP_VALUES = {"TODOS", "MATRICULA"}
+
+
+def painel_record(row):
+    """
+    Converte uma linha da tabela do Painel em dict com PAINEL_HEADERS.
+    Retorna None para linhas de filtro, cabeçalhos e linhas curtas demais.
+    """
+    # Dados reais têm ~16 colunas; linhas de filtro têm formato diferente
+    if len(row) < 10:
+        return None
+    row = list(row) + [""] * (len(PAINEL_HEADERS) - len(row))
+    record = {header: str(row[i]).strip() for i, header in enumerate(PAINEL_HEADERS)}
+    if record["Matricula"].upper() in _PAINEL_SKIP_VALUES:
+        return None
+    return record
+
+
+def painel_key(record):
+    """Chave estável do registro (Ficha/Matricula)"""
+    return "|".join(record[column] for column in PAINEL_KEY_COLUMNS)
+
+
+_BR_DATETIME = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})(?:\s+(\d{1,2}):(\d{2}))?")
+
+
+def painel_datetime(value):
+    """Converte 'DD/MM/AAAA [HH:MM]' em 'AAAA-MM-DD[ HH:MM]' (ordenável); None se inválido"""
+    match = _BR_DATETIME.search(value or "")
+    if not match:
+        return None
+    day, month, year, hour, minute = match.groups()
+    iso = f"{year}-{int(month):02d}-{int(day):02d}"
+    if hour is not None:
+        iso += f" {int(hour):02d}:{minute}"
+    return iso
+
+
+def painel_is_late(record):
+    """Registro fora do prazo (mesma regra do KPI do dashboard)"""
+    return "FORA DE" in record["TempoResolucao"].upper() or "FORA DE" in record["PrazoSetor"].upper()
+
+
+def painel_is_pending(record):
+    """Registro pendente (mesma regra do KPI do dashboard)"""
+    return "PENDENTE" in record["Status"].upper()
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+# Cada coluna vira [tipo, ...]:
+#   ["s", valores]               texto sem repetição suficiente (um valor por linha)
+#   ["n", números]               inteiros sem zeros à esquerda (ex.: Matrícula), sem aspas
+#   ["d", valores, códigos]      dicionário: valores distintos + índice por linha
+#   ["t", dia_base, minutos, extras]
+#                                data: minutos desde 00:00 de dia_base (AAAA-MM-DD);
+#                                linhas fora do formato DD/MM/AAAA HH:MM ficam em
+#                                extras {linha: [texto, AAAA-MM-DD[ HH:MM]]} com minutos null
+DATE_COLUMN = "Inicio"
+
+
+def _canonical_int(value):
+    return value.isdigit() and (value == "0" or not value.startswith("0")) and len(value) < 16
+
+
+def _encode_text(values):
+    index = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    if len(index) * 2 > len(values):
+        if values and all(_canonical_int(value) for value in values):
+            return ["n", [int(value) for value in values]]
+        return ["s", list(values)]
+    return ["d", list(index), codes]
+
+
+def _encode_categorical(table, name, start, stop):
+    codes = table.codes[name][start:stop]
+    codes = codes.tolist() if hasattr(codes, "tolist") else list(codes)
+    return ["d", table.categories[name], codes]
+
+
+def _moment(iso):
+    """datetime de 'AAAA-MM-DD HH:MM'; None se sem hora ou inválido (ex.: 31/02)"""
+    if len(iso) != 16:
+        return None
+    try:
+        return datetime.fromisoformat(iso)
+    except ValueError:
+        return None
+
+
+def _encode_dates(table, name, start, stop):
+    # Um cálculo por valor distinto (códigos do PainelTable), não por linha
+    codes, iso_values = table.inicio_codes()
+    raw_values = table.column(name)
+    codes = codes[start:stop]
+    codes = codes.tolist() if hasattr(codes, "tolist") else list(codes)
+    moments = [moment for moment in map(_moment, iso_values) if moment is not None]
+    base = min(moments).replace(hour=0, minute=0) if moments else None
+
+    offsets = {}
+    minutes = []
+    extras = {}
+    for row, code in enumerate(codes, start):
+        if code not in offsets:
+            moment = _moment(iso_values[code])
+            offset = None
+            if moment is not None and raw_values[row] == moment.strftime("%d/%m/%Y %H:%M"):
+                offset = int((moment - base).total_seconds() // 60)
+            offsets[code] = offset
+        offset = offsets[code]
+        minutes.append(offset)
+        if offset is None and (raw_values[row] or iso_values[code]):
+            extras[str(row - start)] = [raw_values[row], iso_values[code]]
+    return ["t", base.strftime("%Y-%m-%d") if base else None, minutes, extras]
+
+
+def encode_rows(table, columns, start=0, stop=None):
+    """
+    Linhas [start:stop) da tabela em formato colunar compacto (ver tipos
+    acima). Colunas categóricas reaproveitam os códigos do PainelTable;
+    a coluna DATE_COLUMN também fornece a chave de ordenação (AAAA-MM-DD
+    HH:MM) que o decodificador do dashboard põe no fim de cada linha.
+    """
+    stop = len(table) if stop is None else min(stop, len(table))
+    start = min(start, stop)
+    data = {}
+    for name in columns:
+        if name == DATE_COLUMN:
+            data[name] = _encode_dates(table, name, start, stop)
+        elif name in table.codes:
+            data[name] = _encode_categorical(table, name, start, stop)
+        else:
+            data[name] = _encode_text(table.column(name)[start:stop])
+    return {"columns": list(columns), "count": stop - start, "key": DATE_COLUMN, "data": data}
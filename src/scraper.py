@@ -3,20 +3,158 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
+from pathlib import Path
+from urllib.parse import urljoin
 import config.settings as settings
 from src.browser import BrowserManager
+from src.selector_cache import SelectorCache
+from src.http_client import SiriusHttpClient
+from src.session_store import SessionStore
+from src.cdc import ChangeCapture
+from src.columnar import PainelTable
+from src.history_store import HistoryStore
+from src.waits import (
+    document_ready,
+    dom_quiet,
+    element_present,
+    element_stale,
+    frame_loaded,
+    url_changed,
+)
 from src.utils import setup_logging, save_data
+from src.sinks import OutputWriter, stream_rows
+from src.manifest import build_manifest, write_manifest
+from src.page_parser import (
+    CARD_SELECTORS,
+    NEXT_PAGE_LABELS,
+    PANEL_SELECTORS,
+    WORKFLOW_TABLE_SELECTOR,
+    finalize_workflow_table,
+    normalize_table_data,
+    parse_workflow_html,
+    painel_record,
+    is_login_page,
+    iter_data_rows,
+    parse_table_rows,
+    rows_to_workflow_table,
+)
 
 logger = setup_logging()
 
+# Extrai todas as tabelas, linhas e células em um único execute_script.
+# Mantém a semântica da extração célula a célula: todas as <tr> descendentes,
+# <td> da linha ou, na falta delas, <th>. Usa textContent com espaços
+# colapsados; células com <br>/blocos usam innerText para preservar as
+# quebras de linha que _normalize_table_data usa para detectar tabelas
+# verticais.
+BULK_TABLE_JS = """
+const multiline = 'br, div, p, li';
+const cellText = (cell) => {
+    if (cell.querySelector(multiline)) {
+        return (cell.innerText || '').split('\\n')
+            .map(v => v.replace(/\\s+/g, ' ').trim()).join('\\n').trim();
+    }
+    return (cell.textContent || '').replace(/\\s+/g, ' ').trim();
+};
+return Array.from(document.querySelectorAll(arguments[0])).map(table =>
+    Array.from(table.querySelectorAll('tr')).map(row => {
+        let cells = row.querySelectorAll('td');
+        if (!cells.length) cells = row.querySelectorAll('th');
+        return Array.from(cells).map(cellText);
+    }).filter(row => row.length)
+);
+"""
+
+# Localiza o controle de próxima página (rel=next ou rótulo conhecido)
+NEXT_PAGE_JS = """
+const labels = arguments[0];
+const norm = (s) => (s || '').trim().toLowerCase();
+const candidates = document.querySelectorAll(
+    'a, button, img, input[type=button], input[type=submit], input[type=image], [rel=next]'
+);
+for (const el of candidates) {
+    if (el.disabled || el.classList.contains('disabled')) continue;
+    if (el.getAttribute('rel') === 'next') return el;
+    const label = norm(el.textContent) || norm(el.title) || norm(el.alt) || norm(el.value);
+    if (labels.includes(label)) return el;
+}
+return null;
+"""
+
+# Seleciona a maior opção do controle de itens por página (select só com
+# números e/ou "Todos"); retorna true se o valor mudou
+PAGE_SIZE_JS = """
+const everything = ['todos', 'todas', 'tudo', 'all'];
+for (const select of document.querySelectorAll('select')) {
+    const options = Array.from(select.options);
+    if (options.length < 2) continue;
+    const sizes = options.map(o => {
+        const text = o.text.trim().toLowerCase();
+        if (everything.includes(text)) return Infinity;
+        return /^\\d+$/.test(text) ? parseInt(text, 10) : NaN;
+    });
+    if (sizes.some(isNaN) || sizes.every(size => size === Infinity)) continue;
+    const index = sizes.indexOf(Math.max(...sizes));
+    if (select.selectedIndex === index) return false;
+    select.selectedIndex = index;
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+    return true;
+}
+return false;
+"""
+
+
+def _keep_rows(rows, kept):
+    """Repassa as linhas do gerador guardando cada uma em `kept`"""
+    for row in rows:
+        kept.append(row)
+        yield row
+
+
+def _count_records(rows, counter):
+    """
+    Repassa as linhas do gerador contando em counter["rows"] só os registros
+    do Painel (os que painel_record aceita): cabeçalho e linha de filtro
+    (TODOS) são gravados no CSV, mas não contam, como no modo incremental.
+    """
+    for row in rows:
+        if painel_record(row) is not None:
+            counter["rows"] += 1
+        yield row
+
+
+class ExtractionResult:
+    """
+    Resultado de run_full_extraction: páginas extraídas, arquivos gravados
+    e, com keep_painel, o Painel principal já em colunas (PainelTable),
+    para o dashboard ser gerado sem reler e reinterpretar o CSV.
+    """
+
+    def __init__(self, extracted_data=None, paths=None, painel=None, painel_csv=None):
+        self.extracted_data = extracted_data or []
+        self.paths = paths or {}
+        self.painel = painel
+        self.painel_csv = Path(painel_csv) if painel_csv else None
+
+    def __bool__(self):
+        return bool(self.extracted_data)
+
 
 class SiriusScraper:
     """Scraper para o sistema Sirius"""
 
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, incremental=None, keep_painel=False):
         self.browser = BrowserManager(headless=headless)
         self.driver = None
         self.extracted_data = []
+        # Gravação em andamento (run_cycle): páginas vão para disco ao serem extraídas
+        self.output = None
+        self.incremental = incremental if incremental is not None else settings.INCREMENTAL
+        # Mantém as linhas do Painel em memória para o dashboard (ExtractionResult.painel)
+        self.keep_painel = keep_painel
+        self.painel_tables = {}
+        self.selector_cache = SelectorCache()
+        self.session_store = SessionStore()
 
     def start(self):
         """Inicializa o scraper"""
@@ -27,14 +165,134 @@ class SiriusScraper:
         """Encerra o scraper"""
         self.browser.quit()
 
+    def _find_cached(self, target, candidates, frames=(None,)):
+        """
+        Localiza o elemento de um alvo lógico tentando primeiro o frame/seletor
+        que funcionou na última execução; a varredura completa só roda em caso
+        de miss e atualiza o cache. Candidatos são CSS, XPath (iniciando com
+        '//') ou tuplas (By, valor).
+        Retorna o elemento (deixando o driver no frame onde foi encontrado) ou None.
+        """
+        started = time.perf_counter()
+        attempts = 0
+
+        def locate(frame, by, selector):
+            # Frame inexistente (NoSuchFrameException) conta como miss, igual a seletor não encontrado
+            try:
+                if frame:
+                    self.driver.switch_to.frame(frame)
+                return self.driver.find_element(by, selector)
+            except Exception:
+                if frame:
+                    self.driver.switch_to.default_content()
+                return None
+
+        cached = self.selector_cache.get(target)
+        if cached:
+            attempts += 1
+            element = locate(*cached)
+            if element is not None:
+                self.selector_cache.hits += 1
+                logger.info(
+                    f"Seletor em cache para '{target}': hit "
+                    f"({(time.perf_counter() - started) * 1000:.0f} ms, frame {cached[0]}, {cached[2]})"
+                )
+                return element
+            # Entrada obsoleta (frame ou seletor sumiu): descarta e segue para a varredura
+            self.selector_cache.invalidate(target)
+
+        self.selector_cache.misses += 1
+        for frame in frames:
+            for candidate in candidates:
+                if isinstance(candidate, tuple):
+                    by, selector = candidate
+                elif candidate.startswith("//"):
+                    by, selector = By.XPATH, candidate
+                else:
+                    by, selector = By.CSS_SELECTOR, candidate
+
+                if cached and (frame, by, selector) == tuple(cached):
+                    continue
+
+                attempts += 1
+                element = locate(frame, by, selector)
+                if element is not None:
+                    self.selector_cache.record(target, frame, by, selector)
+                    logger.info(
+                        f"Seletor em cache para '{target}': miss, varredura encontrou "
+                        f"{selector} (frame {frame}) em {attempts} tentativas, "
+                        f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                    )
+                    return element
+
+        logger.info(
+            f"Seletor em cache para '{target}': miss, nenhum candidato encontrado "
+            f"({attempts} tentativas, {(time.perf_counter() - started) * 1000:.0f} ms)"
+        )
+        return None
+
+    def is_session_valid(self, cookies):
+        """Verifica com uma única requisição HTTP se os cookies ainda estão autenticados"""
+        client = SiriusHttpClient()
+        try:
+            client.load_cookies(cookies)
+            url, html = client.fetch(settings.SIRIUS_WORKFLOW_URL, allow_login=True)
+            return not is_login_page(url, html)
+        except Exception as e:
+            logger.warning(f"Não foi possível validar a sessão: {e}")
+            return False
+        finally:
+            client.close()
+
+    def restore_session(self, cookies):
+        """Aplica cookies de uma sessão já autenticada e abre a página inicial"""
+        self.browser.add_cookies(cookies, urljoin(settings.SIRIUS_URL, "/favicon.ico"))
+        self.driver.get(settings.SIRIUS_URL)
+        self.browser.wait_for(document_ready(), timeout=10, label="página inicial")
+
+    def ensure_session(self):
+        """
+        Reaproveita a sessão salva (cookies em data/ ou perfil persistente do
+        Chrome) e só executa login + 2FA quando ela não é mais aceita.
+        """
+        if settings.SESSION_REUSE:
+            # Página leve no domínio do Sirius, necessária para ler/gravar cookies
+            cookie_url = urljoin(settings.SIRIUS_URL, "/favicon.ico")
+            cookies = self.session_store.load()
+
+            if cookies is None and self.browser.user_data_dir:
+                self.driver.get(cookie_url)
+                cookies = self.driver.get_cookies() or None
+
+            if cookies is not None:
+                if self.is_session_valid(cookies):
+                    logger.info("Sessão reaproveitada: login e 2FA ignorados")
+                    self.restore_session(cookies)
+                    self.session_store.save(self.driver.get_cookies())
+                    return True
+
+                logger.info("Sessão salva não é mais aceita, fazendo login completo")
+                self.session_store.clear()
+
+        if not self.login():
+            return False
+
+        if settings.SESSION_REUSE:
+            self.session_store.save(self.driver.get_cookies())
+        return True
+
     def login(self):
         """Realiza login no sistema com suporte a 2FA"""
         try:
             logger.info("Acessando página de login...")
             self.driver.get(settings.SIRIUS_URL)
 
-            # Aguarda página carregar
-            time.sleep(2)
+            # Aguarda página carregar (formulário com campo de senha)
+            self.browser.wait_for(
+                document_ready() & element_present((By.CSS_SELECTOR, "input[type='password']")),
+                timeout=10,
+                label="página de login",
+            )
 
             # Tenta localizar campos de login (ajustar seletores conforme necessário)
             logger.info("Procurando campos de login...")
@@ -42,23 +300,31 @@ class SiriusScraper:
             # Exemplo de seletores comuns - AJUSTAR CONFORME A PÁGINA REAL
             try:
                 # Tenta encontrar campo de usuário por diferentes métodos
-                username_field = (
-                    self.driver.find_element(By.NAME, "usuario")
-                    or self.driver.find_element(By.NAME, "user")
-                    or self.driver.find_element(By.NAME, "login")
-                    or self.driver.find_element(By.ID, "usuario")
-                    or self.driver.find_element(By.CSS_SELECTOR, "input[type='text']")
+                username_field = self._find_cached(
+                    "login.username",
+                    [
+                        (By.NAME, "usuario"),
+                        (By.NAME, "user"),
+                        (By.NAME, "login"),
+                        (By.ID, "usuario"),
+                        (By.CSS_SELECTOR, "input[type='text']"),
+                    ],
                 )
-
-                password_field = (
-                    self.driver.find_element(By.NAME, "senha")
-                    or self.driver.find_element(By.NAME, "password")
-                    or self.driver.find_element(By.NAME, "pass")
-                    or self.driver.find_element(By.ID, "senha")
-                    or self.driver.find_element(
-                        By.CSS_SELECTOR, "input[type='password']"
-                    )
+                if username_field is None:
+                    raise NoSuchElementException("Campo de usuário não encontrado")
+
+                password_field = self._find_cached(
+                    "login.password",
+                    [
+                        (By.NAME, "senha"),
+                        (By.NAME, "password"),
+                        (By.NAME, "pass"),
+                        (By.ID, "senha"),
+                        (By.CSS_SELECTOR, "input[type='password']"),
+                    ],
                 )
+                if password_field is None:
+                    raise NoSuchElementException("Campo de senha não encontrado")
 
                 # Preenche credenciais
                 username_field.clear()
@@ -70,20 +336,30 @@ class SiriusScraper:
                 logger.info("Senha preenchida")
 
                 # Clica no botão de login
-                login_button = (
-                    self.driver.find_element(By.CSS_SELECTOR, "input[type='submit']")
-                    or self.driver.find_element(By.TAG_NAME, "button")
-                    or self.driver.find_element(By.CSS_SELECTOR, ".btn-login")
+                login_button = self._find_cached(
+                    "login.submit",
+                    [
+                        (By.CSS_SELECTOR, "input[type='submit']"),
+                        (By.TAG_NAME, "button"),
+                        (By.CSS_SELECTOR, ".btn-login"),
+                    ],
                 )
+                if login_button is None:
+                    raise NoSuchElementException("Botão de login não encontrado")
+                login_url = self.driver.current_url
                 login_button.click()
 
                 logger.info("Login enviado, aguardando...")
-                time.sleep(2)
+                self.browser.wait_for(
+                    (url_changed(login_url) | element_stale(login_button)) & document_ready(),
+                    timeout=10,
+                    label="resposta do login",
+                )
 
                 # Verifica se há tela de código 2FA
                 if self.handle_2fa():
                     logger.info("Autenticação completa!")
-                    time.sleep(2)
+                    self.browser.wait_for(document_ready(), timeout=10, label="página inicial")
                     return True
                 else:
                     return False
@@ -101,8 +377,10 @@ class SiriusScraper:
     def handle_2fa(self):
         """Lida com verificação de duas etapas (código)"""
         try:
-            # Aguarda um pouco para ver se aparece tela de código ou redirecionamento
-            time.sleep(2)
+            # Aguarda a página estabilizar para ver se aparece tela de código ou redirecionamento
+            self.browser.wait_for(
+                document_ready() & dom_quiet(300), timeout=5, label="pós-login estável"
+            )
 
             # Verifica se foi redirecionado para página de validação SMS
             current_url = self.driver.current_url
@@ -111,7 +389,6 @@ class SiriusScraper:
                 return self._handle_sms_validation()
 
             # Verifica se há campo de código na página atual
-            code_field = None
             possible_selectors = [
                 "input[name='codigo']",
                 "input[name='code']",
@@ -125,13 +402,9 @@ class SiriusScraper:
                 "input[placeholder*='SMS']",
             ]
 
-            for selector in possible_selectors:
-                try:
-                    code_field = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    logger.info(f"Campo de código 2FA encontrado: {selector}")
-                    break
-                except:
-                    continue
+            code_field = self._find_cached("2fa.code_field", possible_selectors)
+            if code_field:
+                logger.info("Campo de código 2FA encontrado")
 
             if code_field:
                 # Verifica se tem código configurado
@@ -142,24 +415,27 @@ class SiriusScraper:
 
                     # Tenta clicar no botão de confirmar
                     try:
-                        submit_button = (
-                            self.driver.find_element(
-                                By.CSS_SELECTOR, "input[type='submit']"
-                            )
-                            or self.driver.find_element(By.TAG_NAME, "button")
-                            or self.driver.find_element(
-                                By.CSS_SELECTOR, ".btn-confirmar"
-                            )
-                            or self.driver.find_element(
-                                By.CSS_SELECTOR, "input[value*='Confirmar']"
-                            )
-                            or self.driver.find_element(
-                                By.CSS_SELECTOR, "input[value*='Enviar']"
-                            )
+                        submit_button = self._find_cached(
+                            "2fa.submit",
+                            [
+                                "input[type='submit']",
+                                (By.TAG_NAME, "button"),
+                                ".btn-confirmar",
+                                "input[value*='Confirmar']",
+                                "input[value*='Enviar']",
+                            ],
                         )
+                        if submit_button is None:
+                            raise NoSuchElementException("Botão de confirmar não encontrado")
+                        url_before = self.driver.current_url
                         submit_button.click()
                         logger.info("Código enviado!")
-                        time.sleep(3)
+                        self.browser.wait_for(
+                            (url_changed(url_before) | element_stale(submit_button))
+                            & document_ready(),
+                            timeout=10,
+                            label="confirmação do código 2FA",
+                        )
                     except Exception as btn_error:
                         logger.warning(
                             f"Não foi possível clicar no botão de confirmar: {btn_error}"
@@ -170,17 +446,21 @@ class SiriusScraper:
                     logger.info("CÓDIGO DE VERIFICAÇÃO NECESSÁRIO")
                     logger.info("=" * 50)
                     logger.info("Por favor, insira o código no navegador")
-                    logger.info("O sistema aguardará 30 segundos...")
+                    logger.info("O sistema aguardará até 30 segundos...")
                     logger.info("=" * 50)
 
-                    # Aguarda usuário inserir código manualmente
-                    time.sleep(30)
+                    # Aguarda usuário inserir código manualmente (segue assim que a página mudar)
+                    self.browser.wait_for(
+                        element_stale(code_field), timeout=30, label="código 2FA manual"
+                    )
 
                 return True
             else:
                 # Não há tela de código, login direto
                 logger.info("Login direto (sem 2FA)")
-                time.sleep(3)
+                self.browser.wait_for(
+                    document_ready() & dom_quiet(300), timeout=5, label="login direto"
+                )
                 return True
 
         except Exception as e:
@@ -194,7 +474,11 @@ class SiriusScraper:
             logger.info("Processando validação SMS...")
 
             # Aguarda página carregar completamente
-            time.sleep(2)
+            self.browser.wait_for(
+                document_ready() & element_present((By.CSS_SELECTOR, "input")),
+                timeout=5,
+                label="página de validação SMS",
+            )
 
             # Procura campo de código na página de validação SMS
             code_selectors = [
@@ -207,14 +491,7 @@ class SiriusScraper:
                 "input[type='number']",
             ]
 
-            code_field = None
-            for selector in code_selectors:
-                try:
-                    code_field = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    logger.info(f"Campo de código encontrado: {selector}")
-                    break
-                except:
-                    continue
+            code_field = self._find_cached("sms.code_field", code_selectors)
 
             if code_field and settings.SIRIUS_2FA_CODE:
                 logger.info(f"Inserindo código: {settings.SIRIUS_2FA_CODE}")
@@ -233,24 +510,34 @@ class SiriusScraper:
                     "#btn-confirmar",
                 ]
 
-                for btn_selector in btn_selectors:
+                submit_btn = self._find_cached("sms.submit", btn_selectors)
+                if submit_btn is not None:
                     try:
-                        submit_btn = self.driver.find_element(
-                            By.CSS_SELECTOR, btn_selector
-                        )
+                        url_before = self.driver.current_url
                         submit_btn.click()
                         logger.info("Código confirmado na página de validação SMS!")
-                        time.sleep(3)
+                        self.browser.wait_for(
+                            (url_changed(url_before) | element_stale(submit_btn))
+                            & document_ready(),
+                            timeout=10,
+                            label="confirmação SMS",
+                        )
                         return True
-                    except:
-                        continue
+                    except Exception as click_error:
+                        logger.warning(f"Falha ao clicar no botão de confirmar: {click_error}")
+                        self.selector_cache.invalidate("sms.submit")
 
                 logger.warning("Botão de confirmar não encontrado automaticamente")
-                time.sleep(5)  # Aguarda usuário clicar manualmente
+                # Aguarda usuário clicar manualmente
+                self.browser.wait_for(
+                    url_changed(self.driver.current_url), timeout=5, label="confirmação manual SMS"
+                )
                 return True
             else:
                 logger.info("Aguardando inserção manual do código...")
-                time.sleep(30)
+                self.browser.wait_for(
+                    url_changed(self.driver.current_url), timeout=30, label="código SMS manual"
+                )
                 return True
 
         except Exception as e:
@@ -278,8 +565,6 @@ class SiriusScraper:
 
             # O botão Workflow está no frame 'baixo' e é uma imagem
             try:
-                self.switch_to_frame("baixo")
-                
                 # Seletores baseados no dump HTML (imagem com onclick)
                 workflow_selectors = [
                     "img[src*='workflow.png']",
@@ -288,21 +573,30 @@ class SiriusScraper:
                     "a[href*='workflow']", # Mantendo backup
                 ]
 
-                for selector in workflow_selectors:
+                element = self._find_cached(
+                    "workflow.button", workflow_selectors, frames=["baixo"]
+                )
+                if element is not None:
                     try:
-                        element = self.driver.find_element(By.CSS_SELECTOR, selector)
                         # O elemento é uma imagem com onclick, então clicamos nela
                         element.click()
-                        logger.info(f"Workflow clicado via seletor: {selector}")
+                        logger.info("Workflow clicado")
                         
-                        # Aguarda navegação
-                        time.sleep(5)
+                        # Aguarda navegação: o onclick troca o documento do frame
+                        self.browser.wait_for(
+                            element_stale(element), timeout=10, label="navegação Workflow"
+                        )
+                        self.browser.wait_for(
+                            document_ready() & dom_quiet(300), timeout=10, label="Workflow carregado"
+                        )
                         
                         # Volta ao contexto principal para lidar com a nova página
                         self.switch_to_frame(None)
                         return True
-                    except:
-                        continue
+                    except Exception as click_error:
+                        logger.warning(f"Falha ao clicar no Workflow: {click_error}")
+                        self.selector_cache.invalidate("workflow.button")
+                        self.switch_to_frame(None)
                 
                 logger.warning("Seletores de imagem falharam, tentando acesso direto URL...")
 
@@ -313,10 +607,12 @@ class SiriusScraper:
             # Fallback: Tenta acesso direto via URL construída
             # Nota: O URL pode depender da sessão, mas o dump mostrou 'usuario=VIGNOLI'
             try:
-                workflow_url = "https://sirius.assim.com.br/assimcsp/wflow/workflow.csp?usuario=VIGNOLI"
+                workflow_url = settings.SIRIUS_WORKFLOW_URL
                 self.driver.get(workflow_url)
                 logger.info(f"Tentativa de acesso direto: {workflow_url}")
-                time.sleep(3)
+                self.browser.wait_for(
+                    document_ready() & dom_quiet(300), timeout=10, label="Workflow (URL direta)"
+                )
                 return True
             except Exception as e:
                 logger.error(f"Falha no acesso direto: {e}")
@@ -338,42 +634,37 @@ class SiriusScraper:
             # Como não sabemos a estrutura da pág Workflow ainda, tentamos genericamente
             
             frames_to_try = [None, "cima", "baixo", "topo"]
-            
-            for frame in frames_to_try:
+
+            # Seletores para Painel
+            painel_selectors = [
+                "a[href*='painel']",
+                "a[href*='Painel']",
+                "//a[contains(text(), 'Painel')]",
+                "//span[contains(text(), 'Painel')]",
+                "img[src*='painel']",
+                "img[title*='Painel']"
+            ]
+
+            element = self._find_cached("painel.link", painel_selectors, frames=frames_to_try)
+            if element is not None:
                 try:
-                    if frame:
-                        self.switch_to_frame(frame)
-                    
-                    # Seletores para Painel
-                    painel_selectors = [
-                        "a[href*='painel']",
-                        "a[href*='Painel']",
-                        "//a[contains(text(), 'Painel')]",
-                        "//span[contains(text(), 'Painel')]",
-                        "img[src*='painel']",
-                        "img[title*='Painel']"
-                    ]
-                    
-                    for selector in painel_selectors:
-                        try:
-                            if selector.startswith("//"):
-                                element = self.driver.find_element(By.XPATH, selector)
-                            else:
-                                element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                                
-                            element.click()
-                            logger.info(f"Painel clicado (Frame: {frame}, Seletor: {selector})")
-                            time.sleep(3)
-                            self.switch_to_frame(None)
-                            return True
-                        except:
-                            continue
-                            
-                    if frame:
-                        self.switch_to_frame(None)
-                        
-                except Exception as frame_e:
-                    logger.warning(f"Erro ao buscar Painel no frame {frame}: {frame_e}")
+                    url_before = self.driver.current_url
+                    element.click()
+                    logger.info("Painel clicado")
+                    # O link pode abrir em outro frame; o limite mantém o tempo antigo
+                    self.browser.wait_for(
+                        element_stale(element) | url_changed(url_before),
+                        timeout=3,
+                        label="navegação Painel",
+                    )
+                    self.switch_to_frame(None)
+                    self.browser.wait_for(
+                        document_ready() & dom_quiet(300), timeout=10, label="Painel carregado"
+                    )
+                    return True
+                except Exception as click_error:
+                    logger.warning(f"Falha ao clicar no Painel: {click_error}")
+                    self.selector_cache.invalidate("painel.link")
                     self.switch_to_frame(None)
 
             # Se falhar, salva debug da página Workflow
@@ -394,46 +685,9 @@ class SiriusScraper:
         Normaliza dados de tabela, tratando casos de tabelas verticais 
         onde cada célula contém a coluna inteira separada por quebras de linha.
         """
-        if not table_data or len(table_data) > 3:  # Se tem muitas linhas, provavelmente já está ok
-            return table_data
-
-        # Verifica se a primeira linha tem células com muitas quebras de linha
-        first_row = table_data[0]
-        multiline_cells = sum(1 for cell in first_row if isinstance(cell, str) and '\n' in cell)
-        
-        # Se mais da metade das células tem quebras de linha, ou se tem poucas linhas mas conteúdo extenso
-        if multiline_cells > len(first_row) / 2 or (len(table_data) == 1 and multiline_cells > 0):
-            logger.info("Detectada tabela vertical/transposta. Normalizando...")
-            
-            # Divide cada célula em uma lista de valores
-            columns = []
-            max_rows = 0
-            
-            for cell in first_row:
-                if isinstance(cell, str):
-                    values = [v.strip() for v in cell.split('\n')]
-                    columns.append(values)
-                    max_rows = max(max_rows, len(values))
-                else:
-                    columns.append([str(cell)])
-                    
-            # Reconstrói a tabela transpondo as colunas para linhas
-            normalized_data = []
-            for i in range(max_rows):
-                new_row = []
-                for col in columns:
-                    if i < len(col):
-                        new_row.append(col[i])
-                    else:
-                        new_row.append("") # Preenchimento para colunas menores
-                normalized_data.append(new_row)
-                
-            logger.info(f"Tabela normalizada: {len(normalized_data)} linhas encontradas.")
-            return normalized_data
-            
-        return table_data
+        return normalize_table_data(table_data)
 
-    def extract_table_data(self, table_selector=None):
+    def extract_table_data(self, table_selector=None, bulk=True):
         """Extrai dados de tabelas"""
         try:
             logger.info("Extraindo dados de tabelas...")
@@ -442,38 +696,154 @@ class SiriusScraper:
             if not table_selector:
                 table_selector = "table"
 
-            tables = self.driver.find_elements(By.CSS_SELECTOR, table_selector)
-            data = []
-
-            for table in tables:
-                rows = table.find_elements(By.TAG_NAME, "tr")
-                table_data = []
+            round_trips_before = self.browser.round_trips
 
-                for row in rows:
-                    cells = row.find_elements(By.TAG_NAME, "td") or row.find_elements(
-                        By.TAG_NAME, "th"
-                    )
-                    row_data = [cell.text.strip() for cell in cells]
-                    if row_data:
-                        table_data.append(row_data)
+            if bulk:
+                raw_tables = self._extract_tables_bulk(table_selector)
+            else:
+                raw_tables = self._extract_tables_per_cell(table_selector)
 
+            data = []
+            for table_data in raw_tables:
                 if table_data:
                     # Aplica normalização
                     normalized = self._normalize_table_data(table_data)
                     data.append(normalized)
 
-            logger.info(f"Extraídas {len(data)} tabelas")
+            round_trips = self.browser.round_trips - round_trips_before
+            logger.info(
+                f"Extraídas {len(data)} tabelas "
+                f"({'bulk' if bulk else 'célula a célula'}, {round_trips} round trips WebDriver)"
+            )
             return data
 
         except Exception as e:
             logger.error(f"Erro ao extrair tabela: {e}")
             return []
 
+    def _extract_tables_bulk(self, table_selector):
+        """Lê todas as tabelas em um único round trip via execute_script"""
+        return self.driver.execute_script(BULK_TABLE_JS, table_selector) or []
+
+    def _extract_tables_per_cell(self, table_selector):
+        """Extração legada: um round trip por linha e por célula"""
+        tables = self.driver.find_elements(By.CSS_SELECTOR, table_selector)
+        raw_tables = []
+
+        for table in tables:
+            rows = table.find_elements(By.TAG_NAME, "tr")
+            table_data = []
+
+            for row in rows:
+                cells = row.find_elements(By.TAG_NAME, "td") or row.find_elements(
+                    By.TAG_NAME, "th"
+                )
+                row_data = [cell.text.strip() for cell in cells]
+                if row_data:
+                    table_data.append(row_data)
+
+            raw_tables.append(table_data)
+
+        return raw_tables
+
+    def _wait_page_change(self, reference, label):
+        """Aguarda a troca de página após um clique (documento novo ou DOM atualizado)"""
+        if not self.browser.wait_for(element_stale(reference), timeout=10, label=label):
+            # Paginação sem recarregar o documento: espera o DOM assentar
+            self.browser.wait_for(dom_quiet(500), timeout=10, label=f"{label} (DOM)")
+        self.browser.wait_for(document_ready() & dom_quiet(300), timeout=10, label=f"{label} carregada")
+
+    def _iter_painel_page_tables(self, table_selector="table"):
+        """Gera as tabelas de cada página do Painel, clicando em 'próxima' entre elas"""
+        for page in range(1, settings.PAINEL_MAX_PAGES + 1):
+            yield self.extract_table_data(table_selector)
+
+            next_button = self.driver.execute_script(NEXT_PAGE_JS, sorted(NEXT_PAGE_LABELS))
+            if next_button is None:
+                logger.info(f"Painel sem próxima página após a página {page}")
+                return
+
+            reference = self.driver.find_element(By.TAG_NAME, "body")
+            next_button.click()
+            self._wait_page_change(reference, f"página {page + 1} do Painel")
+
+    def iter_painel_rows(self, stats=None, table_selector="table"):
+        """
+        Gera as linhas normalizadas de todas as páginas do Painel (já aberto),
+        uma a uma. Usa o maior tamanho de página disponível, segue os links de
+        próxima página e para quando uma página se repete.
+        """
+        in_frame = self.switch_to_frame("baixo")
+        try:
+            reference = self.driver.find_element(By.TAG_NAME, "body")
+            if self.driver.execute_script(PAGE_SIZE_JS):
+                logger.info("Tamanho de página do Painel ampliado")
+                self._wait_page_change(reference, "Painel com página ampliada")
+
+            yield from iter_data_rows(self._iter_painel_page_tables(table_selector), stats)
+        finally:
+            if in_frame:
+                self.switch_to_frame(None)
+
+    def stream_painel(self, rows, stats, url, title, page_index=None):
+        """
+        Grava as linhas do Painel direto em CSV/JSONL conforme são geradas;
+        em extracted_data fica apenas o resumo (arquivos, linhas, páginas).
+        page_index (posição da página na extração) define o _pX_ do arquivo.
+        No modo incremental só as mudanças desde a execução anterior são
+        gravadas (data/cdc/pX/), junto com o estado atual materializado.
+        Nos dois modos painel["rows"] (log, manifesto, latest_run.json e
+        histórico) é a quantidade de registros: linhas aceitas por
+        painel_record, sem cabeçalho nem linha de filtro.
+        """
+        if page_index is None:
+            page_index = len(self.extracted_data)
+
+        kept = [] if self.keep_painel else None
+        if kept is not None:
+            rows = _keep_rows(rows, kept)
+
+        changes = None
+        if self.incremental:
+            capture = ChangeCapture(f"p{page_index}")
+            changes = capture.apply(rows)
+            count = changes["rows"]
+            paths = {"csv": capture.current_path, "changes": capture.changes_path}
+        else:
+            filename = f"tabela_{time.strftime('%Y-%m-%d_%H-%M-%S')}_p{page_index}_t0"
+            counter = {"rows": 0}
+            _, paths = stream_rows(_count_records(rows, counter), filename)
+            count = counter["rows"]
+        logger.info(f"Painel: {count} registros em {stats.get('pages', 0)} página(s) -> {paths['csv']}")
+        # Sem linhas o modo incremental mantém o estado anterior: o dashboard lê o arquivo
+        if kept:
+            self.painel_tables[page_index] = PainelTable.from_rows(kept)
+
+        summary = {
+            "url": url,
+            "title": title,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "tables": [],
+            "painel": {
+                "rows": count,
+                "pages": stats.get("pages", 0),
+                "files": {fmt: str(path) for fmt, path in paths.items()},
+            },
+        }
+        if changes is not None:
+            summary["painel"]["changes"] = changes
+        self.add_page(summary)
+        return summary
+
     def extract_workflow_data(self):
         """Extrai dados específicos do Workflow"""
         try:
             logger.info("Extraindo dados do Workflow...")
-            time.sleep(2)
+            self.browser.wait_for(
+                document_ready() & (frame_loaded("baixo") | dom_quiet(300)),
+                timeout=10,
+                label="conteúdo do Workflow",
+            )
 
             workflow_data = {
                 "url": self.driver.current_url,
@@ -494,222 +864,174 @@ class SiriusScraper:
             except:
                 logger.info("Sem frame 'baixo', continuando no conteúdo atual")
 
-            # 1. Extrair cards (cartões de workflow)
-            card_selectors = [
-                ".card",
-                ".workflow-card",
-                ".task-card",
-                ".process-card",
-                "[class*='card']",
-                "[class*='workflow']",
-                ".kanban-card",
-                ".task-item",
-                ".process-item",
-            ]
+            self.browser.wait_for(dom_quiet(300), timeout=5, label="DOM do Workflow estável")
 
-            for selector in card_selectors:
-                try:
-                    cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for card in cards:
-                        try:
-                            card_text = card.text.strip()
-                            if card_text and len(card_text) > 5:
-                                card_info = {
-                                    "type": "card",
-                                    "selector": selector,
-                                    "content": card_text,
-                                    "html": card.get_attribute("outerHTML")[:500],
-                                }
-                                workflow_data["cards"].append(card_info)
-                        except:
-                            pass
-                except:
-                    pass
+            round_trips_before = self.browser.round_trips
+            started = time.perf_counter()
+
+            if settings.PARSER_BACKEND == "html":
+                # Um único page_source; as seis passagens rodam em processo
+                workflow_data.update(parse_workflow_html(self.driver.page_source))
+            else:
+                self._extract_workflow_dom(workflow_data)
+
+            logger.info(
+                f"Extraídos do Workflow (backend {settings.PARSER_BACKEND}, "
+                f"{time.perf_counter() - started:.2f}s, "
+                f"{self.browser.round_trips - round_trips_before} round trips WebDriver):"
+            )
+            logger.info(f"  - {len(workflow_data['cards'])} cards")
+            logger.info(f"  - {len(workflow_data['lists'])} listas")
+            logger.info(f"  - {len(workflow_data['tables'])} tabelas")
+            logger.info(f"  - {len(workflow_data['forms'])} formulários")
+            logger.info(f"  - {len(workflow_data['panels'])} painéis")
 
-            # 2. Extrair listas (ul/ol)
+            # Volta ao frame principal
             try:
-                lists = self.driver.find_elements(By.CSS_SELECTOR, "ul, ol")
-                for lst in lists:
-                    try:
-                        items = lst.find_elements(By.TAG_NAME, "li")
-                        if items:
-                            list_data = {
-                                "type": "list",
-                                "item_count": len(items),
-                                "items": [
-                                    item.text.strip()
-                                    for item in items
-                                    if item.text.strip()
-                                ],
-                            }
-                            if list_data["items"]:
-                                workflow_data["lists"].append(list_data)
-                    except:
-                        pass
+                self.switch_to_frame(None)
             except:
                 pass
 
-            # 3. Extrair tabelas com estrutura específica de workflow
+            return workflow_data
+
+        except Exception as e:
+            logger.error(f"Erro ao extrair dados do Workflow: {e}")
+            # Tenta voltar ao frame principal em caso de erro
             try:
-                tables = self.driver.find_elements(
-                    By.CSS_SELECTOR, "table, .dataTable, .workflow-table"
-                )
-                for table in tables:
-                    try:
-                        rows = table.find_elements(By.TAG_NAME, "tr")
-                        if rows:
-                            table_data = []
-                            headers = []
-
-                            # Extrair headers
-                            header_cells = rows[0].find_elements(By.TAG_NAME, "th")
-                            if header_cells:
-                                headers = [cell.text.strip() for cell in header_cells]
-
-                            # Extrair dados das linhas
-                            for row in rows[1:] if headers else rows:
-                                cells = row.find_elements(By.TAG_NAME, "td")
-                                if cells:
-                                    if headers:
-                                        row_dict = {
-                                            headers[i]: cell.text.strip()
-                                            for i, cell in enumerate(cells)
-                                            if i < len(headers)
-                                        }
-                                    else:
-                                        row_dict = {
-                                            f"col_{i}": cell.text.strip()
-                                            for i, cell in enumerate(cells)
-                                        }
-                                    if any(row_dict.values()):
-                                        table_data.append(row_dict)
-
-                            if table_data:
-                                # Normaliza também para Workflow (caso venha como dicts, converte ou trata)
-                                # A normalização atual espera lista de listas strings.
-                                # Se table_data é lista de dicts, _normalize pode falhar se não adaptada.
-                                # Mas para tabelas verticais, geralmente extract_workflow_data falha em detectar headers
-                                # e cai no 'else' sem headers? 
-                                # Se cair no else (col_i), é lista de dicts.
-                                # Vamos converter pra lista de listas para normalizar, depois voltar pra dict?
-                                # Simplificação: Se detectarmos tabela vertical aqui, ela provavelmente veio sem headers 
-                                # e virou {'col_0': 'Matricula\n...'}
-                                
-                                # Verifica se é caso de normalização
-                                if len(table_data) == 1 and any('\n' in str(v) for v in table_data[0].values()):
-                                     # Converte para lista de listas
-                                     list_data = [list(table_data[0].values())]
-                                     normalized = self._normalize_table_data(list_data)
-                                     
-                                     # Reconverte para dicts assumindo primeira linha como header
-                                     if normalized and len(normalized) > 1:
-                                         headers = normalized[0]
-                                         new_table_data = []
-                                         for row in normalized[1:]:
-                                             new_row = {headers[i]: row[i] for i in range(len(headers)) if i < len(row)}
-                                             new_table_data.append(new_row)
-                                         workflow_data["tables"].append(new_table_data)
-                                     else:
-                                         workflow_data["tables"].append(table_data)
-                                else:
-                                    workflow_data["tables"].append(table_data)
-                    except:
-                        pass
+                self.switch_to_frame(None)
             except:
                 pass
+            return {}
 
-            # 4. Extrair formulários
+    def _extract_workflow_dom(self, workflow_data):
+        """Extração do Workflow via Selenium, elemento a elemento (backend 'dom')"""
+        # 1. Extrair cards (cartões de workflow)
+        for selector in CARD_SELECTORS:
             try:
-                forms = self.driver.find_elements(By.CSS_SELECTOR, "form")
-                for form in forms:
+                cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                for card in cards:
                     try:
-                        inputs = form.find_elements(
-                            By.CSS_SELECTOR, "input, select, textarea"
-                        )
-                        form_data = {
-                            "type": "form",
-                            "input_count": len(inputs),
-                            "fields": [],
-                        }
-                        for inp in inputs:
-                            try:
-                                field_info = {
-                                    "type": inp.get_attribute("type") or inp.tag_name,
-                                    "name": inp.get_attribute("name"),
-                                    "id": inp.get_attribute("id"),
-                                    "value": inp.get_attribute("value"),
-                                    "placeholder": inp.get_attribute("placeholder"),
-                                }
-                                form_data["fields"].append(field_info)
-                            except:
-                                pass
-                        if form_data["fields"]:
-                            workflow_data["forms"].append(form_data)
+                        card_text = card.text.strip()
+                        if card_text and len(card_text) > 5:
+                            card_info = {
+                                "type": "card",
+                                "selector": selector,
+                                "content": card_text,
+                                "html": card.get_attribute("outerHTML")[:500],
+                            }
+                            workflow_data["cards"].append(card_info)
                     except:
                         pass
             except:
                 pass
 
-            # 5. Extrair painéis/divs com conteúdo estruturado
-            panel_selectors = [
-                ".panel",
-                ".panel-body",
-                ".widget",
-                ".dashboard-widget",
-                ".info-box",
-                ".stat-box",
-                ".status-panel",
-            ]
+        # 2. Extrair listas (ul/ol)
+        try:
+            lists = self.driver.find_elements(By.CSS_SELECTOR, "ul, ol")
+            for lst in lists:
+                try:
+                    items = lst.find_elements(By.TAG_NAME, "li")
+                    if items:
+                        list_data = {
+                            "type": "list",
+                            "item_count": len(items),
+                            "items": [
+                                item.text.strip()
+                                for item in items
+                                if item.text.strip()
+                            ],
+                        }
+                        if list_data["items"]:
+                            workflow_data["lists"].append(list_data)
+                except:
+                    pass
+        except:
+            pass
 
-            for selector in panel_selectors:
+        # 3. Extrair tabelas com estrutura específica de workflow
+        try:
+            tables = self.driver.find_elements(By.CSS_SELECTOR, WORKFLOW_TABLE_SELECTOR)
+            for table in tables:
+                try:
+                    rows = table.find_elements(By.TAG_NAME, "tr")
+                    if rows:
+                        # Extrair headers
+                        header_cells = rows[0].find_elements(By.TAG_NAME, "th")
+                        headers = [cell.text.strip() for cell in header_cells]
+
+                        # Extrair dados das linhas
+                        cell_rows = [
+                            [cell.text.strip() for cell in row.find_elements(By.TAG_NAME, "td")]
+                            for row in (rows[1:] if headers else rows)
+                        ]
+                        table_data = rows_to_workflow_table(headers, cell_rows)
+
+                        if table_data:
+                            # Tabelas verticais chegam como {'col_0': 'Matricula\n...'}
+                            workflow_data["tables"].append(finalize_workflow_table(table_data))
+                except:
+                    pass
+        except:
+            pass
+
+        # 4. Extrair formulários
+        try:
+            forms = self.driver.find_elements(By.CSS_SELECTOR, "form")
+            for form in forms:
                 try:
-                    panels = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for panel in panels:
+                    inputs = form.find_elements(
+                        By.CSS_SELECTOR, "input, select, textarea"
+                    )
+                    form_data = {
+                        "type": "form",
+                        "input_count": len(inputs),
+                        "fields": [],
+                    }
+                    for inp in inputs:
                         try:
-                            panel_text = panel.text.strip()
-                            if panel_text and len(panel_text) > 10:
-                                panel_data = {
-                                    "type": "panel",
-                                    "selector": selector,
-                                    "content": panel_text,
-                                }
-                                workflow_data["panels"].append(panel_data)
+                            field_info = {
+                                "type": inp.get_attribute("type") or inp.tag_name,
+                                "name": inp.get_attribute("name"),
+                                "id": inp.get_attribute("id"),
+                                "value": inp.get_attribute("value"),
+                                "placeholder": inp.get_attribute("placeholder"),
+                            }
+                            form_data["fields"].append(field_info)
                         except:
                             pass
+                    if form_data["fields"]:
+                        workflow_data["forms"].append(form_data)
                 except:
                     pass
+        except:
+            pass
 
-            # 6. Extrair todo o texto visível
+        # 5. Extrair painéis/divs com conteúdo estruturado
+        for selector in PANEL_SELECTORS:
             try:
-                workflow_data["raw_text"] = self.driver.find_element(
-                    By.TAG_NAME, "body"
-                ).text
-            except:
-                pass
-
-            logger.info(f"Extraídos do Workflow:")
-            logger.info(f"  - {len(workflow_data['cards'])} cards")
-            logger.info(f"  - {len(workflow_data['lists'])} listas")
-            logger.info(f"  - {len(workflow_data['tables'])} tabelas")
-            logger.info(f"  - {len(workflow_data['forms'])} formulários")
-            logger.info(f"  - {len(workflow_data['panels'])} painéis")
-
-            # Volta ao frame principal
-            try:
-                self.switch_to_frame(None)
+                panels = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                for panel in panels:
+                    try:
+                        panel_text = panel.text.strip()
+                        if panel_text and len(panel_text) > 10:
+                            panel_data = {
+                                "type": "panel",
+                                "selector": selector,
+                                "content": panel_text,
+                            }
+                            workflow_data["panels"].append(panel_data)
+                    except:
+                        pass
             except:
                 pass
 
-            return workflow_data
-
-        except Exception as e:
-            logger.error(f"Erro ao extrair dados do Workflow: {e}")
-            # Tenta voltar ao frame principal em caso de erro
-            try:
-                self.switch_to_frame(None)
-            except:
-                pass
-            return {}
+        # 6. Extrair todo o texto visível
+        try:
+            workflow_data["raw_text"] = self.driver.find_element(
+                By.TAG_NAME, "body"
+            ).text
+        except:
+            pass
 
     def extract_all_data(self, is_workflow=False):
         """Extrai todos os dados disponíveis na página atual"""
@@ -743,7 +1065,7 @@ class SiriusScraper:
                     except:
                         pass
 
-            self.extracted_data.append(data)
+            self.add_page(data)
             logger.info("Dados extraídos com sucesso!")
             return data
 
@@ -756,6 +1078,12 @@ class SiriusScraper:
                 pass
             return {}
 
+    def add_page(self, page_data):
+        """Registra uma página extraída e, durante um ciclo, já a grava em disco"""
+        self.extracted_data.append(page_data)
+        if self.output is not None:
+            self.output.write_page(page_data, len(self.extracted_data) - 1)
+
     def save(self, format="json"):
         """Salva os dados extraídos"""
         if self.extracted_data:
@@ -768,89 +1096,208 @@ class SiriusScraper:
 
     def save_tables(self):
         """Salva tabelas extraídas em CSVs separados"""
-        import csv
-        from pathlib import Path
-        
-        saved_count = 0
-        timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
-        
-        for i, page_data in enumerate(self.extracted_data):
-            if "tables" in page_data and page_data["tables"]:
-                for j, table in enumerate(page_data["tables"]):
-                    # Ignora tabelas muito pequenas (menos de 2 linhas)
-                    if len(table) < 2:
-                        continue
+        return self.save_outputs(formats=["tables"], history=False)
+
+    def _extract_via_browser(self, workflow=True, painel=True):
+        """Extrai página inicial, Workflow e Painel navegando no navegador"""
+        # Extrai dados da página inicial
+        logger.info("Extraindo dados da página inicial...")
+        self.extract_all_data()
+
+        # Navega para Workflow se solicitado OU se precisar ir ao Painel
+        if workflow or painel:
+            logger.info("=" * 50)
+            logger.info("NAVEGANDO PARA WORKFLOW")
+            logger.info("=" * 50)
+            
+            if self.navigate_to_workflow():
+                logger.info("Extraindo dados do Workflow...")
+                self.extract_all_data(is_workflow=True)
+                
+                # Se painel foi solicitado, navega agora
+                if painel:
+                    logger.info("=" * 50)
+                    logger.info("NAVEGANDO PARA PAINEL")
+                    logger.info("=" * 50)
+                    if self.navigate_to_painel():
+                        logger.info("Extraindo dados do Painel (todas as páginas)...")
                         
-                    filename = f"tabela_{timestamp}_p{i}_t{j}.csv"
-                    filepath = Path(settings.DATA_DIR) / filename
-                    
-                    try:
-                        with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
-                            # Verifica se é lista de dicts ou lista de listas
-                            if len(table) > 0 and isinstance(table[0], dict):
-                                fields = table[0].keys()
-                                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
-                                writer.writeheader()
-                                writer.writerows(table)
-                            else:
-                                writer = csv.writer(f)
-                                writer.writerows(table)
-                                
-                        logger.info(f"Tabela salva: {filename}")
-                        saved_count += 1
-                    except Exception as e:
-                        logger.error(f"Erro ao salvar tabela {filename}: {e}")
-
-    def run_full_extraction(self, headless=False, workflow=True, painel=True):
-        """Executa extração completa navegando por Workflow e Painel"""
-        try:
+                        # DEBUG: Salvar HTML da primeira página (usado por benchmark_tabelas.py)
+                        if settings.SAVE_DEBUG_HTML:
+                            with open("debug_painel.html", "w", encoding="utf-8") as f:
+                                f.write(self.driver.page_source)
+                            
+                        stats = {"pages": 0}
+                        self.stream_painel(
+                            self.iter_painel_rows(stats),
+                            stats,
+                            self.driver.current_url,
+                            self.driver.title,
+                        )
+                    else:
+                        logger.warning("Não foi possível acessar o Painel")
+            else:
+                logger.warning("Não foi possível acessar o Workflow (abortando Painel)")
+
+    def extract_via_http(self, client, home_url, workflow=True, painel=True):
+        """
+        Extrai página inicial, Workflow e Painel (todas as páginas) via HTTP,
+        sem navegador, usando uma sessão já autenticada.
+        """
+        logger.info("Extraindo dados da página inicial (HTTP)...")
+        self.add_page(client.extract_page(home_url))
+
+        if not (workflow or painel):
+            return
+
+        logger.info("=" * 50)
+        logger.info("WORKFLOW (HTTP)")
+        logger.info("=" * 50)
+        workflow_url, workflow_html = client.fetch(settings.SIRIUS_WORKFLOW_URL)
+        self.add_page(client.extract_workflow_page(workflow_url, workflow_html))
+
+        if painel:
+            logger.info("=" * 50)
+            logger.info("PAINEL (HTTP)")
+            logger.info("=" * 50)
+            painel_url = client.find_painel_url(workflow_url, workflow_html)
+            if painel_url:
+                stats = {"pages": 0}
+                pages = (parse_table_rows(soup) for _url, _html, soup in client.iter_pages(painel_url))
+                self.stream_painel(iter_data_rows(pages, stats), stats, painel_url, "Painel")
+            else:
+                logger.warning("Link do Painel não encontrado na página Workflow")
+
+        logger.info(f"Extração HTTP concluída com {client.requests_made} requisições")
+
+    def ensure_ready(self):
+        """
+        Prepara um ciclo do modo daemon: recria o navegador se ele morreu,
+        volta à página inicial e só refaz a autenticação se a sessão caiu.
+        """
+        if not self.browser.is_alive():
+            logger.warning("Navegador indisponível, recriando...")
+            self.quit()
             self.start()
+            return self.ensure_session()
 
-            if self.login():
-                logger.info("Login bem-sucedido! Iniciando extração...")
+        self.driver.get(settings.SIRIUS_URL)
+        self.browser.wait_for(document_ready(), timeout=10, label="página inicial")
+        if is_login_page(self.driver.current_url, self.driver.page_source):
+            logger.info("Sessão do navegador expirou, autenticando novamente...")
+            return self.ensure_session()
+        return True
 
-                # Extrai dados da página inicial
-                logger.info("Extraindo dados da página inicial...")
-                self.extract_all_data()
+    def run_cycle(self, workflow=True, painel=True, http=False, close_browser=False):
+        """
+        Um ciclo de extração e salvamento com o navegador já autenticado
+        (usado por run_full_extraction e pelo modo daemon do auto_run.py).
+        Com http=True a extração usa os cookies da sessão via requests;
+        close_browser fecha o Chrome logo após copiar a sessão.
+        """
+        self.extracted_data = []
+        self.painel_tables = {}
+        self.output = OutputWriter()
 
-                # Navega para Workflow se solicitado OU se precisar ir ao Painel
-                if workflow or painel:
-                    logger.info("=" * 50)
-                    logger.info("NAVEGANDO PARA WORKFLOW")
-                    logger.info("=" * 50)
-                    
-                    if self.navigate_to_workflow():
-                        logger.info("Extraindo dados do Workflow...")
-                        self.extract_all_data(is_workflow=True)
-                        
-                        # Se painel foi solicitado, navega agora
-                        if painel:
-                            logger.info("=" * 50)
-                            logger.info("NAVEGANDO PARA PAINEL")
-                            logger.info("=" * 50)
-                            if self.navigate_to_painel():
-                                logger.info("Extraindo dados do Painel...")
-                                
-                                # DEBUG: Salvar HTML para verificar paginação
-                                with open("debug_painel.html", "w", encoding="utf-8") as f:
-                                    f.write(self.driver.page_source)
-                                    
-                                # Força is_workflow=True para usar a lógica de extração melhorada (headers, dicts)
-                                self.extract_all_data(is_workflow=True)
-                            else:
-                                logger.warning("Não foi possível acessar o Painel")
-                    else:
-                        logger.warning("Não foi possível acessar o Workflow (abortando Painel)")
+        try:
+            self._extract_cycle(workflow=workflow, painel=painel, http=http, close_browser=close_browser)
+        except BaseException:
+            # Nada de arquivos pela metade: descarta as gravações em andamento
+            self.output.abort()
+            self.output = None
+            raise
+
+        paths = self.save_outputs()
+        self.selector_cache.log_stats()
+        logger.info("Extração completa finalizada!")
+        return paths
+
+    def _extract_cycle(self, workflow, painel, http, close_browser):
+        """Extração do ciclo, via navegador ou via HTTP"""
+        if http:
+            logger.info("Modo HTTP: transferindo sessão do navegador...")
+            client = SiriusHttpClient.from_driver(self.driver)
+            home_url = self.driver.current_url
+            if close_browser:
+                # O Chrome não é mais necessário após a autenticação
+                self.quit()
+            try:
+                self.extract_via_http(client, home_url, workflow=workflow, painel=painel)
+            finally:
+                client.close()
+        else:
+            self._extract_via_browser(workflow=workflow, painel=painel)
+
+    def save_outputs(self, formats=None, history=True):
+        """
+        Salva todos os dados extraídos em uma única passada (JSON, CSV e
+        tabelas, ou os formatos pedidos). Se o ciclo já gravou as páginas
+        conforme foram extraídas, apenas conclui os arquivos.
+        """
+        logger.info("=" * 50)
+        logger.info("SALVANDO DADOS")
+        logger.info("=" * 50)
 
-                # Salva todos os dados extraídos
-                logger.info("=" * 50)
-                logger.info("SALVANDO DADOS")
-                logger.info("=" * 50)
-                self.save(format="json")
-                self.save(format="csv")
-                self.save_tables()
+        output, self.output = self.output, None
+        try:
+            if output is None:
+                if not self.extracted_data:
+                    logger.warning("Nenhum dado para salvar")
+                    return {}
+                output = OutputWriter(formats=formats)
+                for i, page_data in enumerate(self.extracted_data):
+                    output.write_page(page_data, i)
+            elif not output.pages:
+                output.abort()
+                logger.warning("Nenhum dado para salvar")
+                return {}
+            output.close()
+        except Exception as e:
+            logger.error(f"Erro ao salvar dados: {e}")
+            if output is not None:
+                output.abort()
+            return {}
 
-                logger.info("Extração completa finalizada!")
+        for fmt, path in output.paths.items():
+            if fmt == "tables":
+                for table_path in path:
+                    logger.info(f"Tabela salva: {table_path.name}")
+            else:
+                logger.info(f"Dados salvos em: {path}")
+
+        try:
+            write_manifest(build_manifest(self.extracted_data, output))
+        except Exception as e:
+            logger.error(f"Erro ao gravar manifesto da execução: {e}")
+
+        if history:
+            self.save_history()
+        return output.paths
+
+    def save_history(self):
+        """Grava a execução no histórico SQLite (falha não interrompe a extração)"""
+        if not settings.HISTORY_ENABLED or not self.extracted_data:
+            return None
+        try:
+            return HistoryStore().record_run(self.extracted_data)
+        except Exception as e:
+            logger.error(f"Erro ao gravar histórico: {e}")
+            return None
+
+    def run_full_extraction(self, headless=False, workflow=True, painel=True, http=False):
+        """
+        Executa extração completa navegando por Workflow e Painel.
+        Com http=True, o navegador só faz o login: os cookies vão para uma
+        sessão requests e o Chrome é fechado antes da extração.
+        Retorna um ExtractionResult (vazio se o login ou a extração falhar).
+        """
+        paths = {}
+        try:
+            self.start()
+
+            if self.ensure_session():
+                logger.info("Login bem-sucedido! Iniciando extração...")
+                paths = self.run_cycle(workflow=workflow, painel=painel, http=http, close_browser=True)
             else:
                 logger.error("Falha no login. Verifique as credenciais.")
 
@@ -858,6 +1305,22 @@ class SiriusScraper:
             logger.error(f"Erro durante extração: {e}")
         finally:
             self.quit()
+        return self.extraction_result(paths)
+
+    def extraction_result(self, paths=None):
+        """
+        ExtractionResult do último ciclo. O Painel principal é o de menor índice
+        de página (como em latest_run.json) e só acompanha execuções salvas.
+        """
+        if not paths:
+            return ExtractionResult(self.extracted_data, paths)
+        for index, page_data in enumerate(self.extracted_data):
+            painel = page_data.get("painel")
+            if painel:
+                return ExtractionResult(
+                    self.extracted_data, paths, self.painel_tables.get(index), painel["files"].get("csv")
+                )
+        return ExtractionResult(self.extracted_data, paths)
 
     def __enter__(self):
         self.start()
@@ -0,0 +1,72 @@
+import unicodedata
+from collections import defaultdict
+
+# Tamanho dos n-gramas do índice de termos
+GRAM_SIZE = 3
+
+# Consultas por campo aceitas na busca (prefixo -> coluna do Painel)
+FIELD_QUERIES = {"setor": "Setor", "status": "Status"}
+
+
+def fold(text):
+    """
+    Minúsculas e sem acentos ('Cobrança' -> 'cobranca'). Mesma normalização
+    do navegador: NFD e remoção das marcas combinantes U+0300-U+036F.
+    """
+    decomposed = unicodedata.normalize("NFD", str(text))
+    return "".join(c for c in decomposed if not "\u0300" <= c <= "\u036f").lower()
+
+
+def build_search_index(table, columns, fields=FIELD_QUERIES):
+    """
+    Índice invertido da busca do dashboard, calculado uma vez por geração:
+      - vocab: termos normalizados (fold + separação por espaços)
+      - postings: linhas (ordem da tabela) em que cada termo aparece
+      - grams: n-grama -> termos que o contêm (busca por trecho do termo)
+      - fields: valores distintos de cada campo consultável -> linhas
+    `table` é uma PainelTable (src/columnar.py). Todas as listas de ids estão
+    em ordem crescente.
+    """
+    vocab = {}
+    postings = []
+    values = {name: {} for name in fields}
+    # Cada valor distinto é normalizado uma vez (colunas repetem muito)
+    folded = {}
+    column_tokens = [
+        [folded[v] if v in folded else folded.setdefault(v, fold(v).split()) for v in table.column(column)]
+        for column in columns
+    ]
+
+    for row_id, tokens_by_column in enumerate(zip(*column_tokens)):
+        seen = set()
+        for tokens in tokens_by_column:
+            for token in tokens:
+                if token in seen:
+                    continue
+                seen.add(token)
+                token_id = vocab.setdefault(token, len(vocab))
+                if token_id == len(postings):
+                    postings.append([])
+                postings[token_id].append(row_id)
+
+    for name, column in fields.items():
+        keys = {}
+        for row_id, value in enumerate(table.column(column)):
+            key = keys[value] if value in keys else keys.setdefault(value, fold(value).strip())
+            values[name].setdefault(key, []).append(row_id)
+
+    grams = defaultdict(list)
+    for token, token_id in vocab.items():
+        for gram in {token[i:i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1)}:
+            grams[gram].append(token_id)
+
+    return {
+        "gram": GRAM_SIZE,
+        "vocab": list(vocab),
+        "postings": postings,
+        "grams": grams,
+        "fields": {
+            name: {"values": list(field_values), "rows": list(field_values.values())}
+            for name, field_values in values.items()
+        },
+    }
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+import config.settings as settings
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+
+class SelectorCache:
+    """
+    Cache persistente (em data/) do frame e seletor que funcionaram por último
+    para cada alvo lógico (campo de usuário, botão Workflow, link Painel...).
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.SELECTOR_CACHE_FILE)
+        self.entries = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        """Carrega o cache do disco (vazio se ausente ou corrompido)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Cache de seletores ignorado ({self.path.name}): {e}")
+            return {}
+
+    def _save(self):
+        """Grava o cache no disco"""
+        try:
+            # Nome temporário único: vários navegadores do pool gravam o mesmo cache
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar o cache de seletores: {e}")
+
+    def get(self, target):
+        """Retorna (frame, by, selector) gravado para o alvo, ou None"""
+        entry = self.entries.get(target)
+        if not entry:
+            return None
+        return entry["frame"], entry["by"], entry["selector"]
+
+    def record(self, target, frame, by, selector):
+        """Grava o frame/seletor que funcionou para o alvo"""
+        if self.get(target) == (frame, by, selector):
+            return
+        self.entries[target] = {
+            "frame": frame,
+            "by": by,
+            "selector": selector,
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._save()
+
+    def invalidate(self, target):
+        """Remove o alvo do cache (ex.: elemento encontrado mas não clicável)"""
+        if self.entries.pop(target, None) is not None:
+            self._save()
+
+    def log_stats(self):
+        """Resumo de acertos e falhas do cache na execução"""
+        total = self.hits + self.misses
+        if total:
+            logger.info(
+                f"Cache de seletores: {self.hits} hits, {self.misses} misses "
+                f"({self.hits / total:.0%} de acerto)"
+            )
@@ -0,0 +1,69 @@
+import json
+import os
+import time
+from pathlib import Path
+import config.settings as settings
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+
+class SessionStore:
+    """
+    Persiste os cookies da sessão autenticada (data/session_cookies.json)
+    com controle de expiração, para execuções agendadas pularem login e 2FA.
+    Só é usado com SESSION_REUSE=true; o arquivo é gravado com permissão 0600.
+    """
+
+    def __init__(self, path=None, max_age_minutes=None):
+        self.path = Path(path or settings.SESSION_COOKIES_FILE)
+        self.max_age = (max_age_minutes or settings.SESSION_MAX_AGE_MINUTES) * 60
+
+    def save(self, cookies):
+        """Grava os cookies e calcula quando a sessão deixa de ser confiável"""
+        saved_at = time.time()
+        expiries = [c["expiry"] for c in cookies if c.get("expiry")]
+        # Cookies de sessão não têm expiry: vale o limite configurado
+        expires_at = min([saved_at + self.max_age] + expiries)
+
+        payload = {
+            "saved_at": saved_at,
+            "expires_at": expires_at,
+            "cookies": cookies,
+        }
+        try:
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            # Cookies autenticados: arquivo legível só pelo dono (0600) desde a criação
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.path)
+            logger.info(
+                f"Sessão salva ({len(cookies)} cookies, válida até "
+                f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(expires_at))})"
+            )
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar a sessão: {e}")
+
+    def load(self):
+        """Cookies salvos, ou None se ausentes/expirados"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Sessão salva ignorada: {e}")
+            return None
+
+        if time.time() >= payload.get("expires_at", 0):
+            logger.info("Sessão salva expirada")
+            return None
+        return payload.get("cookies") or None
+
+    def clear(self):
+        """Descarta a sessão salva (ex.: servidor não aceitou mais os cookies)"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
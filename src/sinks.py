@@ -0,0 +1,199 @@
+import csv
+import json
+import os
+import textwrap
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import config.settings as settings
+
+
+@contextmanager
+def atomic_open(path, mode="w", encoding="utf-8", newline=None):
+    """
+    Abre um arquivo temporário ao lado do destino e só o renomeia para o
+    nome final ao sair sem erro: leitores nunca veem arquivos pela metade.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    f = open(tmp_path, mode, encoding=encoding, newline=newline)
+    try:
+        yield f
+    except BaseException:
+        f.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    f.close()
+    tmp_path.replace(path)
+
+
+class Sink:
+    """Destino de gravação incremental com commit atômico (temp + rename)"""
+
+    encoding = "utf-8"
+    newline = None
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self._context = atomic_open(self.path, encoding=self.encoding, newline=self.newline)
+        self._file = self._context.__enter__()
+
+    def write(self, record):
+        self._write(record)
+        self.count += 1
+
+    def _write(self, record):
+        raise NotImplementedError
+
+    def _finish(self):
+        """Fechamento do formato (ex.: ']' do JSON) antes do commit"""
+
+    def close(self):
+        """Conclui o arquivo e o move para o nome final"""
+        self._finish()
+        self._context.__exit__(None, None, None)
+
+    def abort(self):
+        """Descarta o arquivo temporário (o destino não é alterado)"""
+        self._context.__exit__(RuntimeError, RuntimeError("abortado"), None)
+
+
+class JsonLinesSink(Sink):
+    """Um registro JSON por linha"""
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class JsonArraySink(Sink):
+    """Array JSON (mesmo formato de json.dump(indent=2)) gravado item a item"""
+
+    def _write(self, record):
+        self._file.write("[\n" if self.count == 0 else ",\n")
+        self._file.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=2), "  "))
+
+    def _finish(self):
+        self._file.write("\n]" if self.count else "[]")
+
+
+class CsvSink(Sink):
+    """
+    CSV (utf-8-sig, abre direto no Excel). Aceita listas ou dicts; com dicts
+    as colunas são as chaves do primeiro registro.
+    """
+
+    encoding = "utf-8-sig"
+    newline = ""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._writer = None
+
+    def _write(self, record):
+        if self._writer is None:
+            if isinstance(record, dict):
+                self._writer = csv.DictWriter(self._file, fieldnames=list(record.keys()), extrasaction="ignore")
+                self._writer.writeheader()
+            else:
+                self._writer = csv.writer(self._file)
+        self._writer.writerow(record)
+
+
+SINKS = {"json": JsonArraySink, "jsonl": JsonLinesSink, "csv": CsvSink}
+
+
+def stream_rows(rows, filename, formats=("csv", "jsonl")):
+    """
+    Grava linhas à medida que o gerador as produz (memória constante).
+    Retorna (quantidade de linhas, {formato: caminho}).
+    """
+    sinks = {fmt: SINKS[fmt](Path(settings.DATA_DIR) / f"{filename}.{fmt}") for fmt in formats}
+    count = 0
+    try:
+        for row in rows:
+            for sink in sinks.values():
+                sink.write(row)
+            count += 1
+    except BaseException:
+        for sink in sinks.values():
+            sink.abort()
+        raise
+
+    for sink in sinks.values():
+        sink.close()
+    return count, {fmt: sink.path for fmt, sink in sinks.items()}
+
+
+class OutputWriter:
+    """
+    Grava as páginas de uma execução em uma única passada, para todos os
+    formatos pedidos ao mesmo tempo:
+      - json/jsonl/csv: extracted_<timestamp>.<formato> (uma página por registro)
+      - tables: tabela_<timestamp>_p<página>_t<tabela>.csv (tabelas com 2+ linhas)
+    Cada página é gravada quando chega, sem reserializar o resultado inteiro.
+    """
+
+    def __init__(self, formats=None, prefix="extracted", timestamp=None):
+        self.formats = list(formats or settings.OUTPUT_FORMATS)
+        self.timestamp = timestamp or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.pages = 0
+        # Metadados das tabelas gravadas (arquivo, página, linhas, colunas)
+        self.tables = []
+        self.sinks = {
+            fmt: SINKS[fmt](Path(settings.DATA_DIR) / f"{prefix}_{self.timestamp}.{fmt}")
+            for fmt in self.formats
+            if fmt in SINKS
+        }
+
+    def write_page(self, page_data, index=None):
+        """Grava uma página (dict do extract_*) em todos os formatos"""
+        index = self.pages if index is None else index
+        self.pages += 1
+        for sink in self.sinks.values():
+            sink.write(page_data)
+
+        if "tables" in self.formats:
+            for j, table in enumerate(page_data.get("tables") or []):
+                # Ignora tabelas muito pequenas (menos de 2 linhas)
+                if len(table) < 2:
+                    continue
+                sink = CsvSink(Path(settings.DATA_DIR) / f"tabela_{self.timestamp}_p{index}_t{j}.csv")
+                try:
+                    for row in table:
+                        sink.write(row)
+                except BaseException:
+                    sink.abort()
+                    raise
+                sink.close()
+                columns = list(table[0].keys()) if isinstance(table[0], dict) else list(table[0])
+                self.tables.append(
+                    {"path": sink.path, "page": index, "table": j, "rows": len(table), "columns": columns}
+                )
+
+    @property
+    def paths(self):
+        """Arquivos gravados ({formato: caminho}; tabelas em 'tables')"""
+        paths = {fmt: sink.path for fmt, sink in self.sinks.items()}
+        if self.tables:
+            paths["tables"] = [table["path"] for table in self.tables]
+        return paths
+
+    def close(self):
+        """Conclui todos os arquivos (rename atômico)"""
+        for sink in self.sinks.values():
+            sink.close()
+
+    def abort(self):
+        """Descarta os arquivos em andamento (tabelas já concluídas permanecem)"""
+        for sink in self.sinks.values():
+            sink.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
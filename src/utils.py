@@ -1,14 +1,17 @@
 import logging
 import sys
 import json
-import csv
 from datetime import datetime
 from pathlib import Path
 import config.settings as settings
+from src.sinks import CsvSink, atomic_open
 
 
 def setup_logging():
-    """Configura o sistema de logs"""
+    """Configura o sistema de logs (um arquivo por processo, não por import)"""
+    if logging.getLogger().handlers:
+        return logging.getLogger(__name__)
+
     log_filename = f"scraper_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
     log_path = Path(settings.LOGS_DIR) / log_filename
 
@@ -39,7 +42,7 @@ def save_data(data, filename_prefix="extracted", format="json"):
 
     if format == "json":
         filepath = Path(settings.DATA_DIR) / f"{filename}.json"
-        with open(filepath, "w", encoding="utf-8") as f:
+        with atomic_open(filepath) as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
     elif format == "csv":
@@ -47,10 +50,10 @@ def save_data(data, filename_prefix="extracted", format="json"):
         # Converte dados aninhados para formato plano se necessário
         flat_data = flatten_data(data)
         if flat_data:
-            with open(filepath, "w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.DictWriter(f, fieldnames=flat_data[0].keys(), extrasaction='ignore')
-                writer.writeheader()
-                writer.writerows(flat_data)
+            sink = CsvSink(filepath)
+            for row in flat_data:
+                sink.write(row)
+            sink.close()
 
     return filepath
 
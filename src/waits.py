@@ -0,0 +1,163 @@
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    NoSuchFrameException,
+    StaleElementReferenceException,
+    TimeoutException,
+    JavascriptException,
+)
+import config.settings as settings
+from src.utils import setup_logging
+
+logger = setup_logging()
+
+# Exceções que significam "ainda não está pronto" durante o polling
+_NOT_READY = (
+    NoSuchElementException,
+    NoSuchFrameException,
+    StaleElementReferenceException,
+    JavascriptException,
+)
+
+# Instala (uma vez por documento) um MutationObserver que registra o
+# instante da última mutação e informa há quantos ms o DOM está parado
+_DOM_QUIET_JS = """
+if (!window.__siriusLastMutation) {
+    window.__siriusLastMutation = Date.now();
+    new MutationObserver(() => { window.__siriusLastMutation = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return Date.now() - window.__siriusLastMutation;
+"""
+
+_FRAME_READY_JS = """
+const frame = window.frames[arguments[0]];
+if (!frame) return false;
+try {
+    return frame.document.readyState === 'complete' && !!frame.document.body;
+} catch (e) {
+    return true;  // Frame de outra origem: existe, mas não é inspecionável
+}
+"""
+
+
+class Condition:
+    """
+    Condição de prontidão avaliada a cada polling.
+    Pode ser combinada com & (todas) e | (qualquer uma).
+    """
+
+    def __init__(self, description, check):
+        self.description = description
+        self.check = check
+
+    def __call__(self, driver):
+        try:
+            return self.check(driver)
+        except _NOT_READY:
+            return False
+
+    def __and__(self, other):
+        return all_of(self, other)
+
+    def __or__(self, other):
+        return any_of(self, other)
+
+    def __repr__(self):
+        return self.description
+
+
+def all_of(*conditions):
+    """Satisfeita quando todas as condições são verdadeiras"""
+
+    def check(driver):
+        result = True
+        for condition in conditions:
+            result = condition(driver)
+            if not result:
+                return False
+        return result
+
+    return Condition(" & ".join(c.description for c in conditions), check)
+
+
+def any_of(*conditions):
+    """Satisfeita quando qualquer uma das condições é verdadeira"""
+
+    def check(driver):
+        for condition in conditions:
+            result = condition(driver)
+            if result:
+                return result
+        return False
+
+    return Condition("(" + " | ".join(c.description for c in conditions) + ")", check)
+
+
+def element_present(locator):
+    """Elemento existe no DOM do contexto atual"""
+    return Condition(f"presente {locator[1]}", EC.presence_of_element_located(locator))
+
+
+def element_visible(locator):
+    """Elemento existe e está visível"""
+    return Condition(f"visível {locator[1]}", EC.visibility_of_element_located(locator))
+
+
+def element_stale(element):
+    """Elemento foi removido do DOM (ex.: a página/frame navegou)"""
+    return Condition("elemento descartado", EC.staleness_of(element))
+
+
+def frame_loaded(frame_name):
+    """Frame existe no contexto atual e terminou de carregar"""
+    return Condition(
+        f"frame {frame_name} carregado",
+        lambda driver: driver.execute_script(_FRAME_READY_JS, frame_name),
+    )
+
+
+def url_changed(old_url):
+    """URL do contexto de navegação principal mudou"""
+    return Condition("URL alterada", lambda driver: driver.current_url != old_url)
+
+
+def url_contains(fragment):
+    """URL do contexto principal contém o trecho"""
+    return Condition(f"URL contém {fragment}", lambda driver: fragment in driver.current_url)
+
+
+def document_ready():
+    """document.readyState == 'complete' no contexto atual"""
+    return Condition(
+        "documento completo",
+        lambda driver: driver.execute_script("return document.readyState") == "complete",
+    )
+
+
+def dom_quiet(ms=500):
+    """Nenhuma mutação no DOM do contexto atual há pelo menos `ms` milissegundos"""
+    return Condition(
+        f"DOM parado {ms}ms",
+        lambda driver: driver.execute_script(_DOM_QUIET_JS) >= ms,
+    )
+
+
+def wait_until(driver, condition, timeout=None, label=None, poll=0.1):
+    """
+    Aguarda a condição por no máximo `timeout` segundos e registra a latência real.
+    Retorna o valor da condição ou False se o tempo esgotar (não levanta exceção).
+    """
+    timeout = timeout if timeout is not None else settings.BROWSER_TIMEOUT
+    label = label or condition.description
+    started = time.perf_counter()
+
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+        logger.info(f"Espera '{label}': {(time.perf_counter() - started) * 1000:.0f} ms")
+        return result
+    except TimeoutException:
+        logger.warning(f"Espera '{label}' esgotou após {timeout}s")
+        return False
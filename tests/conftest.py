@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Os testes importam src.* e config.* a partir da raiz do repositório
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import config.settings as settings  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """data/ temporária: nada do que os testes gravam cai na pasta real"""
+    paths = {
+        "DATA_DIR": tmp_path,
+        "RUNS_DIR": tmp_path / "runs",
+        "LATEST_RUN_FILE": tmp_path / "latest_run.json",
+        "CDC_DIR": tmp_path / "cdc",
+        "HISTORY_DB": tmp_path / "history.db",
+        "SELECTOR_CACHE_FILE": tmp_path / "selector_cache.json",
+        "SESSION_COOKIES_FILE": tmp_path / "session_cookies.json",
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(settings, name, str(path))
+    return tmp_path
@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+import config.settings as settings
+from src.dashboard_watch import InotifyWatcher, PollingWatcher, refresh_watches, watched_dirs
+
+
+@pytest.fixture
+def cdc_dir(data_dir):
+    path = Path(settings.CDC_DIR)
+    path.mkdir()
+    return path
+
+
+def write_current(directory):
+    (directory / "current.csv").write_text("Matricula\n1001\n", encoding="utf-8")
+
+
+def test_watched_dirs_skip_missing_p2(data_dir, cdc_dir):
+    assert watched_dirs() == [data_dir, cdc_dir]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify só existe no Linux")
+def test_inotify_picks_up_p2_created_after_start(data_dir, cdc_dir):
+    watcher = InotifyWatcher(watched_dirs())
+    try:
+        (cdc_dir / "p2").mkdir()
+        # A criação em data/cdc/ acorda o laço, que passa a observar p2
+        assert watcher.wait(timeout=2) == ["p2"]
+        assert refresh_watches(watcher) == [cdc_dir / "p2"]
+        assert refresh_watches(watcher) == []
+
+        write_current(cdc_dir / "p2")
+        assert "current.csv" in watcher.wait(timeout=2)
+    finally:
+        watcher.close()
+
+
+def test_polling_picks_up_p2_created_after_start(data_dir, cdc_dir):
+    watcher = PollingWatcher(watched_dirs(), interval=0.01)
+    (cdc_dir / "p2").mkdir()
+    write_current(cdc_dir / "p2")
+
+    assert refresh_watches(watcher) == [cdc_dir / "p2"]
+    assert watcher.wait() == ["current.csv"]
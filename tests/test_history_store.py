@@ -0,0 +1,56 @@
+import sqlite3
+from contextlib import closing
+
+from src.history_store import GRANULARITIES, SCHEMA_VERSION, HistoryStore
+
+
+def traced_statements(monkeypatch):
+    """Registra os comandos SQL de todas as conexões abertas pelo HistoryStore"""
+    statements = []
+    connect = HistoryStore._connect
+
+    def traced(self):
+        conn = connect(self)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(HistoryStore, "_connect", traced)
+    return statements
+
+
+def user_version(path):
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def test_schema_runs_once(data_dir, monkeypatch):
+    path = data_dir / "history.db"
+    HistoryStore(path)
+    assert user_version(path) == SCHEMA_VERSION
+
+    statements = traced_statements(monkeypatch)
+    store = HistoryStore(path)
+    store.trend()
+
+    assert not [sql for sql in statements if "CREATE" in sql or "journal_mode" in sql]
+
+
+def test_old_database_is_migrated_and_aggregated(data_dir):
+    path = data_dir / "history.db"
+    HistoryStore(path)
+    # Banco de uma versão anterior: sem user_version e sem agregados
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute("INSERT INTO runs (run_ts, painel_rows) VALUES ('2026-10-01 10:00:00', 1)")
+        conn.execute(
+            "INSERT INTO painel (run_id, run_ts, page, setor, status, atrasado) "
+            "VALUES (1, '2026-10-01 10:00:00', 2, 'Cadastro', 'PENDENTE', 0)"
+        )
+        conn.execute("DELETE FROM rollup_buckets")
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute("PRAGMA user_version = 0")
+
+    HistoryStore(path)
+
+    assert user_version(path) == SCHEMA_VERSION
+    with closing(sqlite3.connect(path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM rollup_buckets").fetchone()[0] == len(GRANULARITIES)
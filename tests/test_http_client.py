@@ -0,0 +1,153 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import config.settings as settings
+from src.http_client import SiriusHttpClient
+from src.page_parser import PAINEL_HEADERS
+from src.scraper import SiriusScraper
+
+
+def painel_page(fichas, next_href=None):
+    """Página do Painel com cabeçalho, linha de filtro, registros e link de próxima página"""
+    cells = lambda tag, row: "".join(f"<{tag}>{value}</{tag}>" for value in row)
+    rows = [cells("th", PAINEL_HEADERS), cells("td", ["TODOS"] * len(PAINEL_HEADERS))]
+    for ficha in fichas:
+        values = {name: "" for name in PAINEL_HEADERS}
+        values.update(Matricula=str(1000 + ficha), Ficha=str(ficha), Setor="Cadastro", Status="PENDENTE")
+        rows.append(cells("td", [values[name] for name in PAINEL_HEADERS]))
+    link = f'<a href="{next_href}">Próxima</a>' if next_href else ""
+    return f"<html><body><table>{''.join(f'<tr>{row}</tr>' for row in rows)}</table>{link}</body></html>"
+
+
+LOGIN_PAGE = '<html><body><form><input name="usuario"><input type="password" name="senha"></form></body></html>'
+
+PAGES = {
+    # Página inicial: frameset com o conteúdo no frame 'baixo'
+    "/inicio.csp": '<html><head><title>Sirius</title></head><frameset><frame name="cima" src="/menu.csp">'
+    '<frame name="baixo" src="/conteudo.csp"></frameset></html>',
+    "/menu.csp": "<html><body><a href='/ajuda.csp'>Ajuda</a></body></html>",
+    "/conteudo.csp": "<html><body><table><tr><th>Fila</th><th>Total</th></tr><tr><td>Cadastro</td><td>3</td></tr></table></body></html>",
+    # Workflow sem o link na própria página: o Painel está no menu do frame 'cima'
+    "/workflow.csp": '<html><head><title>Workflow</title></head><frameset><frame name="cima" src="/wf_menu.csp">'
+    '<frame name="baixo" src="/wf_baixo.csp"></frameset></html>',
+    "/wf_menu.csp": "<html><body><a href='/painel.csp?pagina=1'>Painel</a></body></html>",
+    "/wf_baixo.csp": "<html><body><p>Selecione uma opção</p></body></html>",
+    # Painel: a página 3 aponta de volta para a 1 (URL repetida)
+    "/painel.csp?pagina=1": painel_page([1, 2], "/painel.csp?pagina=2"),
+    "/painel.csp?pagina=2": painel_page([3], "/painel.csp?pagina=3"),
+    "/painel.csp?pagina=3": painel_page([4], "/painel.csp?pagina=1"),
+    # Listagem cuja página 3 devolve o mesmo conteúdo da 2 (com outra URL)
+    "/lista.csp?p=1": painel_page([1], "/lista.csp?p=2"),
+    "/lista.csp?p=2": painel_page([2], "/lista.csp?p=3"),
+    "/lista.csp?p=3": painel_page([2], "/lista.csp?p=3"),
+    "/expirada.csp": LOGIN_PAGE,
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Servidor do Sirius de mentira: páginas fixas, redirecionamento para a validação"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == "/restrito.csp":
+            self.send_response(302)
+            self.send_header("Location", "/validacao.csp")
+            self.end_headers()
+            return
+        html = LOGIN_PAGE if self.path == "/validacao.csp" else PAGES.get(self.path)
+        if html is None:
+            self.send_error(404)
+            return
+        body = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def sirius():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = SiriusHttpClient(timeout=5)
+    try:
+        yield client
+    finally:
+        client.close()
+
+
+def test_iter_pages_stops_on_repeated_url(sirius, client):
+    server, base = sirius
+    urls = [url for url, _html, _soup in client.iter_pages(f"{base}/painel.csp?pagina=1")]
+
+    assert urls == [f"{base}/painel.csp?pagina={n}" for n in (1, 2, 3)]
+    # O link da página 3 volta para a 1: nenhuma requisição a mais
+    assert server.requests.count("/painel.csp?pagina=1") == 1
+
+
+def test_iter_pages_stops_on_repeated_content(sirius, client):
+    server, base = sirius
+    urls = [url for url, _html, _soup in client.iter_pages(f"{base}/lista.csp?p=1")]
+
+    assert urls == [f"{base}/lista.csp?p=1", f"{base}/lista.csp?p=2"]
+    assert server.requests == ["/lista.csp?p=1", "/lista.csp?p=2", "/lista.csp?p=3"]
+
+
+def test_extract_page_follows_baixo_frame(sirius, client):
+    _server, base = sirius
+    page = client.extract_page(f"{base}/inicio.csp")
+
+    assert page["url"] == f"{base}/conteudo.csp"
+    assert page["title"] == "Sirius"
+    assert page["tables"] == [[["Fila", "Total"], ["Cadastro", "3"]]]
+
+
+def test_find_painel_url_searches_workflow_frames(sirius, client):
+    _server, base = sirius
+    workflow_url, workflow_html = client.fetch(f"{base}/workflow.csp")
+
+    assert client.find_painel_url(workflow_url, workflow_html) == f"{base}/painel.csp?pagina=1"
+
+
+@pytest.mark.parametrize("path", ["/restrito.csp", "/expirada.csp"])
+def test_fetch_detects_login_page(sirius, client, path):
+    _server, base = sirius
+    with pytest.raises(RuntimeError, match="tela de login"):
+        client.fetch(f"{base}{path}")
+
+    # Validação de sessão recebe a resposta como veio
+    url, html = client.fetch(f"{base}{path}", allow_login=True)
+    assert 'type="password"' in html
+
+
+def test_extract_via_http_walks_workflow_and_painel(sirius, client, data_dir, monkeypatch):
+    server, base = sirius
+    monkeypatch.setattr(settings, "SIRIUS_WORKFLOW_URL", f"{base}/workflow.csp")
+    scraper = SiriusScraper(incremental=False)
+
+    scraper.extract_via_http(client, f"{base}/inicio.csp")
+
+    home, workflow, painel = scraper.extracted_data
+    assert home["url"] == f"{base}/conteudo.csp"
+    assert workflow["title"] == "Workflow"
+    assert painel["url"] == f"{base}/painel.csp?pagina=1"
+    assert painel["painel"]["pages"] == 3
+    assert painel["painel"]["rows"] == 4
+    assert client.requests_made == len(server.requests)
@@ -0,0 +1,142 @@
+from pathlib import Path
+
+import pytest
+
+from src.columnar import PainelTable
+from src.page_parser import (
+    PAINEL_HEADERS,
+    iter_data_rows,
+    make_soup,
+    painel_record,
+    parse_table_rows,
+    parse_workflow_html,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def read_dump(name):
+    return (ROOT / name).read_text(encoding="utf-8", errors="replace")
+
+
+def test_parse_workflow_html_returns_all_sections():
+    data = parse_workflow_html(read_dump("frame_baixo_dump.html"))
+    assert set(data) == {"cards", "lists", "tables", "forms", "panels", "raw_text"}
+
+
+def test_parse_workflow_html_frame_baixo_dump():
+    data = parse_workflow_html(read_dump("frame_baixo_dump.html"))
+
+    # A grade de ícones não tem texto; só a tabela do rodapé vira dados,
+    # normalizada de uma célula com quebra de linha para cabeçalho + linha
+    assert data["tables"] == [[{"": "", "GETEC - Gerência de Tecnologia": "versão do sistema V.2.1.0"}]]
+    assert data["forms"] == []
+    # <style> não entra no texto visível
+    assert data["raw_text"] == "GETEC - Gerência de Tecnologia\nversão do sistema V.2.1.0"
+
+
+@pytest.mark.parametrize("name", ["pagina_html.html", "dashboard_dump.html"])
+def test_parse_workflow_html_frameset_has_no_content(name):
+    # Página principal é só um <frameset>: o conteúdo vem dos frames
+    data = parse_workflow_html(read_dump(name))
+    assert data == {"cards": [], "lists": [], "tables": [], "forms": [], "panels": [], "raw_text": ""}
+
+
+def test_parse_workflow_html_table_with_header_row():
+    html = """
+    <html><body><table>
+      <tr><th>Ficha</th><th>Status</th></tr>
+      <tr><td>1</td><td>PENDENTE</td></tr>
+      <tr><td></td><td></td></tr>
+      <tr><td>2</td><td>CONCLUÍDO</td></tr>
+    </table>
+    <form><input name="busca" placeholder="Buscar"><select name="setor"><option selected>Todos</option></select></form>
+    </body></html>
+    """
+    data = parse_workflow_html(html)
+
+    # Linhas vazias são descartadas; o cabeçalho <th> vira as chaves
+    assert data["tables"] == [[{"Ficha": "1", "Status": "PENDENTE"}, {"Ficha": "2", "Status": "CONCLUÍDO"}]]
+    assert data["forms"] == [{
+        "type": "form",
+        "input_count": 2,
+        "fields": [
+            {"type": "text", "name": "busca", "id": None, "value": None, "placeholder": "Buscar"},
+            # Mesmos valores de get_attribute("type")/("value") no Selenium
+            {"type": "select-one", "name": "setor", "id": None, "value": "Todos", "placeholder": None},
+        ],
+    }]
+
+
+def painel_row(ficha, status="PENDENTE"):
+    values = {name: "" for name in PAINEL_HEADERS}
+    values.update(Matricula=str(1000 + ficha), Nome=f"Cliente {ficha}", Ficha=str(ficha), Setor="Cadastro", Status=status)
+    return [values[name] for name in PAINEL_HEADERS]
+
+
+def painel_page_html(rows, with_todos=False):
+    """Página do Painel como o sistema gera: cabeçalho, linha de filtro (TODOS) e dados"""
+    cells = lambda tag, row: "".join(f"<{tag}>{value}</{tag}>" for value in row)
+    lines = [f"<tr>{cells('th', PAINEL_HEADERS)}</tr>"]
+    if with_todos:
+        lines.append(f"<tr>{cells('td', ['TODOS'] * len(PAINEL_HEADERS))}</tr>")
+    lines += [f"<tr>{cells('td', row)}</tr>" for row in rows]
+    # Tabela menor de navegação na mesma página: pick_data_table escolhe a maior
+    return f"<html><body><table><tr><td>1</td><td>2</td></tr></table><table>{''.join(lines)}</table></body></html>"
+
+
+def fake_paginated_source(pages_html, visited):
+    """Fonte paginada sem navegador: gera as tabelas de cada página, como _iter_painel_page_tables"""
+    for html in pages_html:
+        visited.append(html)
+        yield parse_table_rows(make_soup(html))
+
+
+def test_iter_data_rows_walks_pages_and_keeps_one_header():
+    pages = [
+        painel_page_html([painel_row(1), painel_row(2)], with_todos=True),
+        painel_page_html([painel_row(3)]),
+        painel_page_html([painel_row(4, "CONCLUÍDO")]),
+    ]
+    visited = []
+    stats = {}
+    rows = list(iter_data_rows(fake_paginated_source(pages, visited), stats))
+
+    assert stats["pages"] == 3
+    # Cabeçalho só uma vez, no início; os repetidos nas páginas 2 e 3 são descartados
+    assert rows[0] == PAINEL_HEADERS
+    assert rows.count(PAINEL_HEADERS) == 1
+    assert [row[2] for row in rows[2:]] == ["1", "2", "3", "4"]
+
+
+def test_todos_row_is_skipped_as_a_record():
+    pages = [painel_page_html([painel_row(1), painel_row(2)], with_todos=True)]
+    rows = list(iter_data_rows(fake_paginated_source(pages, [])))
+
+    # iter_data_rows repassa a linha de filtro; painel_record/PainelTable a descartam
+    assert rows[1] == ["TODOS"] * len(PAINEL_HEADERS)
+    records = [record for record in map(painel_record, rows) if record is not None]
+    assert [record["Ficha"] for record in records] == ["1", "2"]
+    assert PainelTable.from_rows(rows).column("Ficha") == ["1", "2"]
+
+
+def test_iter_data_rows_stops_on_repeated_page():
+    first = painel_page_html([painel_row(1)])
+    second = painel_page_html([painel_row(2)])
+    # Último link "próxima" volta para a mesma página: a iteração para ali
+    visited = []
+    stats = {}
+    rows = list(iter_data_rows(fake_paginated_source([first, second, second, first], visited), stats))
+
+    assert stats["pages"] == 2
+    assert len(visited) == 3  # a quarta página nem é pedida
+    assert [row[2] for row in rows[1:]] == ["1", "2"]
+
+
+def test_iter_data_rows_stops_on_page_without_tables():
+    pages = [painel_page_html([painel_row(1)]), "<html><body><p>Sem dados</p></body></html>", painel_page_html([painel_row(2)])]
+    visited = []
+    rows = list(iter_data_rows(fake_paginated_source(pages, visited)))
+
+    assert [row[2] for row in rows[1:]] == ["1"]
+    assert len(visited) == 2
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from src.history_store import HistoryStore
+from src.page_parser import PAINEL_HEADERS
+from src.scraper import SiriusScraper
+
+
+def painel_rows():
+    """Painel como iter_painel_rows gera: cabeçalho, linha de filtro e 3 registros (um com chave repetida)"""
+    rows = [list(PAINEL_HEADERS), ["TODOS"] * len(PAINEL_HEADERS)]
+    for ficha in (1, 2, 2):
+        values = {name: "" for name in PAINEL_HEADERS}
+        values.update(Matricula=str(1000 + ficha), Ficha=str(ficha), Setor="Cadastro", Status="PENDENTE")
+        rows.append([values[name] for name in PAINEL_HEADERS])
+    return rows
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_stream_painel_counts_records(data_dir, incremental):
+    scraper = SiriusScraper(incremental=incremental)
+    summary = scraper.stream_painel(iter(painel_rows()), {"pages": 1}, "http://sirius/painel", "Painel")
+
+    assert summary["painel"]["rows"] == 3
+    store = HistoryStore()
+    store.record_run(scraper.extracted_data)
+    assert store.runs()[0]["painel_rows"] == 3
+
+
+def test_snapshot_and_cdc_report_the_same_count(data_dir):
+    counts = {}
+    for incremental in (False, True):
+        scraper = SiriusScraper(incremental=incremental)
+        summary = scraper.stream_painel(iter(painel_rows()), {"pages": 1}, "http://sirius/painel", "Painel")
+        counts[incremental] = summary["painel"]["rows"]
+
+    assert counts[False] == counts[True]
+    # O CSV do snapshot continua com cabeçalho e linha de filtro; só a contagem ignora as duas
+    snapshot_csv = next(data_dir.glob("tabela_*_p0_t0.csv"))
+    assert len(snapshot_csv.read_text(encoding="utf-8-sig").splitlines()) == len(painel_rows())
+    changes = [json.loads(line) for line in (data_dir / "cdc" / "p0" / "changes.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert len(changes) == counts[True]
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def frame(self, name):
+        if name not in self.driver.elements:
+            raise RuntimeError(f"no such frame: {name}")
+        self.driver.frame = name
+
+    def default_content(self):
+        self.driver.frame = None
+
+
+class FakeDriver:
+    """Driver com elementos fixos por frame ({frame: {seletor: elemento}})"""
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.frame = None
+        self.switch_to = FakeSwitchTo(self)
+
+    def find_element(self, by, selector):
+        try:
+            return self.elements[self.frame][selector]
+        except KeyError:
+            raise RuntimeError(f"no such element: {selector}") from None
+
+
+def test_find_cached_drops_stale_entry_and_rescans(data_dir):
+    scraper = SiriusScraper()
+    scraper.driver = FakeDriver({None: {}, "baixo": {"img.novo": "botão"}})
+    # Cache aponta para um frame que não existe mais
+    scraper.selector_cache.record("workflow.button", "topo", "css selector", "img.antigo")
+
+    element = scraper._find_cached("workflow.button", ["img.antigo", "img.novo"], frames=["topo", None, "baixo"])
+
+    assert element == "botão"
+    assert scraper.driver.frame == "baixo"
+    assert scraper.selector_cache.get("workflow.button") == ("baixo", "css selector", "img.novo")
+
+
+def test_find_cached_miss_returns_to_default_content(data_dir):
+    scraper = SiriusScraper()
+    scraper.driver = FakeDriver({None: {}, "baixo": {}})
+
+    assert scraper._find_cached("painel.link", ["a.painel", "//a[text()='Painel']"], frames=[None, "baixo", "cima"]) is None
+    assert scraper.driver.frame is None
+    assert scraper.selector_cache.get("painel.link") is None